@@ -1,5 +1,17 @@
 from API.launcher_api import Launcher
 from API.mlx_api import MLX
 from API.emp_api import EMP
+from API.rate_limit import RateLimiter
+from API.retry import RetryPolicy
+from API.recorder import TrafficRecorder, iter_traffic
+from API.responses import RESPONSE_MODELS, as_model, construct, decode_response, http_code
+from API.transport import Transport, PoolStats, get_default_transport
+from API.async_api import (
+    AsyncTransport, AsyncMLX, AsyncEMP, AsyncLauncher, get_default_async_transport
+)
+from API.fingerprints import FingerprintPool
+from API.bulk import BulkProvisioner, ChunkResult
+from API.cookies import CookieImporter, CookieImportResult, CookieJar
+from API.search import ProfileSearch
 
 # flake8: noqa
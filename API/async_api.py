@@ -0,0 +1,272 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from API.emp_api import EMP
+from API.launcher_api import Launcher
+from API.mlx_api import MLX
+from API.transport import Transport, get_default_transport
+
+DEFAULT_CONCURRENCY = 64
+
+
+class AsyncTransport:
+    """Async front of a pooled Transport with a bounded number of in-flight requests.
+
+    Requests are executed on a worker pool sized to `concurrency` and share the
+    keep-alive connections of a single Transport, so the sync and async clients
+    go through the same pool, counters and hooks. The connection pool is grown
+    to `concurrency`, so that every worker keeps its connection alive. When the
+    transport has a rate limiter, requests wait for their slot on the event loop
+    instead of holding a worker.
+
+    Async clients created without a transport or a concurrency share
+    get_default_async_transport().
+
+    Args:
+        transport (Transport | None): pooled transport to drive. A new one with
+            `pool_maxsize=concurrency` is created when omitted.
+        concurrency (int): maximum number of requests in flight. Defaults to 64.
+    """
+
+    def __init__(
+        self, transport: Transport | None = None, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be positive, got {concurrency}")
+        self.concurrency = concurrency
+        self._owns_transport = transport is None
+        self.transport = transport or Transport(pool_maxsize=concurrency)
+        self.transport.grow_pool(concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="mlx-async"
+        )
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Running a blocking client call without blocking the event loop
+
+        Args:
+            func (Callable[..., Any]): sync client method
+
+        Returns:
+            Any: whatever func returns
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        limiter = self.transport.rate_limiter
+        if limiter is not None:
+            # client methods are named after the operation they send
+            await limiter.acquire_async(getattr(func, "__name__", None))
+            call = functools.partial(self._reserved, call)
+        return await loop.run_in_executor(self._executor, call)
+
+    def _reserved(self, call: Callable[[], Any]) -> Any:
+        # the first request of the call uses the slot taken in run()
+        reserved = self.transport._reserved
+        reserved.slot = True
+        try:
+            return call()
+        finally:
+            reserved.slot = False
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self._owns_transport:
+            self.transport.close()
+
+    async def aclose(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def __aenter__(self) -> "AsyncTransport":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+
+_default_async_transport: AsyncTransport | None = None
+_default_async_lock = threading.Lock()
+
+
+def get_default_async_transport() -> AsyncTransport:
+    """Returning the process-wide async transport, driving the default Transport,
+    used by async clients created without a transport or a concurrency
+
+    Returns:
+        AsyncTransport: shared async transport
+    """
+    global _default_async_transport
+    with _default_async_lock:
+        if _default_async_transport is None:
+            _default_async_transport = AsyncTransport(transport=get_default_transport())
+        return _default_async_transport
+
+
+class _AsyncClient:
+
+    def __init__(self, transport: AsyncTransport | None, concurrency: int | None) -> None:
+        # an explicit concurrency gets a worker and connection pool of its own
+        self._owns_transport = transport is None and concurrency is not None
+        if transport is not None:
+            self.transport = transport
+        elif concurrency is not None:
+            self.transport = AsyncTransport(concurrency=concurrency)
+        else:
+            self.transport = get_default_async_transport()
+
+    async def aclose(self) -> None:
+        if self._owns_transport:
+            await self.transport.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+
+class AsyncMLX(_AsyncClient):
+
+    def __init__(
+        self,
+        url: str,
+        transport: AsyncTransport | None = None,
+        concurrency: int | None = None,
+        typed: bool = False,
+        sample_rate: float = 1.0,
+    ) -> None:
+        super().__init__(transport, concurrency)
+        self.url = url
+        self.client = MLX(
+            url=url,
+            transport=self.transport.transport,
+            typed=typed,
+            sample_rate=sample_rate,
+        )
+
+    async def sign_up(self, login: str, user_pass: str) -> dict:
+        return await self.transport.run(self.client.sign_up, login=login, user_pass=user_pass)
+
+    async def verify_email(self, email: str, email_token: str, jwt: str) -> dict:
+        return await self.transport.run(
+            self.client.verify_email, email=email, email_token=email_token, jwt=jwt
+        )
+
+    async def sign_in(self, login: str, password: str) -> dict:
+        return await self.transport.run(self.client.sign_in, login=login, password=password)
+
+    async def refresh_token(self, email: str, wid: str, refresh_token: str) -> dict:
+        return await self.transport.run(
+            self.client.refresh_token, email=email, wid=wid, refresh_token=refresh_token
+        )
+
+    async def get_folder_id(self, token: str) -> dict:
+        return await self.transport.run(self.client.get_folder_id, token=token)
+
+    async def get_workspace_id(self, token: str) -> dict:
+        return await self.transport.run(self.client.get_workspace_id, token=token)
+
+    async def create_profile(
+        self, token: str, profile_params: dict | bytes, request_key: str | None = None
+    ) -> dict:
+        return await self.transport.run(
+            self.client.create_profile,
+            token=token,
+            profile_params=profile_params,
+            request_key=request_key,
+        )
+
+    async def delete_profile(self, token: str, profile_ids: list, permanently=True) -> dict:
+        return await self.transport.run(
+            self.client.delete_profile,
+            token=token,
+            profile_ids=profile_ids,
+            permanently=permanently,
+        )
+
+    async def get_fingerprints(
+        self, token: str, os_type: str, browser_type: str, core_version: int, count: int = 100
+    ) -> dict:
+        return await self.transport.run(
+            self.client.get_fingerprints,
+            token=token,
+            os_type=os_type,
+            browser_type=browser_type,
+            core_version=core_version,
+            count=count,
+        )
+
+    async def get_profile_metas(self, token: str, profile_ids: list) -> dict:
+        return await self.transport.run(
+            self.client.get_profile_metas, token=token, profile_ids=profile_ids
+        )
+
+    async def search_profiles(self, token: str, criteria: dict) -> dict:
+        return await self.transport.run(self.client.search_profiles, token=token, criteria=criteria)
+
+
+class AsyncEMP(_AsyncClient):
+
+    def __init__(
+        self,
+        url: str,
+        transport: AsyncTransport | None = None,
+        concurrency: int | None = None,
+        typed: bool = False,
+        sample_rate: float = 1.0,
+    ) -> None:
+        super().__init__(transport, concurrency)
+        self.url = url
+        self.client = EMP(
+            url=url,
+            transport=self.transport.transport,
+            typed=typed,
+            sample_rate=sample_rate,
+        )
+
+    async def get_email_token(self, email: str) -> dict:
+        return await self.transport.run(self.client.get_email_token, email=email)
+
+    async def set_restrictions(self, workspace_id: str) -> dict:
+        return await self.transport.run(self.client.set_restrictions, workspace_id=workspace_id)
+
+
+class AsyncLauncher(_AsyncClient):
+
+    def __init__(
+        self,
+        url: str,
+        transport: AsyncTransport | None = None,
+        concurrency: int | None = None,
+        typed: bool = False,
+        sample_rate: float = 1.0,
+    ) -> None:
+        super().__init__(transport, concurrency)
+        self.url = url
+        self.client = Launcher(
+            url=url,
+            transport=self.transport.transport,
+            typed=typed,
+            sample_rate=sample_rate,
+        )
+
+    async def start_profile(self, token, profile_id, folder_id) -> dict:
+        return await self.transport.run(
+            self.client.start_profile, token=token, profile_id=profile_id, folder_id=folder_id
+        )
+
+    async def stop_profile(self, token, profile_id) -> dict:
+        return await self.transport.run(
+            self.client.stop_profile, token=token, profile_id=profile_id
+        )
+
+    async def import_cookies(self, token, pid, fid, cookies, xpass_load=False) -> dict:
+        return await self.transport.run(
+            self.client.import_cookies,
+            token=token,
+            pid=pid,
+            fid=fid,
+            cookies=cookies,
+            xpass_load=xpass_load,
+        )
@@ -0,0 +1,172 @@
+import logging
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+import data
+from API.fingerprints import FingerprintPool
+from API.mlx_api import MLX
+from API.rate_limit import RateLimiter
+from API.responses import as_model
+from models import MLX as mlx_models
+
+
+logger = logging.getLogger("my_logger")
+
+# CreateProfile caps `times` at 20
+MAX_TIMES = 20
+
+
+@dataclass
+class ChunkResult:
+    """Outcome of one create_profile call made by the provisioner"""
+    index: int
+    requested: int
+    started_at: float
+    elapsed: float
+    result: mlx_models.ArrayOfIDs | None = None
+    error: Exception | None = None
+
+    @property
+    def ids(self) -> list[str]:
+        return list(self.result.ids) if self.result else []
+
+
+def chunk_profiles(
+    profiles: int | Iterable[dict], template: dict | None = None, max_times: int = MAX_TIMES
+) -> Iterator[dict]:
+    """Splitting the requested profiles into create_profile bodies with times <= max_times
+
+    Args:
+        profiles (int | Iterable[dict]): number of profiles to create from the template,
+            or PROFILE_GENERIC-style dicts (each may carry its own `times`; a body
+            without one creates one profile, times=0 none).
+        template (dict | None): body used when profiles is an int. Defaults to PROFILE_GENERIC.
+        max_times (int): upper bound of `times` per body. Defaults to 20.
+
+    Yields:
+        Iterator[dict]: shallow copies of the bodies with `times` set
+    """
+    if isinstance(profiles, int):
+        if profiles <= 0:
+            return
+        profiles = [{**(template or data.PROFILE_GENERIC), "times": profiles}]
+    for profile in profiles:
+        times = profile.get("times")
+        # times=0 asks for nothing; only a missing count means one profile
+        remaining = 1 if times is None else times
+        while remaining > 0:
+            times = min(remaining, max_times)
+            remaining -= times
+            yield {**profile, "times": times}
+
+
+class BulkProvisioner:
+    """Creating large numbers of profiles via MLX.create_profile in parallel chunks
+
+    Args:
+        mlx (MLX): MLX API client
+        token (str): Bearer token of the workspace
+        folder_id (str | None): folder used for bodies without a folder_id
+        workers (int): number of create_profile calls in flight. Defaults to 4.
+        restrictions (dict | None): restrictions payload whose ratelimit is
+            respected when the client's transport has no rate limiter of its own.
+            Defaults to data.RESTRICTIONS.
+        fingerprints (FingerprintPool | None): source of fingerprints for bodies
+            without one. Every body then creates a single profile (times=1),
+            so that no two profiles share a fingerprint. That costs one
+            create_profile call per profile instead of one per 20; under the
+            default limit of 50 calls/min shared by all operations, N profiles
+            take at least N / 50 minutes instead of N / 1000.
+        request_keys (bool): send every chunk with its own Idempotency-Key, so the
+            transport retries it on 5xx and timeouts. Only enable it when the server
+            deduplicates create_profile by that key, otherwise a retried chunk may
+            create its profiles twice. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        mlx: MLX,
+        token: str,
+        folder_id: str | None = None,
+        workers: int = 4,
+        restrictions: dict | None = None,
+        fingerprints: FingerprintPool | None = None,
+        request_keys: bool = False,
+    ) -> None:
+        self.mlx = mlx
+        self.token = token
+        self.folder_id = folder_id
+        self.workers = workers
+        self.fingerprints = fingerprints
+        self.request_keys = request_keys
+        # A limiter on the transport already covers these calls
+        self.rate_limiter = (
+            None
+            if mlx.transport.rate_limiter is not None
+            else RateLimiter.from_restrictions(restrictions or data.RESTRICTIONS)
+        )
+
+    def _create(self, index: int, body: dict) -> ChunkResult:
+        if self.folder_id and not body.get("folder_id"):
+            body["folder_id"] = self.folder_id
+        if self.fingerprints is not None:
+            body = self.fingerprints.apply(body)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire("create_profile")
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            res = self.mlx.create_profile(
+                token=self.token,
+                profile_params=body,
+                request_key=str(uuid.uuid4()) if self.request_keys else None,
+            )
+            response = as_model(mlx_models.ArrayOfIDsResponse, res)
+            return ChunkResult(
+                index=index,
+                requested=body["times"],
+                started_at=started_at,
+                elapsed=time.perf_counter() - start,
+                result=response.data,
+            )
+        except Exception as e:
+            logger.error("Chunk %s failed: %s", index, e)
+            return ChunkResult(
+                index=index,
+                requested=body["times"],
+                started_at=started_at,
+                elapsed=time.perf_counter() - start,
+                error=e,
+            )
+
+    def provision(
+        self, profiles: int | Iterable[dict], template: dict | None = None
+    ) -> Iterator[ChunkResult]:
+        """Creating the profiles and streaming back chunk results as they complete
+
+        Args:
+            profiles (int | Iterable[dict]): number of profiles or a (lazy) iterable of bodies
+            template (dict | None): body used when profiles is an int
+
+        Yields:
+            Iterator[ChunkResult]: one result per create_profile call, in completion order
+        """
+        max_times = 1 if self.fingerprints is not None else MAX_TIMES
+        chunks = enumerate(chunk_profiles(profiles, template, max_times=max_times))
+        # Only a bounded number of bodies are materialised, so generators of
+        # any length can be streamed through.
+        max_pending = self.workers * 2
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = set()
+            for index, body in chunks:
+                pending.add(executor.submit(self._create, index, body))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
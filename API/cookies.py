@@ -0,0 +1,358 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, TextIO
+from pydantic import BaseModel
+from API.launcher_api import Launcher
+from models import PayloadTemplate
+from models import launcher as launcher_models
+
+
+logger = logging.getLogger("my_logger")
+
+CHUNK_SIZE = 1 << 16
+# Netscape jars mark HttpOnly cookies by prefixing the domain
+HTTPONLY_PREFIX = "#HttpOnly_"
+SAME_SITE = {
+    "lax": "lax",
+    "strict": "strict",
+    "none": "no_restriction",
+    "no_restriction": "no_restriction",
+}
+
+CookieKey = tuple[str, str, str]
+
+
+def iter_netscape(lines: Iterable[str]) -> Iterator[dict]:
+    """Parsing a Netscape cookies.txt jar line by line
+
+    Args:
+        lines (Iterable[str]): lines of the jar, e.g. an open file
+
+    Yields:
+        Iterator[dict]: raw cookies with the keys of a JSON export
+    """
+    for line in lines:
+        line = line.rstrip("\r\n")
+        http_only = line.startswith(HTTPONLY_PREFIX)
+        if http_only:
+            line = line[len(HTTPONLY_PREFIX):]
+        elif not line.strip() or line.startswith("#"):
+            continue
+        parts = line.split("\t")
+        if len(parts) != 7:
+            yield {}
+            continue
+        domain, subdomains, path, secure, expires, name, value = parts
+        yield {
+            "domain": domain,
+            "hostOnly": subdomains.upper() != "TRUE",
+            "path": path,
+            "secure": secure.upper() == "TRUE",
+            "expirationDate": int(expires) if expires.isdigit() else 0,
+            "name": name,
+            "value": value,
+            "httpOnly": http_only,
+        }
+
+
+def iter_json(file: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """Parsing a JSON array of cookies object by object
+
+    Only the object being decoded and one chunk are held in memory. A
+    Playwright storageState ({"cookies": [...], "origins": [...]}) is a
+    single object, so it is decoded as a whole and its cookies are yielded.
+
+    Args:
+        file (TextIO): open JSON export (EditThisCookie, Playwright, ...)
+        chunk_size (int): characters read at a time. Defaults to 64 KiB.
+
+    Yields:
+        Iterator[dict]: raw cookies
+    """
+    decoder = json.JSONDecoder()
+    buffer = file.read(chunk_size).lstrip()
+    eof = not buffer
+    if buffer.startswith("["):
+        buffer = buffer[1:]
+    while True:
+        buffer = buffer.lstrip(" \t\r\n,")
+        while not buffer and not eof:
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer = chunk.lstrip(" \t\r\n,")
+        if not buffer or buffer.startswith("]"):
+            return
+        try:
+            cookie, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            chunk = "" if eof else file.read(chunk_size)
+            if not chunk:
+                raise ValueError(f"Malformed JSON cookie jar near {buffer[:80]!r}")
+            buffer += chunk
+            continue
+        buffer = buffer[end:]
+        if isinstance(cookie, dict) and "name" not in cookie and isinstance(
+            cookie.get("cookies"), list
+        ):
+            yield from (item if isinstance(item, dict) else {} for item in cookie["cookies"])
+            continue
+        yield cookie if isinstance(cookie, dict) else {}
+
+
+def expiry(value) -> float | None:
+    """Reading a cookie expiry as a Unix timestamp
+
+    Args:
+        value: seconds as a number or a string, or an ISO 8601 date
+
+    Returns:
+        float | None: timestamp, None for a session cookie or an unreadable value
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        seconds = value
+    else:
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            try:
+                date = datetime.fromisoformat(str(value).strip())
+            except ValueError:
+                logger.warning("Treating a cookie with expiry %r as a session cookie", value)
+                return None
+            if date.tzinfo is None:
+                date = date.replace(tzinfo=timezone.utc)
+            seconds = date.timestamp()
+    # Playwright exports -1 for session cookies
+    return seconds if seconds > 0 else None
+
+
+def normalize(cookie: dict) -> dict | None:
+    """Normalizing a raw cookie to the format imported by the Launcher
+
+    Args:
+        cookie (dict): cookie from a Netscape or JSON jar
+
+    Returns:
+        dict | None: normalized cookie, None when it has no name or domain
+    """
+    name = cookie.get("name")
+    domain = str(cookie.get("domain") or "").strip().lower()
+    if not name or not domain:
+        return None
+    expires = expiry(cookie.get("expirationDate", cookie.get("expires")))
+    session = bool(cookie.get("session")) or expires is None
+    host_only = cookie.get("hostOnly")
+    normalized = {
+        "domain": domain,
+        "hostOnly": not domain.startswith(".") if host_only is None else bool(host_only),
+        "httpOnly": bool(cookie.get("httpOnly")),
+        "name": str(name),
+        "path": cookie.get("path") or "/",
+        "sameSite": SAME_SITE.get(str(cookie.get("sameSite", "")).lower(), "unspecified"),
+        "secure": bool(cookie.get("secure")),
+        "session": session,
+        "value": str(cookie.get("value", "")),
+    }
+    if not session:
+        normalized["expirationDate"] = expires
+    return normalized
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+@dataclass
+class CookieJar:
+    """Normalized cookies of a jar file, unique by (domain, path, name)"""
+    digest: str
+    cookies: list[dict]
+    read: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+
+    @classmethod
+    def load(cls, path: str, digest: str | None = None) -> "CookieJar":
+        """Stream-parsing a Netscape or JSON jar; later duplicates replace earlier ones
+
+        Args:
+            path (str): jar file
+            digest (str | None): sha256 of the file when already known
+
+        Returns:
+            CookieJar: parsed jar
+        """
+        unique: dict[CookieKey, dict] = {}
+        jar = cls(digest=digest or file_digest(path), cookies=[])
+        with open(path, "r", encoding="utf-8") as file:
+            head = file.read(CHUNK_SIZE)
+            file.seek(0)
+            cookies = iter_json(file) if head.lstrip()[:1] in ("[", "{") else iter_netscape(file)
+            for raw in cookies:
+                jar.read += 1
+                cookie = normalize(raw)
+                if cookie is None:
+                    jar.skipped += 1
+                    continue
+                key = (cookie["domain"], cookie["path"], cookie["name"])
+                if key in unique:
+                    jar.duplicates += 1
+                unique[key] = cookie
+        jar.cookies = list(unique.values())
+        return jar
+
+    def to_json(self) -> str:
+        return json.dumps(self.cookies, ensure_ascii=False, separators=(",", ":"))
+
+
+@dataclass
+class CookieImportResult:
+    """Outcome of one import_cookies call"""
+    profile_id: str
+    folder_id: str
+    elapsed: float
+    response: dict | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _Cached:
+    jar: CookieJar
+    templates: dict[bool, PayloadTemplate] = field(default_factory=dict)
+
+
+class CookieImporter:
+    """Importing a cookie jar file into many profiles via Launcher.import_cookies
+
+    A jar is parsed, normalized, deduplicated and serialized once per content
+    hash; every import then only splices the profile and folder ids into the
+    pre-serialized body. At most `workers` bodies exist at a time, so memory
+    stays bounded by the jar size times the number of workers.
+
+    Args:
+        launcher (Launcher): Launcher API client
+        token (str): Bearer token
+        workers (int): imports in flight. Defaults to 8.
+        cache_size (int): parsed jars kept by content hash. Defaults to 8.
+    """
+
+    def __init__(
+        self, launcher: Launcher, token: str, workers: int = 8, cache_size: int = 8
+    ) -> None:
+        self.launcher = launcher
+        self.token = token
+        self.workers = workers
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, _Cached] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, path: str) -> _Cached:
+        digest = file_digest(path)
+        with self._lock:
+            cached = self._cache.get(digest)
+            if cached is not None:
+                self._cache.move_to_end(digest)
+                return cached
+        cached = _Cached(jar=CookieJar.load(path, digest=digest))
+        logger.info(
+            "Parsed cookie jar %s: %s unique of %s read, %s skipped",
+            path, len(cached.jar.cookies), cached.jar.read, cached.jar.skipped,
+        )
+        with self._lock:
+            self._cache[digest] = cached
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return cached
+
+    def jar(self, path: str) -> CookieJar:
+        return self._cached(path).jar
+
+    def template(self, path: str, xpass_load: bool = False) -> PayloadTemplate:
+        """Getting the CookieImport template of a jar file, parsing the file only once
+
+        Args:
+            path (str): Netscape or JSON jar
+            xpass_load (bool): import_advanced_cookies. Defaults to False.
+
+        Returns:
+            PayloadTemplate: body rendered with profile_id and folder_id
+        """
+        cached = self._cached(path)
+        with self._lock:
+            template = cached.templates.get(xpass_load)
+        if template is None:
+            template = PayloadTemplate(
+                launcher_models.CookieImport,
+                {
+                    "profile_id": "",
+                    "folder_id": "",
+                    "cookies": cached.jar.to_json(),
+                    "import_advanced_cookies": xpass_load,
+                },
+                ("profile_id", "folder_id"),
+            )
+            with self._lock:
+                cached.templates[xpass_load] = template
+        return template
+
+    def _import(
+        self, template: PayloadTemplate, profile_id: str, folder_id: str
+    ) -> CookieImportResult:
+        start = time.perf_counter()
+        try:
+            res = self.launcher.import_cookies(
+                token=self.token, pid=profile_id, fid=folder_id, cookies=template
+            )
+            if isinstance(res, BaseModel):
+                res = res.model_dump(by_alias=True)
+            error = None
+            if res["status"]["http_code"] != 200:
+                error = RuntimeError(f"Importing cookies failed: {res['status']}")
+            return CookieImportResult(
+                profile_id, folder_id, time.perf_counter() - start, response=res, error=error
+            )
+        except Exception as e:
+            logger.error("Importing cookies into %s failed: %s", profile_id, e)
+            return CookieImportResult(profile_id, folder_id, time.perf_counter() - start, error=e)
+
+    def import_jar(
+        self, path: str, profiles: Iterable[tuple[str, str]], xpass_load: bool = False
+    ) -> Iterator[CookieImportResult]:
+        """Importing a jar into every profile, streaming results as they complete
+
+        Args:
+            path (str): Netscape or JSON jar
+            profiles (Iterable[tuple[str, str]]): (profile_id, folder_id) pairs, may be lazy
+            xpass_load (bool): import_advanced_cookies. Defaults to False.
+
+        Yields:
+            Iterator[CookieImportResult]: one result per profile, in completion order
+        """
+        template = self.template(path, xpass_load)
+        max_pending = self.workers * 2
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = set()
+            for profile_id, folder_id in profiles:
+                pending.add(executor.submit(self._import, template, profile_id, folder_id))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
@@ -1,9 +1,15 @@
-import requests
+import copy
+from typing import TYPE_CHECKING
 import allure
 import data
 from requests.auth import HTTPBasicAuth
 from dotenv import load_dotenv
 import os
+from API.responses import decode_response
+from API.transport import Transport, get_default_transport
+
+if TYPE_CHECKING:
+    from models import EMP as emp_models
 
 
 load_dotenv()
@@ -11,24 +17,40 @@ load_dotenv()
 
 class EMP:
 
-    def __init__(self, url: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        transport: Transport | None = None,
+        typed: bool = False,
+        sample_rate: float = 1.0,
+    ) -> None:
         self.url = url
+        self.transport = transport or get_default_transport()
+        # return response models instead of dicts, validating only sample_rate of them
+        # (trusted mode), see API.responses
+        self.typed = typed
+        self.sample_rate = sample_rate
         self.env = os.getenv('ENV', 'DEV')
         if self.env not in ('QA', 'STG', 'PROD', 'DEV'):
             raise ValueError(f"Unsupported environment: {self.env}")
         self.basic_auth = HTTPBasicAuth(username='admin', password=os.getenv(self.env))
 
     @allure.step('Retrieving email token')
-    def get_email_token(self, email: str) -> dict:
+    def get_email_token(self, email: str) -> "dict | emp_models.TokenResponse":
         params = {'email': email}
         URL = self.url + '/emp/verification_token'
-        res = requests.get(url=URL, params=params, auth=self.basic_auth)
-        return res.json()
+        res = self.transport.get(
+            url=URL, operation="get_email_token", params=params, auth=self.basic_auth
+        )
+        return decode_response(res, "get_email_token", self.typed, self.sample_rate)
 
     @allure.step('Setting restrictions')
-    def set_restrictions(self, workspace_id: str):
-        body = data.RESTRICTIONS
+    def set_restrictions(self, workspace_id: str) -> dict:
+        # copied so that concurrent calls never share the module-level payload
+        body = copy.deepcopy(data.RESTRICTIONS)
         body['workspace_id'] = workspace_id
         URL = self.url + '/emp/restrictions'
-        res = requests.post(url=URL, json=body, auth=self.basic_auth)
-        return res.json()
\ No newline at end of file
+        res = self.transport.post(
+            url=URL, operation="set_restrictions", json=body, auth=self.basic_auth
+        )
+        return decode_response(res, "set_restrictions", self.typed, self.sample_rate)
\ No newline at end of file
@@ -0,0 +1,222 @@
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import BaseModel
+from API.mlx_api import MLX
+
+
+logger = logging.getLogger("my_logger")
+
+# FingerprintArray holds at most 100 fingerprints
+MAX_BATCH = 100
+# Fingerprint fields that belong to the pool, not to a profile's fingerprint
+_POOL_FIELDS = ("id", "meta_id")
+
+# Masking flag of every fingerprint section; MLX only uses a section that is
+# sent when its flag is "custom" and generates its own otherwise. Ports have
+# no custom mode.
+CUSTOM_FLAGS = {
+    "navigator": "navigator_masking",
+    "localization": "localization_masking",
+    "timezone": "timezone_masking",
+    "graphic": "graphics_masking",
+    "webrtc": "webrtc_masking",
+    "fonts": "fonts_masking",
+    "media_devices": "media_devices_masking",
+    "screen": "screen_masking",
+    "geolocation": "geolocation_masking",
+}
+
+Key = tuple[str, str, int]
+
+
+class FingerprintPool:
+    """Pre-fetched fingerprints handed out to create_profile bodies.
+
+    Fingerprints are fetched in batches per (os_type, browser_type, core_version)
+    in the background. A key is refilled as soon as it runs below the low
+    watermark, so take() normally returns without waiting. Every fingerprint
+    is handed out once. With a persist_path the unused fingerprints are saved
+    on close() and loaded again by the next pool; use one file per pool.
+
+    Args:
+        mlx (MLX): MLX API client
+        token (str): Bearer token
+        batch (int): fingerprints per request, at most 100. Defaults to 100.
+        low_watermark (int): refill a key when fewer remain. Defaults to 20.
+        persist_path (str | None): JSON file keeping unused fingerprints between runs
+        workers (int): refills running at the same time. Defaults to 2.
+    """
+
+    def __init__(
+        self,
+        mlx: MLX,
+        token: str,
+        batch: int = MAX_BATCH,
+        low_watermark: int = 20,
+        persist_path: str | None = None,
+        workers: int = 2,
+    ) -> None:
+        if not 1 <= batch <= MAX_BATCH:
+            raise ValueError(f"batch must be between 1 and {MAX_BATCH}, got {batch}")
+        self.mlx = mlx
+        self.token = token
+        self.batch = batch
+        self.low_watermark = low_watermark
+        self.persist_path = persist_path
+        self.fetched = 0
+        self._pools: dict[Key, deque[dict]] = {}
+        self._refilling: set[Key] = set()
+        self._errors: dict[Key, Exception] = {}
+        self._changed = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fingerprints")
+        if persist_path and os.path.exists(persist_path):
+            self._load(persist_path)
+
+    def _load(self, path: str) -> None:
+        with open(path, "r") as file:
+            saved: dict[str, list[dict]] = json.load(file)
+        for key, fingerprints in saved.items():
+            os_type, browser_type, core_version = key.split("/")
+            self._pools[(os_type, browser_type, int(core_version))] = deque(fingerprints)
+
+    def _fetch(self, key: Key) -> list[dict]:
+        os_type, browser_type, core_version = key
+        res = self.mlx.get_fingerprints(
+            token=self.token,
+            os_type=os_type,
+            browser_type=browser_type,
+            core_version=core_version,
+            count=self.batch,
+        )
+        if isinstance(res, BaseModel):
+            res = res.model_dump(by_alias=True, exclude_none=True)
+        if res["status"]["http_code"] != 200:
+            raise RuntimeError(f"Fetching fingerprints failed: {res['status']}")
+        return [
+            {name: value for name, value in fingerprint.items() if name not in _POOL_FIELDS}
+            for fingerprint in res["data"]["fingerprints"]
+        ]
+
+    def _refill(self, key: Key) -> None:
+        try:
+            fingerprints = self._fetch(key)
+        except Exception as e:
+            logger.error("Refilling fingerprints %s failed: %s", key, e)
+            with self._changed:
+                self._errors[key] = e
+                self._refilling.discard(key)
+                self._changed.notify_all()
+            return
+        with self._changed:
+            self._pools.setdefault(key, deque()).extend(fingerprints)
+            self.fetched += len(fingerprints)
+            self._errors.pop(key, None)
+            self._refilling.discard(key)
+            self._changed.notify_all()
+
+    def _schedule(self, key: Key) -> None:
+        # Called with the condition held
+        if key not in self._refilling and len(self._pools.get(key, ())) < self.low_watermark:
+            self._refilling.add(key)
+            self._executor.submit(self._refill, key)
+
+    def prefetch(self, os_type: str, browser_type: str, core_version: int) -> None:
+        """Starting a background refill of a key if it is below the low watermark"""
+        with self._changed:
+            self._schedule((os_type, browser_type, core_version))
+
+    def take(
+        self, os_type: str, browser_type: str, core_version: int, timeout: float | None = 30.0
+    ) -> dict:
+        """Taking an unused fingerprint, waiting for a refill when the key ran dry
+
+        Args:
+            os_type (str): linux, macos, windows or android
+            browser_type (str): mimic or stealthfox
+            core_version (int): browser core version
+            timeout (float | None): maximum seconds to wait. Defaults to 30.
+
+        Returns:
+            dict: fingerprint for parameters.fingerprint of a create_profile body
+        """
+        key = (os_type, browser_type, core_version)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while True:
+                pool = self._pools.get(key)
+                if pool:
+                    fingerprint = pool.popleft()
+                    self._schedule(key)
+                    return fingerprint
+                error = self._errors.pop(key, None)
+                if error is not None:
+                    raise RuntimeError(f"No fingerprints available for {key}") from error
+                self._schedule(key)
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No fingerprint for {key} within {timeout}s")
+                self._changed.wait(remaining)
+
+    def apply(self, body: dict) -> dict:
+        """Filling the fingerprint of a create_profile body from the pool
+
+        The masking flags of the filled sections are set to "custom", so MLX
+        keeps the fingerprint instead of generating its own. Bodies that
+        already carry a fingerprint are returned unchanged.
+
+        Args:
+            body (dict): PROFILE_GENERIC-style body with os_type, browser_type and core_version
+
+        Returns:
+            dict: copy of the body with parameters.fingerprint and its flags set
+        """
+        if body.get("parameters", {}).get("fingerprint"):
+            return body
+        body = copy.deepcopy(body)
+        parameters = body.setdefault("parameters", {})
+        fingerprint = parameters["fingerprint"] = self.take(
+            body["os_type"], body["browser_type"], body["core_version"]
+        )
+        flags = parameters.setdefault("flags", {})
+        for section in fingerprint:
+            if section in CUSTOM_FLAGS:
+                flags[CUSTOM_FLAGS[section]] = "custom"
+        return body
+
+    def available(self, os_type: str, browser_type: str, core_version: int) -> int:
+        with self._changed:
+            return len(self._pools.get((os_type, browser_type, core_version), ()))
+
+    def save(self, path: str) -> None:
+        """Writing the unused fingerprints to a JSON file
+
+        Args:
+            path (str): target file, replaced atomically
+        """
+        with self._changed:
+            saved = {
+                f"{os_type}/{browser_type}/{core_version}": list(pool)
+                for (os_type, browser_type, core_version), pool in self._pools.items()
+                if pool
+            }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(saved, file)
+        os.replace(tmp_path, path)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self.persist_path:
+            self.save(self.persist_path)
+
+    def __enter__(self) -> "FingerprintPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,6 +1,9 @@
-import requests
+import re
 import utils
 from models import launcher
+from models import PayloadTemplate, dump_json
+from API.responses import decode_response
+from API.transport import Transport, get_default_transport
 
 
 utils = utils.Helper()
@@ -8,35 +11,53 @@ utils = utils.Helper()
 
 class Launcher:
 
-    def __init__(self, url: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        transport: Transport | None = None,
+        typed: bool = False,
+        sample_rate: float = 1.0,
+    ) -> None:
         self.url = url
-
-    def start_profile(self, token, profile_id, folder_id) -> dict:
+        # stop_profile is only available in v1
+        self.v1_url = re.sub(r"/api/v\d+/?$", "", url) + "/api/v1"
+        self.transport = transport or get_default_transport()
+        # return response models instead of dicts, validating only sample_rate of them
+        # (trusted mode), see API.responses
+        self.typed = typed
+        self.sample_rate = sample_rate
+
+    def start_profile(self, token, profile_id, folder_id) -> "dict | launcher.Response":
         URL = self.url + f"/profile/f/{folder_id}/p/{profile_id}/start"
         HEADERS = utils.get_headers(token)
-        data = requests.get(url=URL, headers=HEADERS)
+        data = self.transport.get(url=URL, operation="start_profile", headers=HEADERS)
         # response = API.ResponseStatus(**data.json())
-        return data.json()
+        return decode_response(data, "start_profile", self.typed, self.sample_rate)
 
-    def stop_profile(self, token, profile_id) -> dict:
-        # URL is hardcoded because the stop-profile endpoint is available only in v1
-        URL = f"https://launcher.mlx.yt:45001/api/v1/profile/stop/p/{profile_id}"
+    def stop_profile(self, token, profile_id) -> "dict | launcher.Response":
+        URL = self.v1_url + f"/profile/stop/p/{profile_id}"
         HEADERS = utils.get_headers(token)
-        data = requests.get(url=URL, headers=HEADERS)
+        data = self.transport.get(url=URL, operation="stop_profile", headers=HEADERS)
         # response = API.ResponseStatus(**data.json())
-        return data.json()
+        return decode_response(data, "stop_profile", self.typed, self.sample_rate)
 
-    def import_cookies(self, token, pid, fid, cookies, xpass_load=False) -> dict:
+    def import_cookies(
+        self, token, pid, fid, cookies, xpass_load=False
+    ) -> "dict | launcher.Response":
         URL = self.url + "/cookie_import"
         HEADERS = utils.get_headers(token)
-        body = launcher.CookieImport(
-            profile_id=pid,
-            folder_id=fid,
-            cookies=cookies,
-            import_advanced_cookies=xpass_load,
-        )
-        data = requests.post(
-            url=URL, data=body.to_json(), headers=HEADERS
-        )
+        if isinstance(cookies, PayloadTemplate):
+            # cookies and xpass_load were rendered into the template once
+            body = cookies.render(profile_id=pid, folder_id=fid)
+        else:
+            body = dump_json(
+                launcher.CookieImport(
+                    profile_id=pid,
+                    folder_id=fid,
+                    cookies=cookies,
+                    import_advanced_cookies=xpass_load,
+                )
+            )
+        data = self.transport.post(url=URL, operation="import_cookies", data=body, headers=HEADERS)
         # response = MLX.MLXResponse(**data.json())
-        return data.json()
+        return decode_response(data, "import_cookies", self.typed, self.sample_rate)
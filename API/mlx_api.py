@@ -1,9 +1,13 @@
-import requests
+from typing import Iterator
 import utils
 import allure
 import os
 from dotenv import load_dotenv
 from models import MLX as mlx_models
+from models import dump_json
+from API.responses import decode_response
+from API.search import ProfileSearch
+from API.transport import Transport, get_default_transport
 
 load_dotenv()
 helper = utils.Helper()
@@ -11,13 +15,24 @@ helper = utils.Helper()
 
 class MLX:
 
-    def __init__(self, url: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        transport: Transport | None = None,
+        typed: bool = False,
+        sample_rate: float = 1.0,
+    ) -> None:
         self.url = url
+        self.transport = transport or get_default_transport()
+        # return response models instead of dicts, validating only sample_rate of them
+        # (trusted mode), see API.responses
+        self.typed = typed
+        self.sample_rate = sample_rate
         self.username = os.getenv('USERNAME')
         self.password = os.getenv('DEV_PASS')
 
     @allure.step('Creating a new account')
-    def sign_up(self, login: str, user_pass: str) -> dict:
+    def sign_up(self, login: str, user_pass: str) -> "dict | mlx_models.MLXResponse":
         """Sign up
 
         Args:
@@ -25,22 +40,26 @@ class MLX:
             user_pass (str): password
 
         Returns:
-            dict: SignUp response
+            dict | MLXResponse: SignUp response
         """
         URL = self.url + "/user/signup"
         user_creds = mlx_models.UserCreds(email=login, password=user_pass)
         body = mlx_models.ComplexSignup(creds=user_creds)
-        data = requests.post(url=URL, data=body.to_json())
-        return data.json()
+        data = self.transport.post(url=URL, operation="sign_up", data=dump_json(body))
+        return decode_response(data, "sign_up", self.typed, self.sample_rate)
 
-    def verify_email(self, email: str, email_token: str, jwt: str):
+    def verify_email(
+        self, email: str, email_token: str, jwt: str
+    ) -> "dict | mlx_models.MLXResponse":
         URL = self.url + f'/user/verify_email?email={email}&token={email_token}'
-        res = requests.get(url=URL, headers=helper.get_headers(token=jwt))
-        return res.json()
+        res = self.transport.get(
+            url=URL, operation="verify_email", headers=helper.get_headers(token=jwt)
+        )
+        return decode_response(res, "verify_email", self.typed, self.sample_rate)
 
     @allure.step('Signing in to get the token and refresh token')
     # adds a step in the allure report test set-up.
-    def sign_in(self, login: str, password: str) -> dict:
+    def sign_in(self, login: str, password: str) -> "dict | mlx_models.SigninResponse":
         """Sign in
 
         Args:
@@ -48,71 +67,87 @@ class MLX:
             password (str): pass
 
         Returns:
-            dict:
+            dict | SigninResponse: token and refresh token
         """
         URL = self.url + "/user/signin"
         credentials = mlx_models.UserCreds(email=login, password=password)
-        data = requests.post(url=URL, data=credentials.to_json())
+        data = self.transport.post(url=URL, operation="sign_in", data=dump_json(credentials))
         # response = MLX.SigninResponse(**data.json())
-        return data.json()
+        return decode_response(data, "sign_in", self.typed, self.sample_rate)
 
     @allure.step('Updating the token and refresh token')
-    def refresh_token(self, email: str, wid: str, refresh_token: str) -> dict:
+    def refresh_token(
+        self, email: str, wid: str, refresh_token: str
+    ) -> "dict | mlx_models.SigninResponse":
         URL = self.url + "/user/refresh_token"
         body = mlx_models.RefreshToken(email=email, refresh_token=refresh_token, workspace_id=wid)
-        data = requests.post(url=URL, data=body.to_json())
-        return data.json()
+        data = self.transport.post(url=URL, operation="refresh_token", data=dump_json(body))
+        return decode_response(data, "refresh_token", self.typed, self.sample_rate)
 
     @allure.step("Retrieving the folder id for Owner")
-    def get_folder_id(self, token: str) -> dict:
+    def get_folder_id(self, token: str) -> "dict | mlx_models.UserFolderArrayResponse":
         """Get the folder id
 
         Args:
             token (str): token from authorisation
 
         Returns:
-            dict: list of available workspaces
+            dict | UserFolderArrayResponse: list of available folders
         """
         URL = self.url + "/workspace/folders"
         HEADERS = helper.get_headers(token)
-        data = requests.get(url=URL, headers=HEADERS)
+        data = self.transport.get(url=URL, operation="get_folder_id", headers=HEADERS)
         # response = MLX.UserFolderArrayResponse(**data.json())
-        return data.json()
+        return decode_response(data, "get_folder_id", self.typed, self.sample_rate)
 
     @allure.step("Retrieving the workspace id for Owner")
-    def get_workspace_id(self, token: str) -> dict:
+    def get_workspace_id(self, token: str) -> "dict | mlx_models.UserWorkspaceArrayResponse":
         """Get the workspace id
 
         Args:
             token (str): token from authorisation
 
         Returns:
-            dict: list of available workspaces
+            dict | UserWorkspaceArrayResponse: list of available workspaces
         """
         URL = self.url + "/user/workspaces"
         HEADERS = helper.get_headers(token)
-        data = requests.get(url=URL, headers=HEADERS)
-        return data.json()
+        data = self.transport.get(url=URL, operation="get_workspace_id", headers=HEADERS)
+        return decode_response(data, "get_workspace_id", self.typed, self.sample_rate)
 
     @allure.step('Creating profile with the following body: {profile_params}')
-    def create_profile(self, token: str, profile_params: dict) -> dict:
+    def create_profile(
+        self, token: str, profile_params: dict | bytes, request_key: str | None = None
+    ) -> "dict | mlx_models.ArrayOfIDsResponse":
         """Create a profile with preset profile params.
 
         Args:
             token (str): Bearer token
-            profile_params (str): Profile metas
+            profile_params (dict | bytes): Profile metas, or a body rendered by a PayloadTemplate
+            request_key (str | None): Idempotency-Key header, lets the transport retry the
+                call. Only pass one when the server deduplicates create_profile by it,
+                otherwise a retried request may create the profiles twice.
 
         Returns:
-            dict (requests.Response)
+            dict | ArrayOfIDsResponse: ids of the created profiles
         """
         URL = self.url + "/profile/create"
         HEADERS = helper.get_headers(token)
-        body = mlx_models.CreateProfile.from_dict(profile_params)
-        data = requests.post(url=URL, data=body.to_json(), headers=HEADERS)
+        if not isinstance(profile_params, bytes):
+            profile_params = dump_json(mlx_models.CreateProfile.from_dict(profile_params))
+        data = self.transport.post(
+            url=URL,
+            operation="create_profile",
+            request_key=request_key,
+            data=profile_params,
+            headers=HEADERS,
+        )
         # response = MLX.ArrayOfIDsResponse(**data.json())
-        return data.json()
+        return decode_response(data, "create_profile", self.typed, self.sample_rate)
 
-    def delete_profile(self, token: str, profile_ids: list, permanently=True) -> requests.Response:
+    def delete_profile(
+        self, token: str, profile_ids: list, permanently=True
+    ) -> "dict | mlx_models.MLXResponse":
         """Delete a profiles
 
         Args:
@@ -120,11 +155,99 @@ class MLX:
             profile_ids (list): list of profiles to delete
 
         Returns:
-            requests.Response
+            dict | MLXResponse: status of the removal
         """
         URL = self.url + "/profile/remove"
         HEADERS = helper.get_headers(token)
         body = mlx_models.RemoveProfiles(ids=profile_ids, permanently=permanently)
-        data = requests.post(url=URL, data=body.to_json(), headers=HEADERS)
+        data = self.transport.post(
+            url=URL, operation="delete_profile", data=dump_json(body), headers=HEADERS
+        )
         # response = MLX.MLXResponse(**data.json())
-        return data.json()
+        return decode_response(data, "delete_profile", self.typed, self.sample_rate)
+
+    @allure.step('Fetching fingerprints')
+    def get_fingerprints(
+        self, token: str, os_type: str, browser_type: str, core_version: int, count: int = 100
+    ) -> "dict | mlx_models.FingerprintArrayResponse":
+        """Get a batch of generated fingerprints
+
+        Args:
+            token (str): Bearer token
+            os_type (str): linux, macos, windows or android
+            browser_type (str): mimic or stealthfox
+            core_version (int): browser core version
+            count (int): number of fingerprints, at most 100. Defaults to 100.
+
+        Returns:
+            dict | FingerprintArrayResponse: generated fingerprints
+        """
+        URL = self.url + "/fingerprint"
+        HEADERS = helper.get_headers(token)
+        params = {
+            "os_type": os_type,
+            "browser_type": browser_type,
+            "core_version": core_version,
+            "count": count,
+        }
+        data = self.transport.get(
+            url=URL, operation="get_fingerprints", params=params, headers=HEADERS
+        )
+        return decode_response(data, "get_fingerprints", self.typed, self.sample_rate)
+
+    @allure.step('Retrieving profile metas')
+    def get_profile_metas(
+        self, token: str, profile_ids: list
+    ) -> "dict | mlx_models.ProfileMetaArrayResponse":
+        """Get the metas (name, tags, parameters, ...) of up to 100 profiles
+
+        Args:
+            token (str): Bearer token
+            profile_ids (list): profile ids
+
+        Returns:
+            dict | ProfileMetaArrayResponse: metas of the profiles
+        """
+        URL = self.url + "/profile/metas"
+        HEADERS = helper.get_headers(token)
+        body = mlx_models.GetProfileParts(ids=profile_ids)
+        data = self.transport.post(
+            url=URL, operation="get_profile_metas", data=dump_json(body), headers=HEADERS
+        )
+        return decode_response(data, "get_profile_metas", self.typed, self.sample_rate)
+
+    @allure.step('Searching profiles')
+    def search_profiles(self, token: str, criteria: dict) -> dict:
+        """Search profiles, one page
+
+        Args:
+            token (str): Bearer token
+            criteria (dict): ProfileSearchCriteria fields
+
+        Returns:
+            dict: ProfileSearchQueryResponse, a dict in typed mode too
+        """
+        URL = self.url + "/profile/search"
+        HEADERS = helper.get_headers(token)
+        body = mlx_models.ProfileSearchCriteria.from_dict(criteria)
+        # to_json() keeps `sort` as an explicit null, which dump_json() would drop
+        data = self.transport.post(
+            url=URL, operation="search_profiles", data=body.to_json().encode(), headers=HEADERS
+        )
+        return decode_response(data, "search_profiles", self.typed, self.sample_rate)
+
+    def iter_profiles(
+        self, token: str, criteria: dict | None = None, page_size: int = 100, prefetch: int = 4
+    ) -> Iterator["mlx_models.ProfileSearchQueryItem"]:
+        """Stream every profile matching the criteria, prefetching the next pages
+
+        Args:
+            token (str): Bearer token
+            criteria (dict | None): ProfileSearchCriteria fields except offset and limit
+            page_size (int): profiles per request, at most 100. Defaults to 100.
+            prefetch (int): pages requested ahead of the consumer. Defaults to 4.
+
+        Returns:
+            Iterator[ProfileSearchQueryItem]: matching profiles, one at a time
+        """
+        return iter(ProfileSearch(self, token, criteria, page_size=page_size, prefetch=prefetch))
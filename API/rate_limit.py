@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+
+ALL_OPERATIONS = "all"
+
+_WINDOW_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+def parse_window(window_size: str) -> float:
+    """Converting a ratelimit window such as '1m' or '30s' to seconds
+
+    Args:
+        window_size (str): window from the restrictions payload
+
+    Returns:
+        float: window length in seconds
+    """
+    value, unit = window_size[:-1], window_size[-1:]
+    if unit not in _WINDOW_UNITS or not value:
+        raise ValueError(f"Unsupported window size: {window_size}")
+    return float(value) * _WINDOW_UNITS[unit]
+
+
+class _Window:
+
+    def __init__(self, limit: int, window: float) -> None:
+        if limit < 1 or window <= 0:
+            raise ValueError(f"Invalid ratelimit {limit} per {window}s")
+        self.limit = limit
+        self.window = window
+        self.calls: deque[float] = deque()
+
+    def delay(self, now: float) -> float:
+        while self.calls and now - self.calls[0] >= self.window:
+            self.calls.popleft()
+        if len(self.calls) < self.limit:
+            return 0.0
+        return self.window - (now - self.calls[0])
+
+
+class RateLimiter:
+    """Client-side sliding-window limiter mirroring the workspace ratelimit policy.
+
+    Each request counts against the window of its own operation (if one is
+    configured) and against the 'all' window. Slots are taken from every
+    matching window at once under a single lock, so one limiter can be shared
+    by all clients, threads and event loops of a process.
+
+    Args:
+        policies (dict[str, tuple[int, float]]): operation -> (limit_size, window in seconds)
+    """
+
+    def __init__(self, policies: dict[str, tuple[int, float]]) -> None:
+        self._windows = {
+            operation: _Window(limit, window) for operation, (limit, window) in policies.items()
+        }
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_restrictions(cls, restrictions: dict | list) -> "RateLimiter":
+        """Building a limiter from the EMP restrictions payload
+
+        Args:
+            restrictions (dict | list): data.RESTRICTIONS, its 'restrictions' part
+                or the 'ratelimit' list itself
+
+        Returns:
+            RateLimiter
+        """
+        if isinstance(restrictions, dict):
+            restrictions = restrictions.get("restrictions", restrictions).get("ratelimit", [])
+        return cls(
+            {
+                rule["operation"]: (rule["limit_size"], parse_window(rule["window_size"]))
+                for rule in restrictions
+            }
+        )
+
+    def _reserve(self, operation: str | None) -> float:
+        windows = [
+            self._windows[key]
+            for key in dict.fromkeys((ALL_OPERATIONS, operation))
+            if key in self._windows
+        ]
+        with self._lock:
+            now = time.monotonic()
+            delay = max((window.delay(now) for window in windows), default=0.0)
+            if delay <= 0:
+                for window in windows:
+                    window.calls.append(now)
+            return delay
+
+    def acquire(self, operation: str | None = None) -> float:
+        """Blocking until a request for the operation is allowed
+
+        Args:
+            operation (str | None): operation name, e.g. 'create_profile'
+
+        Returns:
+            float: seconds spent waiting
+        """
+        waited = 0.0
+        while (delay := self._reserve(operation)) > 0:
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+    async def acquire_async(self, operation: str | None = None) -> float:
+        """Waiting for a slot without blocking the event loop
+
+        Args:
+            operation (str | None): operation name, e.g. 'create_profile'
+
+        Returns:
+            float: seconds spent waiting
+        """
+        waited = 0.0
+        while (delay := self._reserve(operation)) > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
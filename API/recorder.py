@@ -0,0 +1,243 @@
+import base64
+import gzip
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import urlsplit
+
+
+logger = logging.getLogger("my_logger")
+
+# Path segments that are ids: UUIDs, hex digests and numbers
+_ID_SEGMENT = re.compile(r"^([0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|[0-9a-fA-F]{24,}|\d+)$")
+_STOP = object()
+
+
+def url_template(url: str) -> str:
+    """Getting the path of a URL with the ids replaced, e.g. /profile/f/{id}/p/{id}/start
+
+    Args:
+        url (str): full URL
+
+    Returns:
+        str: path template
+    """
+    path = urlsplit(url).path
+    return "/".join("{id}" if _ID_SEGMENT.match(part) else part for part in path.split("/"))
+
+
+def encode_body(body: bytes | str | None) -> tuple[str | None, str | None]:
+    """Turning a body into JSON-safe text: UTF-8 as is, anything else as base64
+
+    Returns:
+        tuple[str | None, str | None]: (text, "base64" or None)
+    """
+    if body is None or isinstance(body, str):
+        return body, None
+    try:
+        return body.decode(), None
+    except UnicodeDecodeError:
+        return base64.b64encode(body).decode(), "base64"
+
+
+def request_body(kwargs: dict) -> bytes | str | None:
+    """Getting the body a requests call sends, from its data= or json= argument"""
+    if kwargs.get("data") is not None:
+        return kwargs["data"]
+    if kwargs.get("json") is not None:
+        return json.dumps(kwargs["json"])
+    return None
+
+
+def decode_body(text: str | None, encoding: str | None) -> bytes:
+    if text is None:
+        return b""
+    return base64.b64decode(text) if encoding == "base64" else text.encode()
+
+
+@dataclass
+class Exchange:
+    """One API call as captured on the hot path; turned into JSON by the writer thread"""
+    started_at: float
+    operation: str | None
+    method: str
+    url: str
+    request_body: bytes | str | None
+    status: int | None
+    response_body: bytes | None
+    attempts: int
+    rate_limit_wait: float
+    response_time: float | None
+    total_time: float
+    error: str | None = None
+
+    def to_record(self) -> dict:
+        request_body, request_encoding = encode_body(self.request_body)
+        response_body, response_encoding = encode_body(self.response_body)
+        return {
+            "ts": self.started_at,
+            "operation": self.operation,
+            "method": self.method,
+            "url": self.url,
+            "template": url_template(self.url),
+            "status": self.status,
+            "request_body": request_body,
+            "request_encoding": request_encoding,
+            "response_body": response_body,
+            "response_encoding": response_encoding,
+            "attempts": self.attempts,
+            "timing": {
+                "rate_limit_wait": self.rate_limit_wait,
+                "response": self.response_time,
+                "total": self.total_time,
+            },
+            "error": self.error,
+        }
+
+
+class TrafficRecorder:
+    """Capturing every Transport request to rotating gzip-compressed JSONL files.
+
+    record() only puts the exchange on a bounded queue; a background thread
+    encodes, compresses and writes them in batches and starts a new file
+    once `max_bytes` of JSON were written to the current one. When the
+    queue is full, exchanges are dropped and counted instead of slowing
+    the caller down. Traces hold full request and response bodies,
+    including passwords and tokens; the Authorization header is never recorded.
+
+    Args:
+        directory (str): folder of the trace files, created when missing
+        prefix (str): file name prefix. Defaults to "traffic".
+        max_bytes (int): uncompressed bytes per file. Defaults to 64 MiB.
+        batch_size (int): exchanges written per batch. Defaults to 256.
+        flush_interval (float): seconds before a partial batch is written. Defaults to 1.
+        max_queue (int): exchanges waiting to be written. Defaults to 10000.
+        compresslevel (int): gzip level, lower is faster. Defaults to 6.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "traffic",
+        max_bytes: int = 64 * 1024 * 1024,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+        compresslevel: int = 6,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compresslevel = compresslevel
+        self.recorded = 0
+        self.dropped = 0
+        self.files: list[Path] = []
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._file: gzip.GzipFile | None = None
+        self._written = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="traffic-recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, exchange: Exchange) -> None:
+        try:
+            self._queue.put_nowait(exchange)
+        except queue.Full:
+            self.dropped += 1
+
+    def _open(self) -> gzip.GzipFile:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        name = f"{self.prefix}-{stamp}-{os.getpid()}-{len(self.files):04d}.jsonl.gz"
+        path = self.directory / name
+        self.files.append(path)
+        self._written = 0
+        return gzip.open(path, "wb", compresslevel=self.compresslevel)
+
+    def _write(self, batch: list[Exchange]) -> None:
+        lines = []
+        for exchange in batch:
+            try:
+                line = json.dumps(exchange.to_record(), ensure_ascii=False)
+                lines.append(line.encode() + b"\n")
+            except Exception as e:
+                logger.error("Encoding %s %s failed: %s", exchange.method, exchange.url, e)
+        for line in lines:
+            if self._file is None or self._written >= self.max_bytes:
+                if self._file is not None:
+                    self._file.close()
+                self._file = self._open()
+            self._file.write(line)
+            self._written += len(line)
+        self.recorded += len(lines)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            if batch:
+                try:
+                    self._write(batch)
+                    self._file.flush()
+                except Exception as e:
+                    logger.error("Writing %s exchanges failed: %s", len(batch), e)
+        if self._file is not None:
+            self._file.close()
+
+    def close(self) -> None:
+        """Writing what is queued and closing the current file"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self.dropped:
+            logger.warning("Traffic recorder dropped %s exchanges", self.dropped)
+
+    def __enter__(self) -> "TrafficRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_traffic(*paths: str) -> Iterator[dict]:
+    """Reading recorded exchanges from JSONL files, gzip-compressed or not, or folders of them
+
+    Args:
+        *paths (str): trace files or folders
+
+    Yields:
+        Iterator[dict]: one record per line, files in name order
+    """
+    files: list[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.jsonl.gz")) + sorted(path.glob("*.jsonl")))
+        else:
+            files.append(path)
+    for file in files:
+        opener = gzip.open if file.suffix == ".gz" else open
+        with opener(file, "rt", encoding="utf-8") as lines:
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
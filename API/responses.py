@@ -0,0 +1,221 @@
+import importlib
+import inspect
+import os
+import random
+import types
+from typing import Annotated, Any, Callable, TypeVar, Union, get_args, get_origin
+import requests
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+
+# operation -> (models package, response model); the operation names are the
+# ones the clients pass to the transport. Resolved lazily so that registering
+# a model does not import it.
+RESPONSE_MODELS: dict[str, tuple[str, str]] = {
+    "sign_up": ("MLX", "MLXResponse"),
+    "verify_email": ("MLX", "MLXResponse"),
+    "sign_in": ("MLX", "SigninResponse"),
+    "refresh_token": ("MLX", "SigninResponse"),
+    "get_folder_id": ("MLX", "UserFolderArrayResponse"),
+    "get_workspace_id": ("MLX", "UserWorkspaceArrayResponse"),
+    "create_profile": ("MLX", "ArrayOfIDsResponse"),
+    "delete_profile": ("MLX", "MLXResponse"),
+    "get_profile_metas": ("MLX", "ProfileMetaArrayResponse"),
+    "get_fingerprints": ("MLX", "FingerprintArrayResponse"),
+    # search_profiles has no entry: ProfileSearchQuery allows at most 50 profiles
+    # per page (limit goes up to 100) and rejects empty pages
+    "get_email_token": ("EMP", "TokenResponse"),
+    "start_profile": ("launcher", "Response"),
+    "stop_profile": ("launcher", "Response"),
+    "import_cookies": ("launcher", "Response"),
+}
+
+
+def response_model(operation: str) -> type[BaseModel] | None:
+    """Getting the response model registered for an operation
+
+    Args:
+        operation (str): name of the API operation
+
+    Returns:
+        type[BaseModel] | None: model class, None when the operation has none
+    """
+    entry = RESPONSE_MODELS.get(operation)
+    if entry is None:
+        return None
+    package, name = entry
+    return getattr(importlib.import_module(f"models.{package}"), name)
+
+
+def validate_all() -> bool:
+    """Debug switch: VALIDATE_ALL_RESPONSES=1 validates every typed response,
+    whatever sample rate the clients were given"""
+    return os.getenv("VALIDATE_ALL_RESPONSES", "0").lower() in ("1", "true", "yes")
+
+
+_converters: dict[Any, Callable[[Any], Any] | None] = {}
+_builders: dict[type[BaseModel], Callable[[Any], Any]] = {}
+
+
+def _unwrap(annotation: Any) -> Any:
+    while get_origin(annotation) is Annotated:
+        annotation = get_args(annotation)[0]
+    return annotation
+
+
+def _converter(annotation: Any) -> Callable[[Any], Any] | None:
+    """Compiling the conversion of a decoded JSON value into `annotation`;
+    None when the value is used as it is"""
+    try:
+        return _converters[annotation]
+    except KeyError:
+        pass
+    except TypeError:
+        return _compile(annotation)
+    converter = _converters[annotation] = _compile(annotation)
+    return converter
+
+
+def _compile(annotation: Any) -> Callable[[Any], Any] | None:
+    annotation = _unwrap(annotation)
+    origin = get_origin(annotation)
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return _builder(annotation)
+    if origin is list:
+        item = _converter(get_args(annotation)[0]) if get_args(annotation) else None
+        if item is None:
+            return None
+        return lambda value: [item(element) for element in value] if type(value) is list else value
+    if origin is dict:
+        item = _converter(get_args(annotation)[1]) if get_args(annotation) else None
+        if item is None:
+            return None
+        return lambda value: (
+            {key: item(element) for key, element in value.items()} if type(value) is dict else value
+        )
+    if origin in (Union, types.UnionType):
+        by_type = {}
+        for arg in map(_unwrap, get_args(annotation)):
+            if get_origin(arg) is list:
+                json_type = list
+            elif get_origin(arg) is dict or (inspect.isclass(arg) and issubclass(arg, BaseModel)):
+                json_type = dict
+            else:
+                continue
+            converter = _converter(arg)
+            if converter is not None:
+                by_type.setdefault(json_type, converter)
+        if not by_type:
+            return None
+        return lambda value: by_type[type(value)](value) if type(value) in by_type else value
+    return None
+
+
+def _builder(model: type[BaseModel]) -> Callable[[Any], Any]:
+    if model in _builders:
+        return _builders[model]
+    plan: list[tuple[str, str, Callable[[Any], Any] | None]] = []
+
+    def build(value: Any) -> Any:
+        if type(value) is not dict:
+            return value
+        values = {}
+        for name, key, converter in plan:
+            if key in value:
+                element = value[key]
+                if converter is not None and element is not None:
+                    element = converter(element)
+                values[name] = element
+        # model_construct fills in the defaults and sets up pydantic's own state
+        return model.model_construct(set(values), **values)
+
+    # registered before the fields are compiled, so self-referencing models terminate
+    _builders[model] = build
+    for name, field in model.model_fields.items():
+        plan.append((name, field.alias or name, _converter(field.annotation)))
+    return build
+
+
+def construct(model: type[BaseModel], data: dict) -> BaseModel:
+    """Building a model and its nested models from decoded JSON without validation
+
+    Does what model_construct does, recursively, with the conversion of every
+    model compiled once. Values are kept as they were decoded: datetimes and
+    enums stay strings and no constraints are checked.
+
+    Args:
+        model (type[BaseModel]): model class
+        data (dict): decoded JSON object, keyed by field aliases
+
+    Returns:
+        BaseModel: model instance
+    """
+    return _builder(model)(data)
+
+
+def decode_response(
+    response: requests.Response,
+    operation: str,
+    typed: bool = False,
+    sample_rate: float = 1.0,
+) -> dict | BaseModel:
+    """Decoding a response body
+
+    In typed mode the raw bytes are validated straight into the registered
+    model with model_validate_json, in a single pass. With a sample rate
+    below 1 (trusted mode) only that share of responses is validated, the
+    others are built with construct(). Error envelopes (non-2xx responses)
+    and operations without a model are returned as dicts.
+
+    Args:
+        response (requests.Response): API response
+        operation (str): name of the API operation
+        typed (bool): decode into the response model. Defaults to False.
+        sample_rate (float): share of typed responses that are validated. Defaults to 1.0.
+
+    Returns:
+        dict | BaseModel: response model in typed mode, the decoded JSON otherwise
+    """
+    if typed and response.ok:
+        model = response_model(operation)
+        if model is not None:
+            if sample_rate >= 1.0 or validate_all() or random.random() < sample_rate:
+                return model.model_validate_json(response.content)
+            return construct(model, response.json())
+    return response.json()
+
+
+def as_model(model: type[M], response: dict | BaseModel) -> M:
+    """Getting a client result as `model`, whatever mode the client runs in
+
+    Typed clients already return the model; dicts (untyped clients, error
+    envelopes, operations without a model) are validated into it.
+
+    Args:
+        model (type[M]): response model
+        response (dict | BaseModel): result of a client call
+
+    Returns:
+        M: response model instance
+    """
+    if isinstance(response, model):
+        return response
+    if isinstance(response, BaseModel):
+        response = response.model_dump(by_alias=True)
+    return model(**response)
+
+
+def http_code(response: dict | BaseModel) -> int:
+    """Getting status.http_code of a client result, typed or not
+
+    Args:
+        response (dict | BaseModel): result of a client call
+
+    Returns:
+        int: HTTP code reported in the body, 0 when there is none
+    """
+    if isinstance(response, dict):
+        return (response.get("status") or {}).get("http_code", 0)
+    return getattr(getattr(response, "status", None), "http_code", 0)
@@ -0,0 +1,143 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from urllib3.exceptions import NewConnectionError
+
+
+# Operations that only read, so resending them never repeats a side effect.
+# The method says nothing here: verify_email, start_profile and stop_profile are GETs.
+READ_OPERATIONS = frozenset({
+    "get_folder_id",
+    "get_workspace_id",
+    "get_email_token",
+    "get_fingerprints",
+    "get_profile_metas",
+    "search_profiles",
+})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# The request was rejected before it was processed, so any method may be resent
+REJECTED_STATUSES = frozenset({429})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Converting a Retry-After header to seconds
+
+    Args:
+        value (str | None): delay in seconds or an HTTP date
+
+    Returns:
+        float | None: seconds to wait, None when the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_connect_error(error: Exception) -> bool:
+    """Checking whether the request failed before anything was sent
+
+    Args:
+        error (Exception): exception raised by requests
+
+    Returns:
+        bool: True for connect timeouts, refused connections and DNS failures
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        reason = getattr(error.args[0], "reason", error.args[0])
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter that only resends requests when it is safe.
+
+    Read operations are retried on transient statuses and dropped connections.
+    Every other operation (e.g. create_profile, or start_profile, which is a
+    GET) is retried only when the caller sent it with a request key, or when
+    the server provably did not process it (429, failed connect). A request
+    key is the caller's promise that the server deduplicates the request by
+    its Idempotency-Key; the clients never make one up.
+
+    Args:
+        max_attempts (int): total attempts including the first one. Defaults to 4.
+        backoff_factor (float): base delay in seconds. Defaults to 0.5.
+        max_backoff (float): upper bound of a single delay. Defaults to 30.
+        jitter (bool): randomise delays to avoid retry storms. Defaults to True.
+        retry_statuses (frozenset[int]): statuses considered transient.
+        respect_retry_after (bool): wait as long as the server asks. Defaults to True.
+        read_operations (frozenset[str]): operations safe to resend. Defaults to READ_OPERATIONS.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        retry_statuses: frozenset[int] = RETRY_STATUSES,
+        respect_retry_after: bool = True,
+        read_operations: frozenset[str] = READ_OPERATIONS,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be positive, got {max_attempts}")
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+        self.respect_retry_after = respect_retry_after
+        self.read_operations = read_operations
+
+    @classmethod
+    def disabled(cls) -> "RetryPolicy":
+        return cls(max_attempts=1)
+
+    def is_safe(self, operation: str | None, request_key: str | None) -> bool:
+        return operation in self.read_operations or request_key is not None
+
+    def should_retry_status(
+        self, operation: str | None, request_key: str | None, status: int, attempt: int
+    ) -> bool:
+        if attempt >= self.max_attempts or status not in self.retry_statuses:
+            return False
+        return status in REJECTED_STATUSES or self.is_safe(operation, request_key)
+
+    def should_retry_error(
+        self, operation: str | None, request_key: str | None, error: Exception, attempt: int
+    ) -> bool:
+        if attempt >= self.max_attempts:
+            return False
+        if not isinstance(
+            error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+        ):
+            return False
+        return is_connect_error(error) or self.is_safe(operation, request_key)
+
+    def backoff(self, attempt: int, response: requests.Response | None = None) -> float:
+        """Computing the delay before the next attempt
+
+        Args:
+            attempt (int): number of attempts made so far (1-based)
+            response (requests.Response | None): last response, for Retry-After
+
+        Returns:
+            float: seconds to sleep
+        """
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if self.respect_retry_after and response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
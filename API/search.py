@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator
+from pydantic import BaseModel
+from models import MLX as mlx_models
+
+if TYPE_CHECKING:
+    from API.mlx_api import MLX
+
+
+logger = logging.getLogger("my_logger")
+
+# ProfileSearchCriteria caps `limit` at 100 and `offset` at 10000
+MAX_LIMIT = 100
+MAX_OFFSET = 10000
+# Filters the result space is split by when a query has more results than
+# the offset cap lets us page through, in order
+SPLITS = ("folder_id", "os_type")
+OS_TYPES = ("linux", "macos", "windows", "android")
+
+DEFAULT_CRITERIA = {
+    "offset": 0,
+    "limit": MAX_LIMIT,
+    "search_text": "",
+    "storage_type": "all",
+    "is_removed": False,
+}
+
+
+class _Page:
+    """One decoded page of search results"""
+
+    def __init__(self, total_count: int, items: list[dict]) -> None:
+        self.total_count = total_count
+        self.items = items
+
+
+class ProfileSearch:
+    """Streaming iterator over profile search results.
+
+    Pages are requested in offset order, with up to `prefetch` of the next
+    pages in flight while the current one is consumed; only those pages are
+    kept in memory. A query with more results than the offset cap can reach
+    is split by folder, then by OS type. A partition that is still too large
+    is walked by created_at ascending and then descending, which reaches twice
+    the cap; profiles sharing a created_at at the meeting point may be
+    yielded twice or missed.
+
+    Args:
+        mlx (MLX): MLX API client
+        token (str): Bearer token of the workspace
+        criteria (dict | None): ProfileSearchCriteria fields; offset and limit are managed here
+        page_size (int): profiles per request, at most 100. Defaults to 100.
+        prefetch (int): pages requested ahead of the consumer. Defaults to 4.
+    """
+
+    def __init__(
+        self,
+        mlx: MLX,
+        token: str,
+        criteria: dict | None = None,
+        page_size: int = MAX_LIMIT,
+        prefetch: int = 4,
+    ) -> None:
+        if not 1 <= page_size <= MAX_LIMIT:
+            raise ValueError(f"page_size must be between 1 and {MAX_LIMIT}, got {page_size}")
+        self.mlx = mlx
+        self.token = token
+        self.criteria = {**DEFAULT_CRITERIA, **(criteria or {}), "limit": page_size}
+        self.page_size = page_size
+        self.prefetch = max(1, prefetch)
+        # results a single query can page through: the last page starts at the
+        # highest multiple of page_size that does not pass the offset cap
+        self.window = (MAX_OFFSET // page_size + 1) * page_size
+
+    def _fetch(self, criteria: dict, offset: int) -> _Page:
+        res = self.mlx.search_profiles(token=self.token, criteria={**criteria, "offset": offset})
+        if isinstance(res, BaseModel):
+            res = res.model_dump(by_alias=True)
+        http_code = res["status"]["http_code"]
+        if http_code != 200:
+            raise RuntimeError(f"Profile search failed with {http_code}: {res['status']}")
+        data = res.get("data") or {}
+        return _Page(total_count=data.get("total_count", 0), items=data.get("profiles") or [])
+
+    def _split_values(self, split: str) -> list[str]:
+        if split == "os_type":
+            return list(OS_TYPES)
+        res = self.mlx.get_folder_id(token=self.token)
+        if isinstance(res, BaseModel):
+            res = res.model_dump(by_alias=True)
+        return [folder["folder_id"] for folder in res["data"]["folders"]]
+
+    def _pages(
+        self, executor: ThreadPoolExecutor, criteria: dict, count: int, first: _Page | None = None
+    ) -> Iterator[dict]:
+        remaining = min(count, self.window)
+        offsets = iter(range(0, remaining, self.page_size))
+        pending: deque[Future] = deque()
+        if first is not None:
+            next(offsets, None)
+            done: Future = Future()
+            done.set_result(first)
+            pending.append(done)
+        try:
+            while True:
+                while len(pending) <= self.prefetch:
+                    offset = next(offsets, None)
+                    if offset is None:
+                        break
+                    pending.append(executor.submit(self._fetch, criteria, offset))
+                if not pending:
+                    return
+                page: _Page = pending.popleft().result()
+                items = page.items[:remaining]
+                remaining -= len(items)
+                yield from items
+                if remaining <= 0 or len(page.items) < self.page_size:
+                    # Fewer results than counted: profiles were removed meanwhile
+                    return
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _walk(
+        self, executor: ThreadPoolExecutor, criteria: dict, splits: tuple[str, ...]
+    ) -> Iterator[dict]:
+        first = self._fetch(criteria, 0)
+        total = first.total_count
+        if total <= self.window:
+            yield from self._pages(executor, criteria, total, first)
+            return
+        splits = tuple(split for split in splits if criteria.get(split) is None)
+        if splits:
+            logger.info("%s profiles match, splitting the search by %s", total, splits[0])
+            for value in self._split_values(splits[0]):
+                yield from self._walk(executor, {**criteria, splits[0]: value}, splits[1:])
+            return
+        if total > 2 * self.window:
+            logger.warning(
+                "%s profiles match %s, only %s of them can be reached",
+                total, criteria, 2 * self.window,
+            )
+        ascending = {**criteria, "order_by": "created_at", "sort": "asc"}
+        descending = {**criteria, "order_by": "created_at", "sort": "desc"}
+        yield from self._pages(executor, ascending, self.window)
+        yield from self._pages(executor, descending, total - self.window)
+
+    def __iter__(self) -> Iterator[mlx_models.ProfileSearchQueryItem]:
+        with ThreadPoolExecutor(max_workers=self.prefetch) as executor:
+            for item in self._walk(executor, self.criteria, SPLITS):
+                yield mlx_models.ProfileSearchQueryItem.from_dict(item)
@@ -0,0 +1,332 @@
+import logging
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import PoolManager
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from API.rate_limit import RateLimiter
+from API.recorder import Exchange, TrafficRecorder, request_body
+from API.retry import RetryPolicy
+
+
+logger = logging.getLogger("my_logger")
+
+
+class PoolStats:
+    """Thread-safe connection reuse counters shared by every pool of a transport.
+
+    A hit is a request sent over an already open keep-alive connection,
+    a miss is a request that had to open a new TCP (+TLS) connection.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hosts: dict[str, list[int]] = {}
+
+    def record(self, host: str, reused: bool) -> None:
+        with self._lock:
+            counters = self._hosts.setdefault(host, [0, 0])
+            counters[0 if reused else 1] += 1
+
+    @property
+    def hits(self) -> int:
+        with self._lock:
+            return sum(hits for hits, _ in self._hosts.values())
+
+    @property
+    def misses(self) -> int:
+        with self._lock:
+            return sum(misses for _, misses in self._hosts.values())
+
+    def snapshot(self) -> dict:
+        """Returning the counters in total and per host
+
+        Returns:
+            dict: {'hits': int, 'misses': int, 'hosts': {host: {'hits': int, 'misses': int}}}
+        """
+        with self._lock:
+            hosts = {
+                host: {"hits": hits, "misses": misses}
+                for host, (hits, misses) in self._hosts.items()
+            }
+        return {
+            "hits": sum(counters["hits"] for counters in hosts.values()),
+            "misses": sum(counters["misses"] for counters in hosts.values()),
+            "hosts": hosts,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+
+
+class _CountingPoolMixin:
+    stats: PoolStats | None = None
+
+    def _make_request(self, conn, method, url, *args, **kwargs):
+        # The socket is opened lazily by urllib3, so a connection that is
+        # already connected here is a reused keep-alive connection.
+        if self.stats is not None:
+            self.stats.record(self.host, conn.is_connected)
+        return super()._make_request(conn, method, url, *args, **kwargs)
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _PoolManager(PoolManager):
+
+    def __init__(self, stats: PoolStats, host_limits: dict[str, int], **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.stats = stats
+        self.host_limits = host_limits
+        self.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        if request_context is None:
+            request_context = self.connection_pool_kw.copy()
+        else:
+            request_context = dict(request_context)
+        if host in self.host_limits:
+            request_context["maxsize"] = self.host_limits[host]
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.stats = self.stats
+        return pool
+
+
+class _PooledAdapter(HTTPAdapter):
+
+    def __init__(self, stats: PoolStats, host_limits: dict[str, int], **kwargs) -> None:
+        # init_poolmanager() is called from HTTPAdapter.__init__
+        self._stats = stats
+        self._host_limits = host_limits
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _PoolManager(
+            stats=self._stats,
+            host_limits=self._host_limits,
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            **pool_kwargs,
+        )
+
+
+class Transport:
+    """Pooled keep-alive HTTP layer shared by the MLX, EMP and Launcher clients.
+
+    Args:
+        pool_connections (int): number of per-host pools to keep. Defaults to 10.
+        pool_maxsize (int): connections kept alive per host. Defaults to 32.
+        host_limits (dict[str, int] | None): per-host override of pool_maxsize.
+        pool_block (bool): block instead of opening throw-away connections
+            when a host pool is exhausted. Defaults to False.
+        timeout (float | tuple | None): default requests timeout. Defaults to None.
+        keep_alive (bool): keep connections open between requests. Defaults to True.
+        rate_limiter (RateLimiter | None): client-side limiter applied to every request.
+        retry_policy (RetryPolicy | None): policy for transient failures.
+            Defaults to RetryPolicy(); use RetryPolicy.disabled() to turn retries off.
+        recorder (TrafficRecorder | None): captures every request with its final response.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        host_limits: dict[str, int] | None = None,
+        pool_block: bool = False,
+        timeout: float | tuple[float, float] | None = None,
+        keep_alive: bool = True,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        recorder: TrafficRecorder | None = None,
+    ) -> None:
+        self.stats = PoolStats()
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.recorder = recorder
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.host_limits = dict(host_limits or {})
+        self.pool_block = pool_block
+        # set by AsyncTransport when the limiter slot was already taken on the event loop
+        self._reserved = threading.local()
+        self.session = requests.Session()
+        self.session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+        self._mount()
+
+    def _mount(self) -> None:
+        adapter = _PooledAdapter(
+            stats=self.stats,
+            host_limits=self.host_limits,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def grow_pool(self, pool_maxsize: int) -> None:
+        """Keeping at least pool_maxsize connections alive per host, so that as many
+        concurrent callers do not open and drop throw-away connections. host_limits
+        still apply. Open connections are dropped once when the pool has to grow.
+
+        Args:
+            pool_maxsize (int): connections to keep alive per host
+        """
+        if pool_maxsize <= self.pool_maxsize:
+            return
+        logger.info("Growing the connection pool from %s to %s", self.pool_maxsize, pool_maxsize)
+        self.pool_maxsize = pool_maxsize
+        previous = self.session.get_adapter("https://")
+        self._mount()
+        previous.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        operation: str | None = None,
+        request_key: str | None = None,
+        **kwargs,
+    ) -> requests.Response:
+        """Sending a request through the shared session, retrying transient failures
+
+        Args:
+            method (str): HTTP method
+            url (str): full URL
+            operation (str | None): name of the API operation, used for rate limiting
+                and to tell read operations, which are retried, from the others
+            request_key (str | None): idempotency key sent as the Idempotency-Key
+                header; makes other operations safe to retry
+
+        Returns:
+            requests.Response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if request_key is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), "Idempotency-Key": request_key}
+        policy = self.retry_policy
+        started_at = time.time()
+        start = time.perf_counter()
+        waited = 0.0
+        attempt = 0
+        while True:
+            attempt += 1
+            if attempt == 1 and getattr(self._reserved, "slot", False):
+                self._reserved.slot = False
+            elif self.rate_limiter is not None:
+                acquiring = time.perf_counter()
+                self.rate_limiter.acquire(operation)
+                waited += time.perf_counter() - acquiring
+            try:
+                response = self.session.request(method=method, url=url, **kwargs)
+            except Exception as e:
+                if not policy.should_retry_error(operation, request_key, e, attempt):
+                    if self.recorder is not None:
+                        self._record(
+                            operation, method, url, kwargs, attempt, started_at, start, waited,
+                            error=e,
+                        )
+                    raise
+                delay = policy.backoff(attempt)
+                logger.warning(
+                    "%s %s failed (%s), retrying in %.2fs", method, url, e, delay
+                )
+            else:
+                if not policy.should_retry_status(
+                    operation, request_key, response.status_code, attempt
+                ):
+                    if self.recorder is not None:
+                        self._record(
+                            operation, method, url, kwargs, attempt, started_at, start, waited,
+                            response=response,
+                        )
+                    return response
+                delay = policy.backoff(attempt, response)
+                logger.warning(
+                    "%s %s returned %s, retrying in %.2fs",
+                    method, url, response.status_code, delay,
+                )
+                response.close()
+            time.sleep(delay)
+
+    def _record(
+        self,
+        operation: str | None,
+        method: str,
+        url: str,
+        kwargs: dict,
+        attempts: int,
+        started_at: float,
+        start: float,
+        waited: float,
+        response: requests.Response | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        if response is not None:
+            # the prepared URL carries the query string built from params=
+            self.recorder.record(
+                Exchange(
+                    started_at, operation, method, response.request.url, request_body(kwargs),
+                    response.status_code, response.content, attempts, waited,
+                    response.elapsed.total_seconds(), time.perf_counter() - start,
+                )
+            )
+            return
+        url = requests.Request(method, url, params=kwargs.get("params")).prepare().url
+        self.recorder.record(
+            Exchange(
+                started_at, operation, method, url, request_body(kwargs), None, None,
+                attempts, waited, None, time.perf_counter() - start, error=repr(error),
+            )
+        )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def pool_stats(self) -> dict:
+        return self.stats.snapshot()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_default_transport: Transport | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_transport() -> Transport:
+    """Returning the process-wide transport used by clients created without one
+
+    Returns:
+        Transport: shared transport
+    """
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = Transport()
+        return _default_transport
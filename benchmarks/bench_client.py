@@ -0,0 +1,121 @@
+"""Client-side hot paths: request and response models, helpers, config and one
+full API call against the local simulator, gated against a JSON baseline.
+
+Run from the repository root:
+    python -m benchmarks.bench_client                  # compare with the baseline
+    python -m benchmarks.bench_client --save           # record a new baseline
+    python -m benchmarks.bench_client --threshold 0.1  # fail above a 10% slowdown
+
+Baselines are machine-specific and not committed: record one with --save on the machine
+that runs the gate. A baseline from another Python version or architecture is not gated.
+"""
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+import jwt
+import requests
+import API
+import data
+import utils
+from models import MLX as mlx_models
+from stubs import EMAIL, PASSWORD, Simulator
+from benchmarks import harness
+
+
+BASELINE = Path(__file__).parent / "baselines" / "client.json"
+ID = "00000000-0000-4000-8000-000000000001"
+STATUS = {"error_code": "", "http_code": 200, "message": ""}
+
+SIGNIN = json.dumps(
+    {"status": STATUS, "data": {"token": "t" * 400, "refresh_token": "r" * 36}}
+).encode()
+
+META = {
+    "id": ID,
+    "folder_id": ID,
+    "workspace_id": ID,
+    "status": "active",
+    "created_at": "2024-01-01T00:00:00Z",
+    "last_update_at": "2024-01-01T00:00:00Z",
+    "removed_at": "2024-01-01T00:00:00Z",
+    "removed_by": "",
+    "browser_type": data.PROFILE_FULL["browser_type"],
+    "os_type": data.PROFILE_FULL["os_type"],
+    "core_version": data.PROFILE_FULL["core_version"],
+    "name": "Benchmark profile",
+    "tags": ["bench"],
+    "parameters": data.PROFILE_FULL["parameters"],
+}
+# One page of get_profile_metas, which takes at most 100 ids
+METAS = json.dumps({"status": STATUS, "data": {"profiles": [META] * 100}}).encode()
+
+TOKEN = jwt.encode(
+    {
+        "email": EMAIL,
+        "userID": ID,
+        "workspaceID": ID,
+        "workspaceRole": "workspace_owner",
+        "exp": int(time.time()) + 3600,
+    },
+    "secret",
+    algorithm="HS256",
+)
+
+
+def response(body: bytes) -> requests.Response:
+    res = requests.Response()
+    res.status_code = 200
+    res._content = body
+    return res
+
+
+def cases(simulator: Simulator, transport: API.Transport) -> dict[str, Callable[[], object]]:
+    """Building the benchmark cases
+
+    Args:
+        simulator (Simulator): running simulator the API call goes to
+        transport (API.Transport): transport of the API calls, closed by the caller
+
+    Returns:
+        dict[str, Callable[[], object]]: case name -> code under test
+    """
+    helper = utils.Helper()
+    config = utils.ConfigProvider("config.ini")
+    body = mlx_models.CreateProfile.from_dict(data.PROFILE_FULL)
+    metas = response(METAS)
+
+    mlx = API.MLX(url=simulator.url, transport=transport)
+    typed = API.MLX(url=simulator.url, transport=transport, typed=True, sample_rate=0.0)
+    mlx.sign_up(EMAIL, PASSWORD)
+    token = mlx.sign_in(EMAIL, PASSWORD)["data"]["token"]
+
+    return {
+        "CreateProfile.from_dict": lambda: mlx_models.CreateProfile.from_dict(data.PROFILE_FULL),
+        "CreateProfile.to_json": body.to_json,
+        "SigninResponse.model_validate_json": lambda: (
+            mlx_models.SigninResponse.model_validate_json(SIGNIN)
+        ),
+        "ProfileMetaArrayResponse.model_validate_json (100 metas)": lambda: (
+            mlx_models.ProfileMetaArrayResponse.model_validate_json(METAS)
+        ),
+        "decode_response get_profile_metas, trusted (100 metas)": lambda: (
+            API.decode_response(metas, "get_profile_metas", typed=True, sample_rate=0.0)
+        ),
+        "Helper.decode_token": lambda: helper.decode_token(TOKEN),
+        "Helper.get_headers": lambda: helper.get_headers(TOKEN),
+        "ConfigProvider.get_url": lambda: config.get_url("MLX_API"),
+        "MLX.sign_in (simulator)": lambda: mlx.sign_in(EMAIL, PASSWORD),
+        "MLX.get_folder_id, typed (simulator)": lambda: typed.get_folder_id(token),
+    }
+
+
+if __name__ == "__main__":
+    with Simulator(seed=1) as simulator, API.Transport(
+        retry_policy=API.RetryPolicy.disabled()
+    ) as transport:
+        code = harness.main(
+            cases(simulator, transport), BASELINE, prog="python -m benchmarks.bench_client"
+        )
+    sys.exit(code)
@@ -0,0 +1,84 @@
+"""Parity and speed of the request body serialization paths.
+
+Run from the repository root:
+    python -m benchmarks.bench_serialization
+"""
+import json
+import data
+import models
+from models import MLX as mlx_models
+from models import launcher as launcher_models
+from benchmarks.harness import best_micros
+
+
+def legacy_to_json(body) -> bytes:
+    # What the generated to_json() did before: nested to_dict() calls + json.dumps
+    return json.dumps(body.to_dict()).encode()
+
+
+BODIES = {
+    "CreateProfile (generic)": mlx_models.CreateProfile.from_dict(
+        {**data.PROFILE_GENERIC, "folder_id": "f"}
+    ),
+    "CreateProfile (full)": mlx_models.CreateProfile.from_dict(data.PROFILE_FULL),
+    "CookieImport (1 MB jar)": launcher_models.CookieImport(
+        profile_id="p", folder_id="f", cookies="x" * 1_000_000
+    ),
+}
+
+PATHS = {
+    "json.dumps(to_dict())": legacy_to_json,
+    "to_json()": lambda body: body.to_json().encode(),
+    "dump_json()": models.dump_json,
+}
+
+
+# Per-request bodies: only name, folder_id and tags change between bulk create_profile calls
+FIELDS = {"name": "Bulk profile 1", "folder_id": "f", "tags": ["bulk", "run-1"]}
+TEMPLATE = models.PayloadTemplate(mlx_models.CreateProfile, data.PROFILE_FULL, tuple(FIELDS))
+
+REQUESTS = {
+    "from_dict() + dump_json()": lambda: models.dump_json(
+        mlx_models.CreateProfile.from_dict({**data.PROFILE_FULL, **FIELDS})
+    ),
+    "PayloadTemplate.render()": lambda: TEMPLATE.render(**FIELDS),
+}
+
+
+def check_parity() -> None:
+    for name, body in BODIES.items():
+        expected = json.loads(legacy_to_json(body))
+        for path, serialize in PATHS.items():
+            assert json.loads(serialize(body)) == expected, f"{path} differs for {name}"
+    rendered = {path: build() for path, build in REQUESTS.items()}
+    assert len(set(rendered.values())) == 1, f"per-request bodies differ: {rendered}"
+
+
+def run(repeat: int = 5) -> dict[str, dict[str, float]]:
+    """Measuring every serialization path on every body
+
+    Args:
+        repeat (int): timing rounds, the best one is kept. Defaults to 5.
+
+    Returns:
+        dict[str, dict[str, float]]: body -> path -> microseconds per call
+    """
+    results = {}
+    for name, body in BODIES.items():
+        results[name] = {}
+        for path, serialize in PATHS.items():
+            results[name][path] = best_micros(lambda: serialize(body), repeat)
+    results["CreateProfile per request"] = {
+        path: best_micros(build, repeat) for path, build in REQUESTS.items()
+    }
+    return results
+
+
+if __name__ == "__main__":
+    check_parity()
+    print("parity: OK")
+    for name, paths in run().items():
+        baseline = next(iter(paths.values()))
+        print(name)
+        for path, micros in paths.items():
+            print(f"    {path:<28}{micros:>10.1f} us   x{baseline / micros:.1f}")
@@ -0,0 +1,203 @@
+"""Timing harness, JSON baselines and the regression gate shared by the benchmarks."""
+import argparse
+import json
+import os
+import platform
+import timeit
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+
+# A path fails the gate when it is more than 25% slower than its baseline
+DEFAULT_THRESHOLD = 0.25
+
+
+@dataclass
+class Regression:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def best_micros(call: Callable[[], object], repeat: int) -> float:
+    """Timing a call: autorange picks the loop size, the best of the rounds is kept
+
+    Args:
+        call (Callable[[], object]): code under test
+        repeat (int): timing rounds
+
+    Returns:
+        float: microseconds per call
+    """
+    timer = timeit.Timer(call)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def run(
+    cases: dict[str, Callable[[], object]], repeat: int = 5, select: str | None = None
+) -> dict[str, float]:
+    """Measuring every case
+
+    Args:
+        cases (dict[str, Callable[[], object]]): case name -> code under test
+        repeat (int): timing rounds per case. Defaults to 5.
+        select (str | None): only run the cases whose name contains it. Defaults to None.
+
+    Returns:
+        dict[str, float]: case name -> microseconds per call
+    """
+    return {
+        name: best_micros(call, repeat)
+        for name, call in cases.items()
+        if select is None or select in name
+    }
+
+
+def environment() -> dict[str, str]:
+    """Describing the interpreter and machine the timings are taken on
+
+    Returns:
+        dict[str, str]: python version, machine architecture and processor
+    """
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def save_baseline(path: str | Path, results: dict[str, float]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {
+        **environment(),
+        "results": {name: round(micros, 3) for name, micros in sorted(results.items())},
+    }
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def load_baseline(path: str | Path) -> dict[str, float]:
+    """Reading the timings of a baseline, empty when there is none yet
+
+    Args:
+        path (str | Path): baseline JSON written by save_baseline()
+
+    Returns:
+        dict[str, float]: case name -> microseconds per call
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["results"]
+
+
+def mismatch(path: str | Path) -> dict[str, tuple[str, str]]:
+    """Finding where the baseline was recorded on another interpreter or machine.
+    Timings from a different Python version or architecture are not comparable.
+
+    Args:
+        path (str | Path): baseline JSON written by save_baseline()
+
+    Returns:
+        dict[str, tuple[str, str]]: key -> (recorded, current), empty when they match
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    recorded = json.loads(path.read_text())
+    return {
+        key: (recorded.get(key, ""), current)
+        for key, current in environment().items()
+        if key in ("python", "machine") and recorded.get(key, "") != current
+    }
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[Regression]:
+    """Finding the cases slower than their baseline by more than the threshold.
+    Cases missing from the baseline are new and never regress.
+
+    Args:
+        results (dict[str, float]): current timings
+        baseline (dict[str, float]): baseline timings
+        threshold (float): allowed slowdown, 0.25 allows 25%
+
+    Returns:
+        list[Regression]: regressed cases
+    """
+    return [
+        Regression(name, baseline[name], current)
+        for name, current in results.items()
+        if name in baseline and current > baseline[name] * (1 + threshold)
+    ]
+
+
+def main(cases: dict[str, Callable[[], object]], baseline: str | Path, prog: str) -> int:
+    """Command line of a benchmark script: measure, print, then save or gate
+
+    Args:
+        cases (dict[str, Callable[[], object]]): case name -> code under test
+        baseline (str | Path): default baseline file
+        prog (str): program name shown in the help
+
+    Returns:
+        int: exit code, 1 when a case regressed against a baseline of this environment
+    """
+    parser = argparse.ArgumentParser(prog=prog)
+    parser.add_argument("--baseline", default=str(baseline), help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="record the results as the baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=float(os.getenv("BENCH_THRESHOLD", DEFAULT_THRESHOLD)),
+        help="allowed slowdown before failing, e.g. 0.25 for 25%% (env BENCH_THRESHOLD)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timing rounds per case")
+    parser.add_argument("-k", dest="select", default=None, help="only cases containing this")
+    args = parser.parse_args()
+
+    results = run(cases, args.repeat, args.select)
+    previous = load_baseline(args.baseline)
+    different = mismatch(args.baseline)
+    regressions = compare(results, previous, args.threshold)
+    # A busy machine can slow one case down: measure regressed cases again, keep the faster run
+    for regression in regressions:
+        again = best_micros(cases[regression.name], args.repeat)
+        results[regression.name] = min(results[regression.name], again)
+    regressions = compare(results, previous, args.threshold)
+    regressed = {regression.name for regression in regressions}
+
+    width = max(map(len, results), default=0) + 4
+    for name, micros in results.items():
+        line = f"{name:<{width}}{micros:>10.2f} us"
+        if name in previous:
+            line += f"   {micros / previous[name] - 1:+7.1%}"
+            line += "   REGRESSED" if name in regressed else ""
+        print(line)
+
+    if args.save:
+        save_baseline(args.baseline, {**previous, **results})
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if not previous:
+        print(f"no baseline at {args.baseline}, run with --save to record one")
+    if different:
+        details = ", ".join(
+            f"{key} {recorded or '?'} -> {current}"
+            for key, (recorded, current) in different.items()
+        )
+        print(f"WARNING: baseline recorded on another environment ({details}), not gating; "
+              "run with --save to record one here")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than the baseline by more than "
+              f"{args.threshold:.0%}")
+        return 1
+    return 0
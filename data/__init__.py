@@ -3,3 +3,4 @@
 from data.data import *
 from data.profile_data import *
 
+from data.profile_generator import ProfileGenerator
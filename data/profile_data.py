@@ -1,11 +1,19 @@
+import os
 import faker
 fake = faker.Faker()
 
+# Browser cores of new profiles; MIMIC_CORE_VERSION and STEALTHFOX_CORE_VERSION
+# pick up a new core without a code change
+CORE_VERSIONS = {
+    'mimic': int(os.getenv('MIMIC_CORE_VERSION', 131)),
+    'stealthfox': int(os.getenv('STEALTHFOX_CORE_VERSION', 130)),
+}
+
 PROFILE_GENERIC = {
     'browser_type': 'mimic',
     'folder_id': '',
     'auto_update_core': False,
-    'core_version': 131,
+    'core_version': CORE_VERSIONS['mimic'],
     'name': f'{fake.name()}',
     'os_type': 'windows',
     'parameters': {
@@ -32,3 +40,36 @@ PROFILE_GENERIC = {
     },
     'times': 1,
 }
+
+# Fully populated profile (fingerprint, proxy, tags, non-ASCII text)
+# for serialization checks and benchmarks
+PROFILE_FULL = {
+    **PROFILE_GENERIC,
+    'folder_id': '7a1b8ad4-7f0e-4c0c-b1d6-6c3c4f9b1c2e',
+    'name': 'Zoë Łukasiewicz',
+    'tags': ['load', 'ünïcode'],
+    'notes': 'serialization parity',
+    'times': 20,
+    'parameters': {
+        **PROFILE_GENERIC['parameters'],
+        'fingerprint': {
+            'navigator': {
+                'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
+                'hardware_concurrency': 8,
+                'platform': 'Win32',
+            },
+            'localization': {'accept_languages': 'en-US,en;q=0.9', 'languages': '', 'locale': ''},
+            'timezone': {'zone': 'Europe/Tallinn'},
+            'graphic': {'vendor': 'Google Inc.', 'renderer': 'ANGLE (NVIDIA)'},
+            'webrtc': {'public_ip': '127.0.0.1'},
+            'fonts': ['Arial', 'Verdana'],
+            'media_devices': {'video_inputs': 1, 'audio_inputs': 1, 'audio_outputs': 2},
+            'screen': {'width': 1920, 'height': 1080, 'pixel_ratio': 1.5},
+            'geolocation': {'latitude': 59.43, 'longitude': 24.75, 'altitude': 10, 'accuracy': 100},
+            'ports': [80, 443],
+            'cmd_params': {'params': [{'flag': 'disable-gpu'}]},
+        },
+        'proxy': {'type': 'http', 'host': 'proxy.local', 'port': 8080},
+        'custom_start_urls': ['https://multilogin.com'],
+    },
+}
@@ -0,0 +1,157 @@
+import random
+from itertools import count as counter
+from typing import Iterator
+import faker
+from data.profile_data import CORE_VERSIONS
+
+
+OS_TYPES = ("windows", "macos", "linux")
+BROWSER_TYPES = ("mimic", "stealthfox")
+
+# Flag values that need no custom fingerprint, proxy or start URLs
+FLAG_CHOICES = {
+    "audio_masking": ("mask", "natural"),
+    "fonts_masking": ("mask", "natural"),
+    "geolocation_masking": ("mask",),
+    "geolocation_popup": ("prompt", "allow", "block"),
+    "graphics_masking": ("mask", "natural"),
+    "graphics_noise": ("mask", "natural"),
+    "localization_masking": ("mask", "natural"),
+    "media_devices_masking": ("mask", "natural"),
+    "navigator_masking": ("mask", "natural"),
+    "ports_masking": ("mask", "natural"),
+    "proxy_masking": ("disabled",),
+    "quic_mode": ("natural", "disabled"),
+    "screen_masking": ("mask", "natural"),
+    "timezone_masking": ("mask", "natural"),
+    "webrtc_masking": ("disabled", "mask", "natural"),
+    "startup_behavior": ("recover",),
+}
+# ProfileMeta allows tags of up to 10 characters
+MAX_TAG_LENGTH = 10
+
+
+class ProfileGenerator:
+    """Seeded stream of unique, valid create_profile payloads.
+
+    Every generator has its own random state and name pools, so workers
+    seeded differently never share anything and the same seed always gives
+    the same payloads. Names are made unique by a running number, and
+    `prefix` keeps them unique across workers.
+
+    Args:
+        seed (int | None): seed of the random state. Random when None.
+        folder_id (str): folder of the profiles. Defaults to "".
+        prefix (str): added to every name, e.g. the xdist worker id. Defaults to "".
+        os_types (tuple[str, ...]): OS types to pick from
+        browser_types (tuple[str, ...]): browser types to pick from
+        core_versions (dict[str, int] | None): core version per browser type.
+            Defaults to data.CORE_VERSIONS.
+        pool_size (int): first and last names pre-generated each. Defaults to 500.
+    """
+
+    def __init__(
+        self,
+        seed: int | None = None,
+        folder_id: str = "",
+        prefix: str = "",
+        os_types: tuple[str, ...] = OS_TYPES,
+        browser_types: tuple[str, ...] = BROWSER_TYPES,
+        core_versions: dict[str, int] | None = None,
+        pool_size: int = 500,
+    ) -> None:
+        self.seed = seed
+        self.folder_id = folder_id
+        self.prefix = prefix
+        self.os_types = os_types
+        self.browser_types = browser_types
+        self.core_versions = core_versions or CORE_VERSIONS
+        self._random = random.Random(seed)
+        self._numbers = counter()
+        names = faker.Faker()
+        names.seed_instance(seed)
+        self._first_names = [names.first_name() for _ in range(pool_size)]
+        self._last_names = [names.last_name() for _ in range(pool_size)]
+        self._tags = sorted({word[:MAX_TAG_LENGTH] for word in names.words(nb=100)})
+        self._flags = [(flag, values) for flag, values in FLAG_CHOICES.items()]
+
+    def batch(self, size: int) -> list[dict]:
+        """Generating a batch of payloads
+
+        Every random field is drawn for the whole batch at once.
+
+        Args:
+            size (int): number of payloads
+
+        Returns:
+            list[dict]: independent CreateProfile payloads with times=1
+        """
+        choices = self._random.choices
+        first_names = choices(self._first_names, k=size)
+        last_names = choices(self._last_names, k=size)
+        os_types = choices(self.os_types, k=size)
+        browser_types = choices(self.browser_types, k=size)
+        tag_counts = choices(range(4), k=size)
+        tags = choices(self._tags, k=3 * size)
+        flags = [(flag, choices(values, k=size)) for flag, values in self._flags]
+        is_local = choices((False, True), weights=(9, 1), k=size)
+        numbers = self._numbers
+        payloads = []
+        for index in range(size):
+            payload = {
+                "name": f"{first_names[index]} {last_names[index]} #{self.prefix}{next(numbers)}",
+                "browser_type": browser_types[index],
+                "core_version": self.core_versions[browser_types[index]],
+                "os_type": os_types[index],
+                "folder_id": self.folder_id,
+                "auto_update_core": False,
+                "times": 1,
+                "parameters": {
+                    "fingerprint": {},
+                    "flags": {flag: values[index] for flag, values in flags},
+                    "storage": {"is_local": is_local[index], "save_service_worker": False},
+                },
+            }
+            if tag_counts[index]:
+                # dict.fromkeys drops repeated tags, which the API rejects
+                payload["tags"] = list(dict.fromkeys(tags[3 * index:3 * index + tag_counts[index]]))
+            payloads.append(payload)
+        return payloads
+
+    def name(self) -> str:
+        """Generating one unique profile name, e.g. for a fixed payload
+
+        Returns:
+            str: profile name
+        """
+        first_name = self._random.choice(self._first_names)
+        last_name = self._random.choice(self._last_names)
+        return f"{first_name} {last_name} #{self.prefix}{next(self._numbers)}"
+
+    def payload(self, **overrides) -> dict:
+        """Generating one payload
+
+        Args:
+            **overrides: top-level fields to set, e.g. folder_id
+
+        Returns:
+            dict: CreateProfile payload
+        """
+        return {**self.batch(1)[0], **overrides}
+
+    def stream(self, total: int | None = None, batch_size: int = 1000) -> Iterator[list[dict]]:
+        """Streaming payloads in batches
+
+        Args:
+            total (int | None): payloads to generate. Endless when None.
+            batch_size (int): payloads per batch. Defaults to 1000.
+
+        Yields:
+            Iterator[list[dict]]: batches of payloads
+        """
+        remaining = total
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            yield self.batch(size)
+            if remaining is not None:
+                remaining -= size
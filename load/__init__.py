@@ -0,0 +1,4 @@
+# flake8: noqa
+
+from load.lifecycle import LifecycleLoad, LoadProfile, STEPS
+from load.stats import LoadStats, percentile
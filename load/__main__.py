@@ -0,0 +1,64 @@
+import argparse
+import json
+import API
+import utils
+from load.lifecycle import LifecycleLoad, LoadProfile
+
+
+config = utils.ConfigProvider("config.ini")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m load",
+        description="Profile lifecycle load: create -> start -> import cookies -> stop -> delete",
+    )
+    parser.add_argument("--users", type=int, default=10, help="virtual users")
+    parser.add_argument("--rate", type=float, default=None, help="lifecycles started per second")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to run")
+    parser.add_argument("--iterations", type=int, default=None, help="stop after N lifecycles")
+    parser.add_argument("--think", type=float, nargs=2, default=(0.0, 0.0), metavar=("MIN", "MAX"))
+    parser.add_argument("--cookies", default=None, help="cookie file imported into every profile")
+    parser.add_argument("--fingerprints", action="store_true", help="send pre-fetched fingerprints")
+    parser.add_argument("--record", default=None, metavar="DIR", help="capture traffic to DIR")
+    parser.add_argument("--role", default="owner", help="role whose token and folder are used")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    creds = getattr(utils.Helper().get_user_data(), args.role)
+    cookies = None
+    if args.cookies:
+        with open(args.cookies, "r") as file:
+            cookies = file.read()
+    recorder = API.TrafficRecorder(args.record) if args.record else None
+    transport = API.Transport(pool_maxsize=max(args.users, 10), recorder=recorder)
+    mlx = API.MLX(url=config.get_url(section="MLX_API"), transport=transport)
+    token = utils.Helper().verify_token(creds.token)
+    fingerprints = API.FingerprintPool(mlx=mlx, token=token) if args.fingerprints else None
+    engine = LifecycleLoad(
+        mlx=mlx,
+        launcher=API.Launcher(
+            url=config.get_url(section="LAUNCHER_API", key="LAUNCHER_URL_v2"), transport=transport
+        ),
+        token=token,
+        folder_id=creds.folder_id,
+        profile=LoadProfile(
+            virtual_users=args.users,
+            arrival_rate=args.rate,
+            duration=args.duration,
+            iterations=args.iterations,
+            think_time=tuple(args.think),
+            cookies=cookies,
+        ),
+        fingerprints=fingerprints,
+    )
+    stats = engine.run()
+    if fingerprints is not None:
+        fingerprints.close()
+    if recorder is not None:
+        recorder.close()
+    print(json.dumps(stats.report(), indent=4) if args.json else stats.format_report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import copy
+import logging
+import queue
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable
+import API
+import data
+from load.stats import LoadStats
+from models import MLX as mlx_models
+
+
+logger = logging.getLogger("my_logger")
+
+STEPS = ("create_profile", "start_profile", "import_cookies", "stop_profile", "delete_profile")
+
+
+@dataclass
+class LoadProfile:
+    """Shape of a load run
+
+    virtual_users: number of concurrent users
+    arrival_rate: new lifecycles started per second (open model); when None,
+        every virtual user starts its next lifecycle right after the previous one.
+        create_profile latency is then measured from the scheduled arrival, so time
+        spent waiting for a free virtual user is reported instead of hidden
+    duration: seconds to generate load for
+    iterations: stop after this many lifecycles, if set
+    think_time: (min, max) seconds a user pauses between steps
+    cookies: cookie jar imported into every profile; the step is skipped when None
+    """
+    virtual_users: int = 10
+    arrival_rate: float | None = None
+    duration: float = 60.0
+    iterations: int | None = None
+    think_time: tuple[float, float] = (0.0, 0.0)
+    cookies: str | None = None
+
+
+class LifecycleLoad:
+    """Load generator driving create -> start -> import cookies -> stop -> delete per profile
+
+    Args:
+        mlx (API.MLX): MLX API client
+        launcher (API.Launcher): Launcher API client
+        token (str): Bearer token of the workspace
+        folder_id (str): folder the profiles are created in
+        profile (LoadProfile): shape of the run
+        body (dict | None): create_profile body. Defaults to PROFILE_GENERIC.
+        fingerprints (API.FingerprintPool | None): pre-fetched fingerprints for the profiles
+    """
+
+    def __init__(
+        self,
+        mlx: API.MLX,
+        launcher: API.Launcher,
+        token: str,
+        folder_id: str,
+        profile: LoadProfile,
+        body: dict | None = None,
+        fingerprints: API.FingerprintPool | None = None,
+    ) -> None:
+        self.mlx = mlx
+        self.launcher = launcher
+        self.token = token
+        self.folder_id = folder_id
+        self.profile = profile
+        self.body = copy.deepcopy(body or data.PROFILE_GENERIC)
+        self.body.update({"folder_id": folder_id, "times": 1})
+        self.fingerprints = fingerprints
+        self.stats = LoadStats()
+        self._stop = threading.Event()
+        self._tickets: queue.Queue = queue.Queue()
+        self._started = 0
+        self._started_lock = threading.Lock()
+
+    def _step(
+        self, name: str, call: Callable[[], Any], start: float | None = None
+    ) -> dict | None:
+        if start is None:
+            start = time.perf_counter()
+        try:
+            response = call()
+        except Exception as e:
+            self.stats.record(name, time.perf_counter() - start, ok=False)
+            logger.warning("%s failed: %s", name, e)
+            return None
+        ok = 200 <= API.http_code(response) < 300
+        self.stats.record(name, time.perf_counter() - start, ok=ok)
+        return response if ok else None
+
+    def _think(self) -> None:
+        low, high = self.profile.think_time
+        if high > 0:
+            self._stop.wait(random.uniform(low, high))
+
+    def run_lifecycle(self, scheduled_at: float | None = None) -> None:
+        """Running one create -> start -> import cookies -> stop -> delete cycle.
+        Every cycle counts as an iteration, one that fails to create or start a profile
+        as a failed one
+
+        Args:
+            scheduled_at (float | None): perf_counter() time the lifecycle was due to
+                start; create_profile latency is measured from it when given
+        """
+        body = {**self.body, "name": f"load-{uuid.uuid4().hex[:12]}"}
+        if self.fingerprints is not None:
+            body = self.fingerprints.apply(body)
+        created = self._step(
+            "create_profile",
+            lambda: self.mlx.create_profile(token=self.token, profile_params=body),
+            start=scheduled_at,
+        )
+        if created is None:
+            self.stats.iteration_done(ok=False)
+            return
+        profile_id = API.as_model(mlx_models.ArrayOfIDsResponse, created).data.ids[0]
+        started = None
+        try:
+            started = self._step(
+                "start_profile",
+                lambda: self.launcher.start_profile(
+                    token=self.token, profile_id=profile_id, folder_id=self.folder_id
+                ),
+            )
+            if started is None:
+                return
+            self._think()
+            if self.profile.cookies is not None:
+                self._step(
+                    "import_cookies",
+                    lambda: self.launcher.import_cookies(
+                        token=self.token,
+                        pid=profile_id,
+                        fid=self.folder_id,
+                        cookies=self.profile.cookies,
+                    ),
+                )
+                self._think()
+            self._step(
+                "stop_profile",
+                lambda: self.launcher.stop_profile(token=self.token, profile_id=profile_id),
+            )
+            self._think()
+        finally:
+            self._step(
+                "delete_profile",
+                lambda: self.mlx.delete_profile(token=self.token, profile_ids=[profile_id]),
+            )
+            self.stats.iteration_done(ok=started is not None)
+
+    def _claim_iteration(self) -> bool:
+        with self._started_lock:
+            if self.profile.iterations is not None and self._started >= self.profile.iterations:
+                return False
+            self._started += 1
+            return True
+
+    def _virtual_user(self) -> None:
+        while not self._stop.is_set():
+            scheduled_at = None
+            if self.profile.arrival_rate is not None:
+                try:
+                    scheduled_at = self._tickets.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            if not self._claim_iteration():
+                return
+            self.run_lifecycle(scheduled_at)
+
+    def _arrivals(self) -> None:
+        interval = 1.0 / self.profile.arrival_rate
+        next_at = time.perf_counter()
+        while not self._stop.is_set():
+            self._tickets.put(next_at)
+            next_at += interval
+            self._stop.wait(max(0.0, next_at - time.perf_counter()))
+
+    def run(self) -> LoadStats:
+        """Generating load until the duration or the iteration count is reached
+
+        Returns:
+            LoadStats: collected measurements
+        """
+        users = [
+            threading.Thread(target=self._virtual_user, name=f"vu-{number}", daemon=True)
+            for number in range(self.profile.virtual_users)
+        ]
+        threads = list(users)
+        if self.profile.arrival_rate is not None:
+            threads.append(threading.Thread(target=self._arrivals, name="arrivals", daemon=True))
+        self.stats = LoadStats()
+        if self.fingerprints is not None:
+            self.fingerprints.prefetch(
+                self.body["os_type"], self.body["browser_type"], self.body["core_version"]
+            )
+        for thread in threads:
+            thread.start()
+        deadline = time.perf_counter() + self.profile.duration
+        while time.perf_counter() < deadline and any(user.is_alive() for user in users):
+            time.sleep(0.05)
+        self._stop.set()
+        for thread in threads:
+            thread.join()
+        self.stats.finish()
+        return self.stats
+
+    def stop(self) -> None:
+        self._stop.set()
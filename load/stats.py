@@ -0,0 +1,106 @@
+import math
+import threading
+import time
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list
+
+    Args:
+        sorted_values (list[float]): values in ascending order
+        pct (float): percentile between 0 and 100
+
+    Returns:
+        float: percentile value, 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LoadStats:
+    """Thread-safe per-step latency and error bookkeeping of a load run"""
+
+    PERCENTILES = (50, 90, 95, 99)
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latencies: dict[str, list[float]] = {}
+        self._errors: dict[str, int] = {}
+        self.iterations = 0
+        self.failed_iterations = 0
+        self.started_at = time.perf_counter()
+        self.finished_at: float | None = None
+
+    def record(self, step: str, latency: float, ok: bool) -> None:
+        with self._lock:
+            self._latencies.setdefault(step, []).append(latency)
+            if not ok:
+                self._errors[step] = self._errors.get(step, 0) + 1
+
+    def iteration_done(self, ok: bool = True) -> None:
+        with self._lock:
+            self.iterations += 1
+            if not ok:
+                self.failed_iterations += 1
+
+    def finish(self) -> None:
+        self.finished_at = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def report(self) -> dict:
+        """Summarising the run
+
+        Returns:
+            dict: totals plus count, error rate, throughput and latency percentiles (ms) per step
+        """
+        elapsed = self.elapsed or 1e-9
+        with self._lock:
+            steps = {}
+            for step, latencies in self._latencies.items():
+                values = sorted(latencies)
+                errors = self._errors.get(step, 0)
+                steps[step] = {
+                    "count": len(values),
+                    "errors": errors,
+                    "error_rate": errors / len(values),
+                    "throughput": len(values) / elapsed,
+                    **{f"p{pct}": percentile(values, pct) * 1000 for pct in self.PERCENTILES},
+                    "max": values[-1] * 1000,
+                }
+            requests = sum(len(latencies) for latencies in self._latencies.values())
+            errors = sum(self._errors.values())
+            iterations = self.iterations
+            failed_iterations = self.failed_iterations
+        return {
+            "elapsed": elapsed,
+            "iterations": iterations,
+            "failed_iterations": failed_iterations,
+            "iterations_per_second": iterations / elapsed,
+            "requests": requests,
+            "requests_per_second": requests / elapsed,
+            "error_rate": errors / requests if requests else 0.0,
+            "steps": steps,
+        }
+
+    def format_report(self) -> str:
+        report = self.report()
+        lines = [
+            f"{report['iterations']} iterations ({report['failed_iterations']} failed) "
+            f"in {report['elapsed']:.1f}s "
+            f"({report['iterations_per_second']:.2f} it/s, "
+            f"{report['requests_per_second']:.2f} req/s, "
+            f"errors {report['error_rate']:.2%})",
+            f"{'step':<16}{'count':>7}{'err%':>8}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'max':>9}",
+        ]
+        for step, row in report["steps"].items():
+            lines.append(
+                f"{step:<16}{row['count']:>7}{row['error_rate']:>8.1%}"
+                f"{row['p50']:>9.1f}{row['p90']:>9.1f}{row['p95']:>9.1f}"
+                f"{row['p99']:>9.1f}{row['max']:>9.1f}"
+            )
+        return "\n".join(lines)
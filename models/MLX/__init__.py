@@ -14,96 +14,131 @@
 """  # noqa: E501
 
 
-# import models into model package
-from models.MLX.allowed_screen_resolutions import AllowedScreenResolutions
-from models.MLX.array_of_ids import ArrayOfIDs
-from models.MLX.array_of_ids_response import ArrayOfIDsResponse
-from models.MLX.auto_update_core_profiles import AutoUpdateCoreProfiles
-from models.MLX.browser_extension import BrowserExtension
-from models.MLX.browser_extension_list import BrowserExtensionList
-from models.MLX.browser_type import BrowserType
-from models.MLX.complex_signup import ComplexSignup
-from models.MLX.clone_profile import CloneProfile
-from models.MLX.cmd_param import CmdParam
-from models.MLX.cmd_params import CmdParams
-from models.MLX.create_network import CreateNetwork
-from models.MLX.create_profile import CreateProfile
-from models.MLX.create_single_object import CreateSingleObject
-from models.MLX.create_single_object_response import CreateSingleObjectResponse
-from models.MLX.extensions_create import ExtensionsCreate
-from models.MLX.fingerprint import Fingerprint
-from models.MLX.fingerprint_array import FingerprintArray
-from models.MLX.fingerprint_array_response import FingerprintArrayResponse
-from models.MLX.fingerprint_data import FingerprintData
-from models.MLX.fingerprint_data_response import FingerprintDataResponse
-from models.MLX.geolocation import Geolocation
-from models.MLX.get_profile_parts import GetProfileParts
-from models.MLX.graphic import Graphic
-from models.MLX.list_of_string_ids import ListOfStringIDs
-from models.MLX.localization import Localization
-from models.MLX.mlx_response import MLXResponse
-from models.MLX.masking_cd import MaskingCD
-from models.MLX.masking_cm import MaskingCM
-from models.MLX.masking_mn import MaskingMN
-from models.MLX.masking_mnd import MaskingMND
-from models.MLX.masking_ncm import MaskingNCM
-from models.MLX.masking_ncmd import MaskingNCMD
-from models.MLX.masking_nd import MaskingND
-from models.MLX.masking_pab import MaskingPAB
-from models.MLX.media_devices import MediaDevices
-from models.MLX.move_profile import MoveProfile
-from models.MLX.navigator import Navigator
-from models.MLX.network import Network
-from models.MLX.network_array import NetworkArray
-from models.MLX.network_array_response import NetworkArrayResponse
-from models.MLX.partial_profile_meta_update_params import PartialProfileMetaUpdateParams
-from models.MLX.partial_update_profile import PartialUpdateProfile
-from models.MLX.profile_meta import ProfileMeta
-from models.MLX.profile_meta_array import ProfileMetaArray
-from models.MLX.profile_meta_array_response import ProfileMetaArrayResponse
-from models.MLX.profile_meta_core import ProfileMetaCore
-from models.MLX.profile_meta_flags import ProfileMetaFlags
-from models.MLX.profile_meta_flags_optional import ProfileMetaFlagsOptional
-from models.MLX.profile_meta_internal import ProfileMetaInternal
-from models.MLX.profile_meta_pam import ProfileMetaPAM
-from models.MLX.profile_meta_update import ProfileMetaUpdate
-from models.MLX.profile_meta_update_params import ProfileMetaUpdateParams
-from models.MLX.profile_search_criteria import ProfileSearchCriteria
-from models.MLX.profile_search_query import ProfileSearchQuery
-from models.MLX.profile_search_query_item import ProfileSearchQueryItem
-from models.MLX.profile_search_query_response import ProfileSearchQueryResponse
-from models.MLX.profiles_count import ProfilesCount
-from models.MLX.profiles_count_response import ProfilesCountResponse
-from models.MLX.proxy import Proxy
-from models.MLX.quick_profile import QuickProfile
-from models.MLX.quick_profile_meta_params import QuickProfileMetaParams
-from models.MLX.ready_profile import ReadyProfile
-from models.MLX.ready_profile_core import ReadyProfileCore
-from models.MLX.ready_profile_response import ReadyProfileResponse
-from models.MLX.refresh_token import RefreshToken
-from models.MLX.remove_network import RemoveNetwork
-from models.MLX.remove_profiles import RemoveProfiles
-from models.MLX.response_status import ResponseStatus
-from models.MLX.restore_profiles import RestoreProfiles
-from models.MLX.setting import Setting
-from models.MLX.settings import Settings
-from models.MLX.screen import Screen
-from models.MLX.screen_resolution import ScreenResolution
-from models.MLX.screen_resolutions import ScreenResolutions
-from models.MLX.screen_resolutions_response import ScreenResolutionsResponse
-from models.MLX.signin import Signin
-from models.MLX.signin_response import SigninResponse
-from models.MLX.startup_behavior import StartupBehavior
-from models.MLX.storage import Storage
-from models.MLX.timezone import Timezone
-from models.MLX.update_profile import UpdateProfile
-from models.MLX.user_creds import UserCreds
-from models.MLX.user_folder_array import UserFolderArray
-from models.MLX.user_folder_array_response import UserFolderArrayResponse
-from models.MLX.user_workspace import UserWorkspace
-from models.MLX.user_workspace_array import UserWorkspaceArray
-from models.MLX.user_workspace_array_response import UserWorkspaceArrayResponse
-from models.MLX.webrtc import Webrtc
-from models.MLX.workspace_user import WorkspaceUser
-from models.MLX.workspace_user_array import WorkspaceUserArray
-from models.MLX.workspace_user_array_response import WorkspaceUserArrayResponse
+import importlib
+import sys
+
+# Model classes are imported on first access: every generated module builds its
+# pydantic schema at import time, and most callers only need a handful of them.
+# model name -> module of the package
+_MODELS = {
+    "AllowedScreenResolutions": "allowed_screen_resolutions",
+    "ArrayOfIDs": "array_of_ids",
+    "ArrayOfIDsResponse": "array_of_ids_response",
+    "AutoUpdateCoreProfiles": "auto_update_core_profiles",
+    "BrowserExtension": "browser_extension",
+    "BrowserExtensionList": "browser_extension_list",
+    "BrowserType": "browser_type",
+    "ComplexSignup": "complex_signup",
+    "CloneProfile": "clone_profile",
+    "CmdParam": "cmd_param",
+    "CmdParams": "cmd_params",
+    "CreateNetwork": "create_network",
+    "CreateProfile": "create_profile",
+    "CreateSingleObject": "create_single_object",
+    "CreateSingleObjectResponse": "create_single_object_response",
+    "ExtensionsCreate": "extensions_create",
+    "Fingerprint": "fingerprint",
+    "FingerprintArray": "fingerprint_array",
+    "FingerprintArrayResponse": "fingerprint_array_response",
+    "FingerprintData": "fingerprint_data",
+    "FingerprintDataResponse": "fingerprint_data_response",
+    "Geolocation": "geolocation",
+    "GetProfileParts": "get_profile_parts",
+    "Graphic": "graphic",
+    "ListOfStringIDs": "list_of_string_ids",
+    "Localization": "localization",
+    "MLXResponse": "mlx_response",
+    "MaskingCD": "masking_cd",
+    "MaskingCM": "masking_cm",
+    "MaskingMN": "masking_mn",
+    "MaskingMND": "masking_mnd",
+    "MaskingNCM": "masking_ncm",
+    "MaskingNCMD": "masking_ncmd",
+    "MaskingND": "masking_nd",
+    "MaskingPAB": "masking_pab",
+    "MediaDevices": "media_devices",
+    "MoveProfile": "move_profile",
+    "Navigator": "navigator",
+    "Network": "network",
+    "NetworkArray": "network_array",
+    "NetworkArrayResponse": "network_array_response",
+    "PartialProfileMetaUpdateParams": "partial_profile_meta_update_params",
+    "PartialUpdateProfile": "partial_update_profile",
+    "ProfileMeta": "profile_meta",
+    "ProfileMetaArray": "profile_meta_array",
+    "ProfileMetaArrayResponse": "profile_meta_array_response",
+    "ProfileMetaCore": "profile_meta_core",
+    "ProfileMetaFlags": "profile_meta_flags",
+    "ProfileMetaFlagsOptional": "profile_meta_flags_optional",
+    "ProfileMetaInternal": "profile_meta_internal",
+    "ProfileMetaPAM": "profile_meta_pam",
+    "ProfileMetaUpdate": "profile_meta_update",
+    "ProfileMetaUpdateParams": "profile_meta_update_params",
+    "ProfileSearchCriteria": "profile_search_criteria",
+    "ProfileSearchQuery": "profile_search_query",
+    "ProfileSearchQueryItem": "profile_search_query_item",
+    "ProfileSearchQueryResponse": "profile_search_query_response",
+    "ProfilesCount": "profiles_count",
+    "ProfilesCountResponse": "profiles_count_response",
+    "Proxy": "proxy",
+    "QuickProfile": "quick_profile",
+    "QuickProfileMetaParams": "quick_profile_meta_params",
+    "ReadyProfile": "ready_profile",
+    "ReadyProfileCore": "ready_profile_core",
+    "ReadyProfileResponse": "ready_profile_response",
+    "RefreshToken": "refresh_token",
+    "RemoveNetwork": "remove_network",
+    "RemoveProfiles": "remove_profiles",
+    "ResponseStatus": "response_status",
+    "RestoreProfiles": "restore_profiles",
+    "Setting": "setting",
+    "Settings": "settings",
+    "Screen": "screen",
+    "ScreenResolution": "screen_resolution",
+    "ScreenResolutions": "screen_resolutions",
+    "ScreenResolutionsResponse": "screen_resolutions_response",
+    "Signin": "signin",
+    "SigninResponse": "signin_response",
+    "StartupBehavior": "startup_behavior",
+    "Storage": "storage",
+    "Timezone": "timezone",
+    "UpdateProfile": "update_profile",
+    "UserCreds": "user_creds",
+    "UserFolderArray": "user_folder_array",
+    "UserFolderArrayResponse": "user_folder_array_response",
+    "UserWorkspace": "user_workspace",
+    "UserWorkspaceArray": "user_workspace_array",
+    "UserWorkspaceArrayResponse": "user_workspace_array_response",
+    "Webrtc": "webrtc",
+    "WorkspaceUser": "workspace_user",
+    "WorkspaceUserArray": "workspace_user_array",
+    "WorkspaceUserArrayResponse": "workspace_user_array_response",
+}
+
+__all__ = list(_MODELS)
+
+
+def __getattr__(name: str):
+    module = _MODELS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    model = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = model
+    return model
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_MODELS))
+
+
+def preload(*names: str) -> None:
+    """Importing models up front, building their schemas
+
+    Useful in a parent process before workers are forked, or before timing
+    anything that should not include the first-access cost.
+
+    Args:
+        *names (str): models to load. Every model of the package when omitted.
+    """
+    for name in names or _MODELS:
+        getattr(sys.modules[__name__], name)
@@ -92,7 +92,8 @@ class ProfileSearchCriteria(BaseModel):
 
     def to_json(self) -> str:
         """Returns the JSON representation of the model using alias"""
-        # TODO: pydantic v2: use .model_dump_json(by_alias=True, exclude_unset=True) instead
+        # Kept on to_dict(): `sort` is nullable and must be sent as null when set to None,
+        # which model_dump_json(exclude_none=True) would drop
         return json.dumps(self.to_dict())
 
     @classmethod
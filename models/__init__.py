@@ -1,3 +1,5 @@
 # flake8: noqa
 from models.user_data import UserData
+from models.serialization import dump_json
+from models.templates import PayloadTemplate
 # import MLX, API, launcher
\ No newline at end of file
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+def dump_json(model: BaseModel) -> bytes:
+    """Serializing a generated model straight to UTF-8 JSON bytes in pydantic-core
+
+    Produces the same aliased, exclude-none document as `model.to_dict()`
+    without building the intermediate dicts, and the bytes can be sent as a
+    request body as they are. Numbers of float/int union fields are written
+    as floats (10.0), which is the same JSON number.
+
+    Args:
+        model (BaseModel): generated model
+
+    Returns:
+        bytes: JSON document
+    """
+    return model.__pydantic_serializer__.to_json(model, by_alias=True, exclude_none=True)
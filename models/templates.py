@@ -0,0 +1,82 @@
+import json
+from typing import Annotated, Any
+from pydantic import BaseModel, TypeAdapter
+
+
+class PayloadTemplate:
+    """Request body validated once and rendered to JSON bytes many times.
+
+    The base payload is validated against the model once and every field
+    that does not change is pre-serialized. render() only checks and
+    serializes the changing top-level fields against their own field types
+    and splices them in, so no model is built and nothing is deep-copied.
+    The bytes equal `dump_json(model.from_dict({**base, **fields}))`.
+
+    Fields checked by a model field validator (e.g. CreateProfile.os_type)
+    cannot change, since the validator would not run on render.
+
+    Args:
+        model (type[BaseModel]): generated request model, e.g. CreateProfile
+        base (dict): payload holding every required field
+        fields (tuple[str, ...]): JSON keys of the top-level fields that change per request
+    """
+
+    def __init__(self, model: type[BaseModel], base: dict, fields: tuple[str, ...]) -> None:
+        validated = model.from_dict(base)
+        by_alias = {field.alias or name: name for name, field in model.model_fields.items()}
+        unknown = set(fields) - set(by_alias)
+        if unknown:
+            raise ValueError(f"{model.__name__} has no fields {sorted(unknown)}")
+        checked = {
+            name
+            for decorator in model.__pydantic_decorators__.field_validators.values()
+            for name in decorator.info.fields
+        }
+        if checked & {by_alias[key] for key in fields}:
+            raise ValueError(
+                f"{sorted(checked & {by_alias[key] for key in fields})} are checked by "
+                f"validators of {model.__name__} and cannot be template fields"
+            )
+        self.model = model
+        self.fields = fields
+        self._slots: list[tuple[str | None, bytes | None, TypeAdapter | None, bytes | None]] = []
+        for key, name in by_alias.items():
+            static = None
+            if getattr(validated, name) is not None:
+                static = model.__pydantic_serializer__.to_json(
+                    validated, by_alias=True, exclude_none=True, include={name}
+                )[1:-1]
+            if key not in fields:
+                if static is not None:
+                    self._slots.append((None, static, None, None))
+                continue
+            field = model.model_fields[name]
+            annotation = (
+                Annotated[(field.annotation, *field.metadata)] if field.metadata else field.annotation
+            )
+            self._slots.append(
+                (key, static, TypeAdapter(annotation), json.dumps(key).encode() + b":")
+            )
+
+    def render(self, **fields: Any) -> bytes:
+        """Rendering the body with the given fields; fields left out keep their base value
+
+        Args:
+            **fields: values of the template fields, None drops an optional field
+
+        Returns:
+            bytes: JSON body
+        """
+        unknown = fields.keys() - set(self.fields)
+        if unknown:
+            raise ValueError(f"Not template fields: {sorted(unknown)}")
+        chunks = []
+        for key, static, adapter, prefix in self._slots:
+            if key is None or key not in fields:
+                if static is not None:
+                    chunks.append(static)
+                continue
+            value = adapter.validate_python(fields[key])
+            if value is not None:
+                chunks.append(prefix + adapter.dump_json(value, by_alias=True, exclude_none=True))
+        return b"{" + b",".join(chunks) + b"}"
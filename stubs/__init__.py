@@ -0,0 +1,5 @@
+# flake8: noqa
+
+from stubs.replay import ReplayIndex, ReplayServer, normalize_body, request_key
+from stubs.server import StubServer
+from stubs.simulator import EMAIL, PASSWORD, Endpoint, Simulator
@@ -0,0 +1,53 @@
+import argparse
+import time
+from stubs.replay import ReplayIndex, ReplayServer
+from stubs.simulator import Endpoint, Simulator
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m stubs", description="Local stand-ins for dev-api and the Launcher"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    replay = commands.add_parser("replay", help="serve traffic captured by API.TrafficRecorder")
+    replay.add_argument("paths", nargs="+", help="trace files or folders")
+    replay.add_argument("--host", default="127.0.0.1")
+    replay.add_argument("--port", type=int, default=8080)
+    replay.add_argument("--latency", type=float, nargs="+", default=[0.0], metavar="SECONDS",
+                        help="fixed latency, or MIN MAX")
+    replay.add_argument("--ignore", nargs="*", default=[], metavar="KEY",
+                        help="body keys that may differ from the recording, e.g. name")
+    simulate = commands.add_parser("simulate", help="stateful MLX, EMP and Launcher simulator")
+    simulate.add_argument("--host", default="127.0.0.1")
+    simulate.add_argument("--port", type=int, default=8080)
+    simulate.add_argument("--seed", type=int, default=None)
+    simulate.add_argument("--latency", type=float, nargs="+", default=[0.0], metavar="SECONDS",
+                          help="fixed latency, or MIN MAX")
+    simulate.add_argument("--error-rate", type=float, default=0.0, help="share answered with 500")
+    simulate.add_argument("--rate", type=float, default=None,
+                          help="requests per second per endpoint before 429")
+    simulate.add_argument("--burst", type=int, default=1)
+    args = parser.parse_args()
+
+    latency = tuple(args.latency) if len(args.latency) == 2 else args.latency[0]
+    if args.command == "replay":
+        index = ReplayIndex.load(*args.paths, ignore=tuple(args.ignore))
+        server = ReplayServer(index, host=args.host, port=args.port, latency=latency)
+        banner = f"Replaying {index.size} responses"
+    else:
+        endpoint = Endpoint(
+            latency=latency, error_rate=args.error_rate, rate=args.rate, burst=args.burst
+        )
+        server = Simulator(host=args.host, port=args.port, seed=args.seed, default=endpoint)
+        banner = "Simulating MLX, EMP and the Launcher (at /api/v2)"
+    with server:
+        print(f"{banner} on {server.url}, Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print(dict(server.counts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import json
+import logging
+import random
+import time
+from itertools import cycle
+from urllib.parse import parse_qsl, urlsplit
+from API.recorder import decode_body, iter_traffic, url_template
+from stubs.server import StubServer
+
+
+logger = logging.getLogger("my_logger")
+
+Key = tuple[str, str, str, bytes]
+Reply = tuple[int, bytes]
+
+
+def normalize_body(body: bytes, ignore: frozenset[str] = frozenset()) -> bytes:
+    """Canonical form of a request body: JSON with sorted keys and without the ignored
+    keys at any depth, other bodies as they are
+
+    Args:
+        body (bytes): request body
+        ignore (frozenset[str]): keys that differ between runs, e.g. profile names
+
+    Returns:
+        bytes: normalized body
+    """
+    if not body:
+        return b""
+    try:
+        document = json.loads(body)
+    except ValueError:
+        return body
+    return json.dumps(_drop(document, ignore), sort_keys=True, separators=(",", ":")).encode()
+
+
+def _drop(value, ignore: frozenset[str]):
+    if isinstance(value, dict):
+        return {key: _drop(item, ignore) for key, item in value.items() if key not in ignore}
+    if isinstance(value, list):
+        return [_drop(item, ignore) for item in value]
+    return value
+
+
+def request_key(
+    method: str, url: str, body: bytes, ignore: frozenset[str] = frozenset()
+) -> Key:
+    """Key of a request: method, path template, sorted query and normalized body"""
+    query = "&".join(f"{name}={value}" for name, value in sorted(parse_qsl(urlsplit(url).query)))
+    return method.upper(), url_template(url), query, normalize_body(body, ignore)
+
+
+class ReplayIndex:
+    """Recorded responses indexed by request key.
+
+    A request is answered with the responses recorded for its exact key, or
+    else with those recorded for its method and path template. Several
+    responses recorded for one key are served in turn.
+
+    Args:
+        ignore (tuple[str, ...]): body keys left out of the key at any depth
+    """
+
+    def __init__(self, ignore: tuple[str, ...] = ()) -> None:
+        self.ignore = frozenset(ignore)
+        self.size = 0
+        self._exact: dict[Key, list[Reply]] = {}
+        self._routes: dict[tuple[str, str], list[Reply]] = {}
+        self._exact_cycles: dict[Key, cycle] = {}
+        self._route_cycles: dict[tuple[str, str], cycle] = {}
+
+    @classmethod
+    def load(cls, *paths: str, ignore: tuple[str, ...] = ()) -> "ReplayIndex":
+        """Indexing traffic captured by API.TrafficRecorder
+
+        Args:
+            *paths (str): trace files or folders
+            ignore (tuple[str, ...]): body keys left out of the key
+
+        Returns:
+            ReplayIndex: index of every recorded response
+        """
+        index = cls(ignore)
+        for record in iter_traffic(*paths):
+            if record.get("status") is None:
+                continue
+            index.add(
+                record["method"],
+                record["url"],
+                decode_body(record["request_body"], record.get("request_encoding")),
+                record["status"],
+                decode_body(record["response_body"], record.get("response_encoding")),
+            )
+        return index
+
+    def add(self, method: str, url: str, body: bytes, status: int, response: bytes) -> None:
+        key = request_key(method, url, body, self.ignore)
+        self._exact.setdefault(key, []).append((status, response))
+        self._routes.setdefault(key[:2], []).append((status, response))
+        self._exact_cycles[key] = cycle(self._exact[key])
+        self._route_cycles[key[:2]] = cycle(self._routes[key[:2]])
+        self.size += 1
+
+    def lookup(self, method: str, url: str, body: bytes) -> tuple[Reply | None, bool]:
+        """Finding the response of a request
+
+        Returns:
+            tuple[Reply | None, bool]: (status and body, whether the key matched exactly)
+        """
+        key = request_key(method, url, body, self.ignore)
+        replies = self._exact_cycles.get(key)
+        if replies is not None:
+            return next(replies), True
+        replies = self._route_cycles.get(key[:2])
+        return (next(replies) if replies is not None else None), False
+
+
+NOT_RECORDED = (
+    b'{"status": {"error_code": "NOT_RECORDED", "http_code": 404, "message": "Not recorded"}}'
+)
+
+
+class ReplayServer(StubServer):
+    """Local HTTP stand-in for dev-api and the Launcher serving recorded traffic.
+
+    Connections are kept alive and served by a thread each, so a pooled
+    Transport reaches thousands of requests per second. Point the clients
+    at `url` (and `url + "/api/v2"` for the Launcher).
+
+    Args:
+        index (ReplayIndex): recorded responses
+        host (str): interface to listen on. Defaults to 127.0.0.1.
+        port (int): port, 0 picks a free one. Defaults to 0.
+        latency (float | tuple[float, float]): seconds added to every reply,
+            or a (min, max) range. Defaults to 0.
+        route_latency (dict | None): latency per path template, e.g. {"/profile/create": 0.2}
+    """
+
+    def __init__(
+        self,
+        index: ReplayIndex,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float | tuple[float, float] = 0.0,
+        route_latency: dict[str, float | tuple[float, float]] | None = None,
+    ) -> None:
+        super().__init__(host, port)
+        self.index = index
+        self.latency = latency
+        self.route_latency = route_latency or {}
+
+    def delay(self, template: str) -> float:
+        latency = self.route_latency.get(template, self.latency)
+        if isinstance(latency, tuple):
+            return random.uniform(*latency)
+        return latency
+
+    def respond(self, method: str, path: str, headers, body: bytes) -> tuple[int, bytes, dict]:
+        reply, exact = self.index.lookup(method, path, body)
+        self.count("exact" if exact else "route" if reply else "missing")
+        delay = self.delay(url_template(path))
+        if delay > 0:
+            time.sleep(delay)
+        status, payload = reply or (404, NOT_RECORDED)
+        return status, payload, {}
+
+    def start(self) -> "ReplayServer":
+        super().start()
+        logger.info("Replaying %s responses on %s", self.index.size, self.url)
+        return self
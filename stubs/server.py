@@ -0,0 +1,95 @@
+import logging
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+logger = logging.getLogger("my_logger")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler answering every request with `server.respond()`"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle on, each reply waits for a delayed ACK
+    disable_nagle_algorithm = True
+    server: "StubServer"
+
+    def _dispatch(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, payload, headers = self.server.respond(self.command, self.path, self.headers, body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded local HTTP server answering through respond(); run with start()/stop()
+    or as a context manager
+
+    Args:
+        host (str): interface to listen on. Defaults to 127.0.0.1.
+        port (int): port, 0 picks a free one. Defaults to 0.
+    """
+
+    daemon_threads = True
+    # The default backlog of 5 drops connections when many clients connect at once
+    request_queue_size = 1024
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        super().__init__((host, port), StubHandler)
+        self.counts: Counter = Counter()
+        self._counts_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond(self, method: str, path: str, headers, body: bytes) -> tuple[int, bytes, dict]:
+        """Answering a request
+
+        Args:
+            method (str): HTTP method
+            path (str): path with the query string
+            headers: request headers
+            body (bytes): request body
+
+        Returns:
+            tuple[int, bytes, dict]: status, JSON body and extra headers
+        """
+        raise NotImplementedError
+
+    def count(self, outcome: str) -> None:
+        with self._counts_lock:
+            self.counts[outcome] += 1
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(
+            target=self.serve_forever, name=type(self).__name__, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
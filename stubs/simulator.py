@@ -0,0 +1,497 @@
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+from urllib.parse import parse_qsl, urlsplit
+import jwt
+from pydantic import BaseModel, ValidationError
+from models import dump_json
+from models import EMP as emp_models
+from models import MLX as mlx_models
+from models import launcher as launcher_models
+from models.MLX.user_folder import UserFolder
+from stubs.server import StubServer
+
+
+logger = logging.getLogger("my_logger")
+
+SECRET = "simulator"
+DEFAULT_FOLDER = "Default folder"
+ROLE = "workspace_owner"
+TOKEN_TTL = 3600
+# Account the tests and benchmarks sign up with
+EMAIL = "simulated@example.com"
+PASSWORD = "Password1!"
+# navigator.platform of the generated fingerprints
+PLATFORMS = {
+    "windows": "Win32",
+    "macos": "MacIntel",
+    "linux": "Linux x86_64",
+    "android": "Linux armv8l",
+}
+
+Latency = float | tuple[float, float] | Callable[[random.Random], float]
+
+# (method, path pattern, operation); operations are named like the client methods
+ROUTES = [
+    ("POST", r"/user/signup", "sign_up"),
+    ("POST", r"/user/signin", "sign_in"),
+    ("GET", r"/user/verify_email", "verify_email"),
+    ("POST", r"/user/refresh_token", "refresh_token"),
+    ("GET", r"/user/workspaces", "get_workspace_id"),
+    ("GET", r"/workspace/folders", "get_folder_id"),
+    ("POST", r"/profile/create", "create_profile"),
+    ("POST", r"/profile/remove", "delete_profile"),
+    ("GET", r"/fingerprint", "get_fingerprints"),
+    ("GET", r"/emp/verification_token", "get_email_token"),
+    ("POST", r"/emp/restrictions", "set_restrictions"),
+    (
+        "GET",
+        r"/api/v2/profile/f/(?P<folder_id>[^/]+)/p/(?P<profile_id>[^/]+)/start",
+        "start_profile",
+    ),
+    ("GET", r"/api/v1/profile/stop/p/(?P<profile_id>[^/]+)", "stop_profile"),
+    ("POST", r"/api/v2/cookie_import", "import_cookies"),
+]
+
+
+class SimulatedError(Exception):
+    """Error response of a simulated endpoint"""
+
+    def __init__(self, http_code: int, error_code: str, message: str) -> None:
+        super().__init__(message)
+        self.http_code = http_code
+        self.error_code = error_code
+        self.message = message
+
+
+@dataclass
+class Endpoint:
+    """Behaviour of one simulated operation
+
+    latency: seconds per reply, a (min, max) range, or a callable drawing
+        from the simulator's seeded Random, e.g. lambda rng: rng.lognormvariate(-3, 0.5)
+    error_rate: share of requests answered with 500
+    rate: requests per second accepted before answering 429; unlimited when None.
+        The token bucket runs on the wall clock, not on the seeded Random, so
+        which requests get a 429 depends on timing and is not reproducible.
+    burst: requests accepted at once on top of the rate
+    """
+    latency: Latency = 0.0
+    error_rate: float = 0.0
+    rate: float | None = None
+    burst: int = 1
+
+
+class _Bucket:
+    """Token bucket answering how long a rejected request should wait"""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+@dataclass
+class User:
+    email: str
+    password: str
+    user_id: str
+    workspace_id: str
+    email_token: str
+    refresh_token: str = ""
+    verified: bool = False
+
+
+@dataclass
+class Workspace:
+    workspace_id: str
+    name: str
+    folders: dict[str, UserFolder] = field(default_factory=dict)
+    restrictions: dict | None = None
+
+
+@dataclass
+class Profile:
+    profile_id: str
+    workspace_id: str
+    body: mlx_models.CreateProfile
+    created_at: datetime
+    running: bool = False
+    cookies: int = 0
+
+
+@dataclass
+class _Request:
+    method: str
+    query: dict[str, str]
+    params: dict[str, str]
+    headers: dict
+    body: bytes
+
+
+def _status(http_code: int, message: str, error_code: str = "") -> dict:
+    return {"http_code": http_code, "error_code": error_code, "message": message}
+
+
+class Simulator(StubServer):
+    """Stateful local stand-in for the MLX, EMP and Launcher APIs.
+
+    Serves sign-up, e-mail verification, sign-in, token refresh, restrictions,
+    workspace and folder listings, fingerprints, profile create/remove and
+    Launcher start/stop/cookie import. Request bodies are validated and replies are
+    built with the generated models, and users, workspaces, folders and
+    profiles are kept in memory. Latency, 500s and 429s are injected per
+    operation; latencies and 500s come from one seeded Random, so they are
+    reproducible for the same seed and request order. 429s depend on how
+    fast the requests arrive (see Endpoint.rate).
+
+    Point MLX and EMP at `url` and the Launcher at `url + "/api/v2"`.
+
+    Args:
+        host (str): interface to listen on. Defaults to 127.0.0.1.
+        port (int): port, 0 picks a free one. Defaults to 0.
+        seed (int | None): seed of latencies, failures and ids
+        endpoints (dict[str, Endpoint] | None): behaviour per operation, e.g. "create_profile"
+        default (Endpoint | None): behaviour of the other operations
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int | None = None,
+        endpoints: dict[str, Endpoint] | None = None,
+        default: Endpoint | None = None,
+    ) -> None:
+        super().__init__(host, port)
+        self.endpoints = endpoints or {}
+        self.default = default or Endpoint()
+        self.users: dict[str, User] = {}
+        self.workspaces: dict[str, Workspace] = {}
+        self.profiles: dict[str, Profile] = {}
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._state = threading.RLock()
+        self._buckets: dict[str, _Bucket] = {}
+        self._routes = [
+            (method, re.compile(f"^{pattern}$"), operation) for method, pattern, operation in ROUTES
+        ]
+
+    def endpoint(self, operation: str) -> Endpoint:
+        return self.endpoints.get(operation, self.default)
+
+    def _draw(self, draw: Callable[[random.Random], float]) -> float:
+        with self._random_lock:
+            return draw(self._random)
+
+    def _id(self) -> str:
+        return str(uuid.UUID(int=self._draw(lambda rng: rng.getrandbits(128)), version=4))
+
+    def _latency(self, latency: Latency) -> float:
+        if callable(latency):
+            return self._draw(latency)
+        if isinstance(latency, tuple):
+            return self._draw(lambda rng: rng.uniform(*latency))
+        return latency
+
+    def _bucket(self, operation: str, endpoint: Endpoint) -> _Bucket:
+        with self._random_lock:
+            bucket = self._buckets.get(operation)
+            if bucket is None:
+                bucket = self._buckets[operation] = _Bucket(endpoint.rate, endpoint.burst)
+            return bucket
+
+    def respond(self, method: str, path: str, headers, body: bytes) -> tuple[int, bytes, dict]:
+        url = urlsplit(path)
+        for route_method, pattern, operation in self._routes:
+            match = pattern.match(url.path)
+            if match and route_method == method:
+                break
+        else:
+            self.count("not_found")
+            status = _status(404, f"No simulated endpoint {method} {url.path}", "NOT_FOUND")
+            return 404, dump_json(mlx_models.MLXResponse(status=status)), {}
+        endpoint = self.endpoint(operation)
+        if endpoint.rate is not None:
+            wait = self._bucket(operation, endpoint).take()
+            if wait > 0:
+                self.count(f"{operation}:429")
+                status = _status(429, "Too many requests", "TOO_MANY_REQUESTS")
+                payload = dump_json(mlx_models.MLXResponse(status=status))
+                return 429, payload, {"Retry-After": f"{wait:.3f}"}
+        delay = self._latency(endpoint.latency)
+        if delay > 0:
+            time.sleep(delay)
+        if endpoint.error_rate and self._draw(lambda rng: rng.random()) < endpoint.error_rate:
+            self.count(f"{operation}:500")
+            status = _status(500, "Injected failure", "INTERNAL_SERVER_ERROR")
+            return 500, dump_json(mlx_models.MLXResponse(status=status)), {}
+        # MLX.verify_email sends the email unencoded: '+' is part of it, not a space
+        query = dict(parse_qsl(url.query.replace("+", "%2B")))
+        request = _Request(method, query, match.groupdict(), headers, body)
+        try:
+            with self._state:
+                http_code, response = getattr(self, f"_{operation}")(request)
+        except SimulatedError as e:
+            http_code = e.http_code
+            response = mlx_models.MLXResponse(status=_status(e.http_code, e.message, e.error_code))
+        except ValidationError as e:
+            http_code = 400
+            response = mlx_models.MLXResponse(
+                status=_status(400, str(e.errors()[0]["msg"]), "VALIDATION_ERROR")
+            )
+        self.count(f"{operation}:{http_code}")
+        return http_code, dump_json(response), {}
+
+    # Session
+
+    def _issue(self, user: User) -> mlx_models.Signin:
+        claims = {
+            "email": user.email,
+            "userID": user.user_id,
+            "workspaceID": user.workspace_id,
+            "workspaceRole": ROLE,
+            "jti": self._id(),
+            "exp": int(time.time()) + TOKEN_TTL,
+        }
+        user.refresh_token = self._id()
+        return mlx_models.Signin(
+            token=jwt.encode(claims, SECRET, algorithm="HS256"), refresh_token=user.refresh_token
+        )
+
+    def _user(self, request: _Request) -> User:
+        authorization = request.headers.get("Authorization", "")
+        try:
+            claims = jwt.decode(authorization.removeprefix("Bearer "), SECRET, algorithms=["HS256"])
+        except jwt.PyJWTError:
+            raise SimulatedError(401, "UNAUTHORIZED_REQUEST", "Unauthorized")
+        user = self.users.get(claims.get("email"))
+        if user is None:
+            raise SimulatedError(401, "UNAUTHORIZED_REQUEST", "Unauthorized")
+        return user
+
+    def _sign_up(self, request: _Request) -> tuple[int, BaseModel]:
+        creds = mlx_models.ComplexSignup.model_validate_json(request.body).creds
+        if creds.email in self.users:
+            raise SimulatedError(400, "USER_ALREADY_EXISTS", "User already exists")
+        workspace = Workspace(workspace_id=self._id(), name=f"{creds.email} workspace")
+        folder_id = self._id()
+        workspace.folders[folder_id] = UserFolder(
+            name=DEFAULT_FOLDER,
+            folder_id=folder_id,
+            profiles_count=0,
+            created_at=datetime.now(timezone.utc),
+        )
+        self.workspaces[workspace.workspace_id] = workspace
+        self.users[creds.email] = User(
+            email=creds.email,
+            password=creds.password,
+            user_id=self._id(),
+            workspace_id=workspace.workspace_id,
+            email_token=self._id().replace("-", ""),
+        )
+        return 201, mlx_models.MLXResponse(status=_status(201, "Successful signup"))
+
+    def _sign_in(self, request: _Request) -> tuple[int, BaseModel]:
+        creds = mlx_models.UserCreds.model_validate_json(request.body)
+        user = self.users.get(creds.email)
+        if user is None or user.password != creds.password:
+            raise SimulatedError(401, "INVALID_CREDENTIALS", "Invalid email or password")
+        return 200, mlx_models.SigninResponse(
+            status=_status(200, "Successful sign in"), data=self._issue(user)
+        )
+
+    def _verify_email(self, request: _Request) -> tuple[int, BaseModel]:
+        user = self._user(request)
+        if request.query.get("email") != user.email or (
+            request.query.get("token") != user.email_token
+        ):
+            raise SimulatedError(400, "INVALID_TOKEN", "Invalid verification token")
+        user.verified = True
+        return 200, mlx_models.MLXResponse(status=_status(200, "Email successfully verified"))
+
+    def _refresh_token(self, request: _Request) -> tuple[int, BaseModel]:
+        body = mlx_models.RefreshToken.model_validate_json(request.body)
+        user = self.users.get(body.email)
+        if user is None or not user.refresh_token or user.refresh_token != body.refresh_token:
+            raise SimulatedError(401, "INVALID_REFRESH_TOKEN", "Invalid refresh token")
+        if body.workspace_id != user.workspace_id:
+            raise SimulatedError(403, "NOT_A_MEMBER", "Not a member of the workspace")
+        return 200, mlx_models.SigninResponse(
+            status=_status(200, "Token refreshed"), data=self._issue(user)
+        )
+
+    # Workspace
+
+    def _get_workspace_id(self, request: _Request) -> tuple[int, BaseModel]:
+        workspace = self.workspaces[self._user(request).workspace_id]
+        listing = mlx_models.UserWorkspaceArray(
+            workspaces=[
+                mlx_models.UserWorkspace(
+                    name=workspace.name, workspace_id=workspace.workspace_id, role=ROLE
+                )
+            ],
+            total_count=1,
+        )
+        return 200, mlx_models.UserWorkspaceArrayResponse(
+            status=_status(200, "Workspaces listed"), data=listing
+        )
+
+    def _get_folder_id(self, request: _Request) -> tuple[int, BaseModel]:
+        workspace = self.workspaces[self._user(request).workspace_id]
+        counts: dict[str, int] = {}
+        for profile in self.profiles.values():
+            counts[profile.body.folder_id] = counts.get(profile.body.folder_id, 0) + 1
+        folders = [
+            folder.model_copy(update={"profiles_count": counts.get(folder.folder_id, 0)})
+            for folder in workspace.folders.values()
+        ]
+        return 200, mlx_models.UserFolderArrayResponse(
+            status=_status(200, "Folders listed"),
+            data=mlx_models.UserFolderArray(folders=folders),
+        )
+
+    def _set_restrictions(self, request: _Request) -> tuple[int, BaseModel]:
+        body = json.loads(request.body or b"{}")
+        workspace = self.workspaces.get(body.get("workspace_id"))
+        if workspace is None:
+            raise SimulatedError(404, "WORKSPACE_NOT_FOUND", "Workspace not found")
+        workspace.restrictions = body
+        return 200, mlx_models.MLXResponse(status=_status(200, "Restrictions updated"))
+
+    def _get_email_token(self, request: _Request) -> tuple[int, BaseModel]:
+        user = self.users.get(request.query.get("email"))
+        if user is None:
+            return 404, emp_models.TokenResponse(
+                status=_status(404, "User not found", "USER_NOT_FOUND")
+            )
+        return 200, emp_models.TokenResponse(
+            status=_status(200, "Token found"), data=emp_models.Token(token=user.email_token)
+        )
+
+    # Profiles
+
+    def _create_profile(self, request: _Request) -> tuple[int, BaseModel]:
+        user = self._user(request)
+        if not user.verified:
+            raise SimulatedError(403, "EMAIL_NOT_VERIFIED", "Email is not verified")
+        body = mlx_models.CreateProfile.model_validate_json(request.body)
+        if body.folder_id not in self.workspaces[user.workspace_id].folders:
+            raise SimulatedError(404, "FOLDER_NOT_FOUND", "Folder not found")
+        ids = []
+        for _ in range(1 if body.times is None else body.times):
+            profile = Profile(self._id(), user.workspace_id, body, datetime.now(timezone.utc))
+            self.profiles[profile.profile_id] = profile
+            ids.append(profile.profile_id)
+        return 201, mlx_models.ArrayOfIDsResponse(
+            status=_status(201, "Profile created"),
+            data=mlx_models.ArrayOfIDs(ids=ids, total_count=len(ids)),
+        )
+
+    def _delete_profile(self, request: _Request) -> tuple[int, BaseModel]:
+        user = self._user(request)
+        body = mlx_models.RemoveProfiles.model_validate_json(request.body)
+        for profile_id in body.ids:
+            profile = self.profiles.get(profile_id)
+            if profile is not None and profile.workspace_id == user.workspace_id:
+                del self.profiles[profile_id]
+        return 200, mlx_models.MLXResponse(status=_status(200, "Profiles removed"))
+
+    def _get_fingerprints(self, request: _Request) -> tuple[int, BaseModel]:
+        self._user(request)
+        os_type = request.query.get("os_type")
+        if os_type not in PLATFORMS:
+            raise SimulatedError(400, "VALIDATION_ERROR", f"Unknown os_type {os_type!r}")
+        count = int(request.query.get("count", 100))
+        if not 1 <= count <= 100:
+            raise SimulatedError(400, "VALIDATION_ERROR", "count must be between 1 and 100")
+        browser = f"{request.query.get('browser_type')}/{request.query.get('core_version')}"
+
+        def draw(rng: random.Random) -> list[tuple[int, int, int]]:
+            widths = (1366, 1536, 1920, 2560)
+            return [
+                (rng.choice((4, 8, 12, 16)), rng.choice(widths), rng.randint(1, 2))
+                for _ in range(count)
+            ]
+
+        fingerprints = [
+            mlx_models.Fingerprint(
+                id=self._id(),
+                meta_id=self._id(),
+                navigator=mlx_models.Navigator(
+                    user_agent=f"Mozilla/5.0 ({PLATFORMS[os_type]}) {browser}",
+                    hardware_concurrency=cores,
+                    platform=PLATFORMS[os_type],
+                ),
+                screen=mlx_models.Screen(width=width, height=width * 9 // 16, pixel_ratio=ratio),
+            )
+            for cores, width, ratio in self._draw(draw)
+        ]
+        return 200, mlx_models.FingerprintArrayResponse(
+            status=_status(200, "Fingerprints generated"),
+            data=mlx_models.FingerprintArray(fingerprints=fingerprints),
+        )
+
+    def _profile(self, user: User, profile_id: str) -> Profile:
+        profile = self.profiles.get(profile_id)
+        if profile is None or profile.workspace_id != user.workspace_id:
+            raise SimulatedError(404, "PROFILE_NOT_FOUND", "Profile not found")
+        return profile
+
+    # Launcher
+
+    def _start_profile(self, request: _Request) -> tuple[int, BaseModel]:
+        profile = self._profile(self._user(request), request.params["profile_id"])
+        if profile.body.folder_id != request.params["folder_id"]:
+            raise SimulatedError(404, "PROFILE_NOT_FOUND", "Profile not found in the folder")
+        if profile.running:
+            raise SimulatedError(400, "PROFILE_ALREADY_RUNNING", "Profile is already running")
+        profile.running = True
+        return 200, launcher_models.Response(status=_status(200, "Profile started"))
+
+    def _stop_profile(self, request: _Request) -> tuple[int, BaseModel]:
+        profile = self._profile(self._user(request), request.params["profile_id"])
+        if not profile.running:
+            raise SimulatedError(400, "PROFILE_NOT_RUNNING", "Profile is not running")
+        profile.running = False
+        return 200, launcher_models.Response(status=_status(200, "Profile stopped"))
+
+    def _import_cookies(self, request: _Request) -> tuple[int, BaseModel]:
+        user = self._user(request)
+        body = launcher_models.CookieImport.model_validate_json(request.body)
+        profile = self._profile(user, body.profile_id)
+        try:
+            cookies = json.loads(body.cookies)
+            profile.cookies = len(cookies) if isinstance(cookies, list) else 1
+        except ValueError:
+            # a Netscape jar: one cookie per line that is not a comment
+            profile.cookies = sum(
+                1
+                for line in body.cookies.splitlines()
+                if line.strip() and (not line.startswith("#") or line.startswith("#HttpOnly_"))
+            )
+        return 200, launcher_models.Response(status=_status(200, "Cookies imported"))
+
+    def start(self) -> "Simulator":
+        super().start()
+        logger.info("Simulating MLX, EMP and Launcher on %s", self.url)
+        return self
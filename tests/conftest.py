@@ -4,12 +4,16 @@ import os
 import logging
 import API
 import utils
+import data
+from contextlib import ExitStack
+from dataclasses import dataclass
 from pytest import FixtureRequest
-from typing import Any, Generator, List
+from typing import Any, Callable, Generator, List
 from models.user_data import UserData
 from models import MLX as models
 from data.profile_data import PROFILE_GENERIC
 from pydantic import ValidationError
+from stubs import EMAIL, PASSWORD, Endpoint, Simulator
 
 helper = utils.Helper()
 
@@ -30,12 +34,18 @@ logger.addHandler(handler)
 logger.propagate = False
 
 @pytest.fixture(scope="session")
-def generate_email() -> Generator[str, Any, None]:
-    IND = os.getenv('EMAIL_INDEX', 0)
-    EMAIL = os.getenv('EMAIL', f'launcher_regression')
-    domain = 'multilogin.com'
-    email = f"{EMAIL}+{IND}@{domain}"
-    return email
+def email_indexes() -> range:
+    """Email indexes owned by this xdist worker, starting at EMAIL_INDEX for gw0
+
+    Returns:
+        range: disjoint range of email indexes
+    """
+    return utils.worker_index_range()
+
+
+@pytest.fixture(scope="session")
+def generate_email(email_indexes: range) -> str:
+    return utils.make_email(email_indexes[0])
 
 
 @pytest.fixture(scope="session")
@@ -48,32 +58,183 @@ def config() -> utils.ConfigProvider:
     return utils.ConfigProvider("config.ini")
 
 
+@pytest.fixture(scope="session")
+def transport(config: utils.ConfigProvider) -> Generator[API.Transport, Any, None]:
+    """Keep-alive connection pool shared by all API clients of the session;
+    RECORD_TRAFFIC=1 captures its requests to TRAFFIC_DIR
+
+    Yields:
+        Generator[API.Transport, Any, None]: shared transport
+    """
+    recorder = None
+    if os.getenv("RECORD_TRAFFIC") == "1":
+        recorder = API.TrafficRecorder(
+            config.get_file_path("TRAFFIC_DIR"), prefix=os.getenv("PYTEST_XDIST_WORKER", "traffic")
+        )
+    with API.Transport(recorder=recorder) as shared:
+        yield shared
+        logger.info("Connection pool stats: %s", shared.pool_stats())
+    if recorder is not None:
+        recorder.close()
+
+
 @pytest.fixture(scope="session", autouse=True)
-def mlx_api(config: utils.ConfigProvider) -> API.MLX:
+def mlx_api(config: utils.ConfigProvider, transport: API.Transport) -> API.MLX:
     logger.info("MLX API instantiated")
     URL = config.get_url(section="MLX_API")
-    return API.MLX(url=URL)
+    return API.MLX(url=URL, transport=transport)
 
 
 @pytest.fixture(scope="session", autouse=True)
-def emp_api(config: utils.ConfigProvider) -> API.EMP:
+def emp_api(config: utils.ConfigProvider, transport: API.Transport) -> API.EMP:
     logger.info("EMP API instantiated")
     URL = config.get_url(section="MLX_API")
-    return API.EMP(url=URL)
+    return API.EMP(url=URL, transport=transport)
 
 
 @pytest.fixture(scope="session", autouse=True)
-def launcher_api(config: utils.ConfigProvider) -> API.Launcher:
+def launcher_api(config: utils.ConfigProvider, transport: API.Transport) -> API.Launcher:
     logger.info("Launcher API instantiated")
     URL = config.get_url(section="LAUNCHER_API", key='LAUNCHER_URL_v2')
-    return API.Launcher(url=URL)
+    return API.Launcher(url=URL, transport=transport)
 
 
 @pytest.fixture(scope="session")
-def provide(config: utils.ConfigProvider) -> dict:
-    path = config.get_file_path(file="USER_DATA")
-    user_data = utils.DataProvider(file_path=path).data
-    return UserData(**user_data)
+def resolver(mlx_api: API.MLX) -> utils.WorkspaceResolver:
+    """Folder and workspace listings cached per member and shared between workers
+
+    Returns:
+        utils.WorkspaceResolver: shared resolver
+    """
+    return utils.get_resolver(mlx_api)
+
+
+@pytest.fixture(scope="session")
+def profile_generator() -> data.ProfileGenerator:
+    """Profile payloads seeded by PAYLOAD_SEED and the xdist worker, named uniquely per worker
+
+    Returns:
+        data.ProfileGenerator: generator of create_profile payloads
+    """
+    seed = int(os.getenv("PAYLOAD_SEED", 0)) + utils.worker_number()
+    return data.ProfileGenerator(seed=seed, prefix=f"{utils.worker_number()}-")
+
+
+@pytest.fixture(scope="session")
+def provide() -> UserData:
+    return helper.get_user_data()
+
+
+@pytest.fixture(scope="session")
+def account_factory(
+    mlx_api: API.MLX, emp_api: API.EMP, provide: UserData, email_indexes: range
+) -> Generator[utils.AccountFactory | None, Any, None]:
+    """Background factory keeping ACCOUNT_FACTORY_BUFFER accounts ready, if set
+
+    Yields:
+        Generator[utils.AccountFactory | None, Any, None]: running factory or None
+    """
+    buffer = int(os.getenv("ACCOUNT_FACTORY_BUFFER", 0))
+    if not buffer:
+        yield None
+        return
+    # The first index of the range belongs to the sign-up flow
+    with utils.AccountFactory(
+        mlx=mlx_api,
+        emp=emp_api,
+        password=provide.owner.password,
+        buffer=buffer,
+        indexes=email_indexes[1:],
+    ) as factory:
+        yield factory
+
+
+@dataclass
+class SimClients:
+    """MLX, EMP and Launcher clients of a running simulator sharing one transport"""
+
+    simulator: Simulator
+    transport: API.Transport
+    mlx: API.MLX
+    emp: API.EMP
+    launcher: API.Launcher
+
+    def sign_in(self, verified: bool = True) -> str:
+        """Signing up the simulator account (stubs.EMAIL) and signing it in
+
+        Args:
+            verified (bool): mark the email as verified. Defaults to True.
+
+        Returns:
+            str: Bearer token
+        """
+        self.mlx.sign_up(EMAIL, PASSWORD)
+        self.simulator.users[EMAIL].verified = verified
+        return self.mlx.sign_in(EMAIL, PASSWORD)["data"]["token"]
+
+
+@pytest.fixture
+def sim_clients() -> Generator[Callable[..., SimClients], Any, None]:
+    """Starting simulators with clients; every simulator is stopped and every
+    transport closed when the test ends
+
+    The factory takes the Simulator's seed and endpoints, typed for the clients
+    and any other Transport option. Retries are disabled unless a retry_policy is given.
+
+    Yields:
+        Generator[Callable[..., SimClients], Any, None]: factory of SimClients
+    """
+    with ExitStack() as stack:
+
+        def start(
+            seed: int | None = None,
+            endpoints: dict[str, Endpoint] | None = None,
+            typed: bool = False,
+            **options,
+        ) -> SimClients:
+            options.setdefault("retry_policy", API.RetryPolicy.disabled())
+            simulator = stack.enter_context(Simulator(seed=seed, endpoints=endpoints))
+            transport = stack.enter_context(API.Transport(**options))
+            return SimClients(
+                simulator,
+                transport,
+                API.MLX(url=simulator.url, transport=transport, typed=typed),
+                API.EMP(url=simulator.url, transport=transport, typed=typed),
+                API.Launcher(url=simulator.url + "/api/v2", transport=transport, typed=typed),
+            )
+
+        yield start
+
+
+@pytest.fixture(scope="session")
+def account_pool(
+    mlx_api: API.MLX,
+    emp_api: API.EMP,
+    provide: UserData,
+    email_indexes: range,
+    account_factory: utils.AccountFactory | None,
+) -> utils.AccountPool:
+    """Verified, plan-enabled accounts leased to tests of this worker
+
+    ACCOUNT_POOL_SIZE accounts are provisioned up front, more are taken from
+    the account factory or created on demand.
+
+    Returns:
+        utils.AccountPool: account pool
+    """
+    # The first index of the range belongs to the sign-up flow
+    pool = utils.AccountPool(
+        mlx=mlx_api,
+        emp=emp_api,
+        password=provide.owner.password,
+        indexes=email_indexes[1:],
+        factory=account_factory,
+    )
+    size = int(os.getenv("ACCOUNT_POOL_SIZE", 0))
+    if size:
+        logger.info("Provisioning %s accounts", size)
+        pool.provision(size)
+    return pool
 
 
 # @pytest.fixture(scope="session")
@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import Counter
+from typing import Iterator
+import jwt
+import API
+from API import search
+
+
+def make_profile(number: int, folder: int, os_type: str) -> dict:
+    return {
+        "name": f"profile-{number}",
+        "id": f"id-{number}",
+        "is_local": False,
+        "core_version": 124,
+        "os_type": os_type,
+        "browser_type": "mimic",
+        "created_at": f"2024-01-01T00:00:{number // 1000:02d}.{number % 1000:03d}Z",
+        "updated_at": f"2024-01-01T00:00:{number // 1000:02d}.{number % 1000:03d}Z",
+        "folder_id": f"folder-{folder}",
+    }
+
+
+STATUS = {"error_code": "", "http_code": 200, "message": ""}
+
+
+def make_token(
+    role: str = "owner", workspace_id: str = "w-1", ttl: float = 3600, user_id: str = "u-1"
+) -> str:
+    claims = {
+        "workspaceRole": role,
+        "workspaceID": workspace_id,
+        "userID": user_id,
+        "exp": time.time() + ttl,
+    }
+    return jwt.encode(claims, "secret")
+
+
+WORKSPACES = [
+    {"name": "First", "workspace_id": "w-1", "role": "manager"},
+    {"name": "Own", "workspace_id": "w-2", "role": "owner"},
+]
+
+
+class FakeMLX:
+    """Serves profile search, profile metas, folder and workspace listings and
+    fingerprints from memory, enforcing the search caps, and refreshes tokens,
+    counting the calls
+
+    Args:
+        profiles (list[dict] | None): profiles of the workspace
+        token_ttl (float): lifetime of refreshed tokens. Defaults to 3600.
+        folders (list[dict] | None): listed folders. Derived from the profiles when None.
+    """
+
+    def __init__(
+        self,
+        profiles: list[dict] | None = None,
+        token_ttl: float = 3600,
+        folders: list[dict] | None = None,
+    ) -> None:
+        self.profiles = profiles or []
+        self.token_ttl = token_ttl
+        self.folders = folders
+        self.workspaces = list(WORKSPACES)
+        self.refreshes = 0
+        self.requests = 0
+        # listing, metas and fingerprint calls by operation
+        self.calls: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._results: dict[tuple, list[dict]] = {}
+        # bumped by tests that change the profiles
+        self.version = 0
+
+    def _match(self, criteria: dict) -> list[dict]:
+        matches = [
+            profile for profile in self.profiles
+            if (profile.get("removed_at") is not None) == bool(criteria.get("is_removed"))
+            and all(
+                criteria.get(key) in (None, profile[key]) for key in ("folder_id", "os_type")
+            )
+        ]
+        if criteria.get("order_by"):
+            matches.sort(
+                key=lambda profile: profile[criteria["order_by"]] or "",
+                reverse=criteria.get("sort") == "desc",
+            )
+        return matches
+
+    def search_profiles(self, token: str, criteria: dict) -> dict:
+        assert criteria["offset"] <= search.MAX_OFFSET
+        assert criteria["limit"] <= search.MAX_LIMIT
+        with self._lock:
+            self.requests += 1
+        names = ("folder_id", "os_type", "order_by", "sort", "is_removed")
+        key = (self.version, *(criteria.get(name) for name in names))
+        with self._lock:
+            if key not in self._results:
+                self._results[key] = self._match(criteria)
+            matches = self._results[key]
+        page = matches[criteria["offset"]:criteria["offset"] + criteria["limit"]]
+        return {
+            "status": STATUS,
+            "data": {"total_count": len(matches), "profiles": page},
+        }
+
+    def get_folder_id(self, token: str) -> dict:
+        with self._lock:
+            self.calls["get_folder_id"] += 1
+        time.sleep(0.01)
+        folders = self.folders
+        if folders is None:
+            counts = Counter(profile["folder_id"] for profile in self.profiles)
+            folders = [
+                {"name": folder, "folder_id": folder, "profiles_count": count,
+                 "created_at": "2024-01-01T00:00:00Z"}
+                for folder, count in sorted(counts.items())
+            ]
+        return {"status": STATUS, "data": {"folders": list(folders)}}
+
+    def get_workspace_id(self, token: str) -> dict:
+        with self._lock:
+            self.calls["get_workspace_id"] += 1
+        workspaces = list(self.workspaces)
+        total = len(workspaces)
+        return {"status": STATUS, "data": {"workspaces": workspaces, "total_count": total}}
+
+    def get_fingerprints(
+        self, token: str, os_type: str, browser_type: str, core_version: int, count: int
+    ) -> dict:
+        with self._lock:
+            self.calls["get_fingerprints"] += 1
+            batch = self.calls["get_fingerprints"]
+        time.sleep(0.01)
+        fingerprints = [
+            {"id": f"{batch}-{number}", "meta_id": "m", "navigator": {"platform": os_type},
+             "ports": [batch, number]}
+            for number in range(count)
+        ]
+        return {"status": STATUS, "data": {"fingerprints": fingerprints}}
+
+    def get_profile_metas(self, token: str, profile_ids: list) -> dict:
+        assert len(profile_ids) <= 100
+        with self._lock:
+            self.calls["get_profile_metas"] += 1
+        by_id = {profile["id"]: profile for profile in self.profiles}
+        return {
+            "status": STATUS,
+            "data": {
+                "profiles": [
+                    {"id": pid, "tags": by_id[pid].get("tags", [])}
+                    for pid in profile_ids if pid in by_id
+                ]
+            },
+        }
+
+    def iter_profiles(self, token: str, criteria: dict | None = None) -> Iterator:
+        return iter(API.ProfileSearch(self, token, criteria))
+
+    def sign_in(self, login: str, password: str) -> dict:
+        with self._lock:
+            self.calls["sign_in"] += 1
+        token = make_token(ttl=self.token_ttl)
+        return {"status": STATUS, "data": {"token": token, "refresh_token": "r-signed-in"}}
+
+    def refresh_token(self, email: str, wid: str, refresh_token: str) -> dict:
+        with self._lock:
+            self.refreshes += 1
+            number = self.refreshes
+        time.sleep(0.05)
+        token = make_token(workspace_id=wid, ttl=self.token_ttl)
+        return {"status": STATUS, "data": {"token": token, "refresh_token": f"r-{number}"}}
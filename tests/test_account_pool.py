@@ -0,0 +1,61 @@
+import pytest
+import utils
+from stubs import PASSWORD, Endpoint
+
+
+def pool(sim, indexes: range) -> utils.AccountPool:
+    return utils.AccountPool(sim.mlx, sim.emp, PASSWORD, indexes=indexes)
+
+
+class TestAccountPool:
+
+    def test_worker_ranges_do_not_overlap(self) -> None:
+        assert utils.worker_index_range(1000, 50, "gw0") == range(1000, 1050)
+        assert utils.worker_index_range(1000, 50, "gw2") == range(1100, 1150)
+        assert utils.worker_index_range(1000, 50, "master") == range(1000, 1050)
+
+    def test_accounts_are_verified_with_a_plan(self, sim_clients) -> None:
+        sim = sim_clients()
+        accounts = pool(sim, range(5, 7)).provision(2)
+        assert sorted(account.index for account in accounts) == [5, 6]
+        for account in accounts:
+            assert sim.simulator.users[account.email].verified
+            assert sim.simulator.workspaces[account.workspace_id].restrictions is not None
+
+    def test_typed_clients(self, sim_clients) -> None:
+        sim = sim_clients(typed=True)
+        account = pool(sim, range(1)).create_account()
+        assert sim.simulator.users[account.email].verified
+        assert account.token and account.workspace_id
+
+    @pytest.mark.parametrize(
+        "operation, error", [("verify_email", "verification"), ("set_restrictions", "plan")]
+    )
+    def test_failed_stages_are_not_handed_out(self, sim_clients, operation, error) -> None:
+        accounts = pool(sim_clients(endpoints={operation: Endpoint(error_rate=1.0)}), range(3))
+        with pytest.raises(RuntimeError, match=error):
+            accounts.create_account()
+        assert accounts.provision(2) == []
+        assert len(accounts) == 0
+
+
+class TestAccountFactory:
+
+    def test_take_returns_ready_accounts(self, sim_clients) -> None:
+        sim = sim_clients()
+        with utils.AccountFactory(
+            sim.mlx, sim.emp, PASSWORD, buffer=2, indexes=range(10, 13)
+        ) as factory:
+            taken = [factory.take(timeout=10) for _ in range(3)]
+            assert sorted(account.index for account in taken) == [10, 11, 12]
+            with pytest.raises(RuntimeError, match="run out"):
+                factory.take()
+
+    def test_failing_stage_does_not_hang_take(self, sim_clients) -> None:
+        sim = sim_clients(endpoints={"verify_email": Endpoint(error_rate=1.0)})
+        accounts = pool(sim, range(0))
+        with utils.AccountFactory(sim.mlx, sim.emp, PASSWORD, indexes=range(3)) as factory:
+            accounts.factory = factory
+            # no timeout: fails once every index has been tried
+            with pytest.raises(RuntimeError, match="3 accounts failed"):
+                accounts.acquire()
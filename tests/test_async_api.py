@@ -0,0 +1,48 @@
+import asyncio
+import time
+import API
+from stubs import EMAIL, PASSWORD
+
+
+class TestAsyncClients:
+
+    def test_concurrent_calls_reuse_the_pooled_connections(self, sim_clients) -> None:
+        async def scenario(url: str, transport: API.Transport) -> None:
+            async with API.AsyncTransport(transport, concurrency=8) as async_transport:
+                mlx = API.AsyncMLX(url, transport=async_transport)
+                await mlx.sign_up(EMAIL, PASSWORD)
+                responses = await asyncio.gather(
+                    *(mlx.sign_in(EMAIL, PASSWORD) for _ in range(64))
+                )
+            assert all(res["status"]["http_code"] == 200 for res in responses)
+
+        sim = sim_clients(pool_maxsize=2)
+        transport = sim.transport
+        asyncio.run(scenario(sim.simulator.url, transport))
+        assert transport.pool_maxsize == 8
+        # every worker keeps its connection; none is opened twice
+        assert transport.stats.misses <= 8
+        assert transport.stats.hits + transport.stats.misses == 65
+
+    def test_clients_share_one_executor_by_default(self) -> None:
+        mlx = API.AsyncMLX("http://127.0.0.1:1")
+        emp = API.AsyncEMP("http://127.0.0.1:1")
+        assert mlx.transport is emp.transport is API.get_default_async_transport()
+        assert mlx.client.transport is API.get_default_transport()
+        own = API.AsyncLauncher("http://127.0.0.1:1", concurrency=2)
+        assert own.transport is not mlx.transport
+        asyncio.run(own.aclose())
+
+    def test_rate_limit_is_awaited_once_per_request(self, sim_clients) -> None:
+        async def scenario(url: str, transport: API.Transport) -> float:
+            async with API.AsyncTransport(transport, concurrency=4) as async_transport:
+                mlx = API.AsyncMLX(url, transport=async_transport)
+                start = time.perf_counter()
+                await asyncio.gather(*(mlx.sign_in(EMAIL, PASSWORD) for _ in range(4)))
+                return time.perf_counter() - start
+
+        sim = sim_clients(rate_limiter=API.RateLimiter({"all": (2, 0.3)}))
+        elapsed = asyncio.run(scenario(sim.simulator.url, sim.transport))
+        assert sim.simulator.counts["sign_in:401"] == 4
+        # 2 per window: the second pair waits one window, not three
+        assert 0.3 <= elapsed < 0.8
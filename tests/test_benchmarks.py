@@ -0,0 +1,36 @@
+import json
+from benchmarks import bench_client, harness
+from benchmarks.bench_serialization import check_parity
+
+
+class TestBenchmarks:
+
+    def test_compare_flags_slowdowns_above_threshold(self) -> None:
+        baseline = {"a": 10.0, "b": 10.0, "c": 10.0}
+        results = {"a": 12.0, "b": 13.0, "d": 100.0}
+        regressions = harness.compare(results, baseline, threshold=0.25)
+        assert [(r.name, r.ratio) for r in regressions] == [("b", 1.3)]
+
+    def test_baseline_round_trip(self, tmp_path) -> None:
+        path = tmp_path / "baselines" / "client.json"
+        assert harness.load_baseline(path) == {}
+        harness.save_baseline(path, {"b": 2.00049, "a": 1.0})
+        assert harness.load_baseline(path) == {"a": 1.0, "b": 2.0}
+
+    def test_baseline_from_another_environment_is_reported(self, tmp_path) -> None:
+        path = tmp_path / "client.json"
+        assert harness.mismatch(path) == {}
+        harness.save_baseline(path, {"a": 1.0})
+        assert harness.mismatch(path) == {}
+        recorded = json.loads(path.read_text())
+        current = recorded["python"]
+        path.write_text(json.dumps({**recorded, "python": "2.7.18"}))
+        assert harness.mismatch(path) == {"python": ("2.7.18", current)}
+
+    def test_every_case_runs(self, sim_clients) -> None:
+        sim = sim_clients(seed=1)
+        for name, call in bench_client.cases(sim.simulator, sim.transport).items():
+            assert call() is not None, name
+
+    def test_serialization_paths_agree(self) -> None:
+        check_parity()
@@ -0,0 +1,29 @@
+import data
+from API.bulk import MAX_TIMES, chunk_profiles
+
+
+class TestChunkProfiles:
+
+    def test_count_is_split_into_full_chunks_and_a_remainder(self) -> None:
+        chunks = list(chunk_profiles(45))
+        assert [chunk["times"] for chunk in chunks] == [MAX_TIMES, MAX_TIMES, 5]
+        assert all(chunk["name"] == data.PROFILE_GENERIC["name"] for chunk in chunks)
+
+    def test_template_is_copied_not_mutated(self) -> None:
+        template = {**data.PROFILE_GENERIC, "name": "templated", "times": 1}
+        chunks = list(chunk_profiles(3, template, max_times=2))
+        assert [(chunk["name"], chunk["times"]) for chunk in chunks] == [
+            ("templated", 2), ("templated", 1)
+        ]
+        assert template["times"] == 1
+
+    def test_bodies_keep_their_own_times(self) -> None:
+        # a body without times creates one profile, times=0 none
+        bodies = [{"name": "a", "times": 3}, {"name": "b"}, {"name": "c", "times": 0}]
+        chunks = list(chunk_profiles(iter(bodies), max_times=2))
+        assert [(chunk["name"], chunk["times"]) for chunk in chunks] == [
+            ("a", 2), ("a", 1), ("b", 1)
+        ]
+
+    def test_zero_profiles_yield_nothing(self) -> None:
+        assert list(chunk_profiles(0)) == []
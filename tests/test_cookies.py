@@ -0,0 +1,105 @@
+import io
+import json
+import threading
+import requests
+import API
+from API import cookies
+
+NETSCAPE = """# Netscape HTTP Cookie File
+.example.com\tTRUE\t/\tTRUE\t1900000000\tsid\told
+#HttpOnly_.example.com\tTRUE\t/\tFALSE\t0\tauth\ttoken
+.example.com\tTRUE\t/\tTRUE\t1900000000\tsid\tnew
+shop.example.com\tFALSE\t/cart\tFALSE\t1900000000\tsid\tcart
+broken line
+"""
+
+JSON_JAR = [
+    {"domain": ".Example.com", "name": "a", "value": "1", "expirationDate": 1900000000.5,
+     "sameSite": "Lax"},
+    {"domain": "example.com", "name": "b", "value": "ü", "expires": -1, "httpOnly": True},
+    {"domain": ".example.com", "name": "a", "value": "2", "path": "/"},
+    {"name": "no domain", "value": "x"},
+]
+
+
+class FakeTransport:
+    """Answers every POST with a successful Launcher status, keeping the bodies"""
+
+    def __init__(self) -> None:
+        self.bodies: list[bytes] = []
+        self._lock = threading.Lock()
+
+    def post(self, url: str, operation: str, data: bytes, headers: dict) -> requests.Response:
+        with self._lock:
+            self.bodies.append(data)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"status": {"error_code": "", "http_code": 200, "message": ""}}'
+        return response
+
+
+class TestCookieJar:
+
+    def test_netscape_is_normalized_and_deduplicated(self, tmp_path) -> None:
+        path = tmp_path / "cookies.txt"
+        path.write_text(NETSCAPE)
+        jar = cookies.CookieJar.load(str(path))
+        by_key = {(c["domain"], c["path"], c["name"]): c for c in jar.cookies}
+        assert len(jar.cookies) == 3 and jar.duplicates == 1 and jar.skipped == 1
+        assert by_key[(".example.com", "/", "sid")]["value"] == "new"
+        assert by_key[(".example.com", "/", "auth")]["httpOnly"] is True
+        assert by_key[(".example.com", "/", "auth")]["session"] is True
+        assert by_key[("shop.example.com", "/cart", "sid")]["hostOnly"] is True
+
+    def test_json_is_parsed_across_chunks(self, tmp_path) -> None:
+        path = tmp_path / "cookies.json"
+        path.write_text(json.dumps(JSON_JAR, indent=2), encoding="utf-8")
+        jar = cookies.CookieJar.load(str(path))
+        assert [(c["domain"], c["name"], c["value"]) for c in jar.cookies] == [
+            (".example.com", "a", "2"), ("example.com", "b", "ü")
+        ]
+        assert jar.cookies[1]["session"] is True and jar.cookies[1]["hostOnly"] is True
+        streamed = list(cookies.iter_json(io.StringIO(json.dumps(JSON_JAR)), chunk_size=7))
+        assert streamed == JSON_JAR
+
+
+    def test_string_and_unreadable_expiries(self) -> None:
+        assert cookies.expiry("1735689600") == 1735689600.0
+        assert cookies.expiry("2025-01-01T00:00:00Z") == 1735689600.0
+        assert cookies.expiry(-1) is None and cookies.expiry("soon") is None
+        cookie = cookies.normalize({"domain": "example.com", "name": "a", "expires": "soon"})
+        assert cookie["session"] is True and "expirationDate" not in cookie
+        cookie = cookies.normalize({"domain": "example.com", "name": "a", "expires": "1735689600"})
+        assert cookie["expirationDate"] == 1735689600.0
+
+    def test_playwright_storage_state(self, tmp_path) -> None:
+        path = tmp_path / "state.json"
+        state = {"cookies": JSON_JAR[:2], "origins": [{"origin": "https://example.com"}]}
+        path.write_text(json.dumps(state), encoding="utf-8")
+        jar = cookies.CookieJar.load(str(path))
+        assert [cookie["name"] for cookie in jar.cookies] == ["a", "b"]
+
+
+class TestCookieImporter:
+
+    def test_jar_is_parsed_once_and_imported_everywhere(self, tmp_path, monkeypatch) -> None:
+        path = tmp_path / "cookies.txt"
+        path.write_text(NETSCAPE)
+        loads = []
+        load = cookies.CookieJar.load
+
+        def counted(cls, *args, **kwargs):
+            loads.append(args)
+            return load(*args, **kwargs)
+
+        monkeypatch.setattr(cookies.CookieJar, "load", classmethod(counted))
+        transport = FakeTransport()
+        importer = API.CookieImporter(API.Launcher("http://launcher", transport=transport), "t", 4)
+        profiles = ((f"p{number}", "f") for number in range(50))
+        results = list(importer.import_jar(str(path), profiles))
+        results += list(importer.import_jar(str(path), [("p50", "f")]))
+        assert len(loads) == 1
+        assert all(result.ok for result in results) and len(results) == 51
+        bodies = [json.loads(body) for body in transport.bodies]
+        assert {body["profile_id"] for body in bodies} == {f"p{number}" for number in range(51)}
+        assert json.loads(bodies[0]["cookies"]) == importer.jar(str(path)).cookies
@@ -0,0 +1,52 @@
+import json
+import os
+import time
+import pytest
+import utils
+
+
+def write_user_data(path, token: str, modified_at: float) -> None:
+    record = {"email": "owner@example.com", "password": "p", "token": token}
+    path.write_text(json.dumps({"owner": record, "user": {**record, "email": "user@x.com"}}))
+    os.utime(path, (modified_at, modified_at))
+
+
+class TestCredentialStore:
+
+    def test_seeds_and_updates_one_role(self, tmp_path) -> None:
+        seed = tmp_path / "user_data.json"
+        write_user_data(seed, "t-0", time.time() - 60)
+        store = utils.CredentialStore(str(tmp_path / "credentials.db"), str(seed))
+        store.update("owner", token="t-1", folder_id=None)
+        assert store.get("owner")["token"] == "t-1"
+        assert store.get("user")["token"] == "t-0"
+        with pytest.raises(KeyError):
+            store.update("launcher", token="t")
+        with pytest.raises(ValueError):
+            store.update("owner", name="x")
+
+    def test_updates_survive_reopening_with_an_older_file(self, tmp_path) -> None:
+        seed = tmp_path / "user_data.json"
+        db_path = str(tmp_path / "credentials.db")
+        write_user_data(seed, "t-0", time.time() - 60)
+        utils.CredentialStore(db_path, str(seed)).update("owner", token="t-1")
+        assert utils.CredentialStore(db_path, str(seed)).get("owner")["token"] == "t-1"
+
+    def test_edited_file_is_reseeded(self, tmp_path) -> None:
+        seed = tmp_path / "user_data.json"
+        db_path = str(tmp_path / "credentials.db")
+        write_user_data(seed, "t-0", time.time() - 60)
+        utils.CredentialStore(db_path, str(seed)).update("owner", token="t-1")
+        write_user_data(seed, "edited", time.time() + 1)
+        store = utils.CredentialStore(db_path, str(seed))
+        assert store.get("owner")["token"] == "edited"
+        assert store.get("user")["token"] == "edited"
+
+    def test_export_round_trip(self, tmp_path) -> None:
+        seed = tmp_path / "user_data.json"
+        write_user_data(seed, "t-0", time.time() - 60)
+        store = utils.CredentialStore(str(tmp_path / "credentials.db"), str(seed))
+        store.update("owner", token="t-1")
+        store.export_json(str(seed))
+        assert json.loads(seed.read_text()) == store.load()
+        assert utils.CredentialStore(str(tmp_path / "copy.db"), str(seed)).load() == store.load()
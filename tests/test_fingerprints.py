@@ -0,0 +1,47 @@
+import time
+import API
+from tests.fakes import FakeMLX
+
+
+class TestFingerprintPool:
+
+    def test_fingerprints_are_handed_out_once(self) -> None:
+        mlx = FakeMLX()
+        with API.FingerprintPool(mlx, "token", batch=10, low_watermark=3) as pool:
+            taken = [pool.take("windows", "mimic", 131) for _ in range(25)]
+        assert len({tuple(fingerprint["ports"]) for fingerprint in taken}) == 25
+        assert all("id" not in fingerprint for fingerprint in taken)
+        assert mlx.calls["get_fingerprints"] >= 3
+
+    def test_refills_below_the_low_watermark(self) -> None:
+        mlx = FakeMLX()
+        with API.FingerprintPool(mlx, "token", batch=10, low_watermark=5) as pool:
+            pool.prefetch("linux", "stealthfox", 130)
+            pool.take("linux", "stealthfox", 130)
+            for _ in range(5):
+                pool.take("linux", "stealthfox", 130)
+            deadline = time.monotonic() + 1
+            while pool.available("linux", "stealthfox", 130) < 5 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert pool.available("linux", "stealthfox", 130) >= 5
+            assert pool.available("macos", "mimic", 131) == 0
+
+    def test_apply_fills_empty_fingerprints_only(self) -> None:
+        body = {"os_type": "macos", "browser_type": "mimic", "core_version": 131,
+                "parameters": {"fingerprint": {}}}
+        with API.FingerprintPool(FakeMLX(), "token", batch=5) as pool:
+            filled = pool.apply(body)
+            assert filled["parameters"]["fingerprint"]["navigator"] == {"platform": "macos"}
+            assert filled["parameters"]["flags"] == {"navigator_masking": "custom"}
+            assert body["parameters"]["fingerprint"] == {}
+            assert pool.apply(filled) is filled
+
+    def test_unused_fingerprints_are_persisted(self, tmp_path) -> None:
+        path = str(tmp_path / "fingerprints.json")
+        with API.FingerprintPool(FakeMLX(), "token", batch=10, persist_path=path) as pool:
+            first = pool.take("windows", "mimic", 131)
+        mlx = FakeMLX()
+        with API.FingerprintPool(mlx, "token", batch=10, persist_path=path) as pool:
+            second = pool.take("windows", "mimic", 131)
+        assert second != first
+        assert second["ports"][0] == 1
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import pytest
+
+
+# Wall-clock budget of a cold `import API` in a fresh interpreter, in seconds
+IMPORT_BUDGET = float(os.getenv("IMPORT_BUDGET", 1.5))
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_fresh(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+class TestImportTime:
+
+    def test_models_are_loaded_on_first_access(self) -> None:
+        loaded = run_fresh(
+            "import sys\n"
+            "from models.MLX import UserCreds, SigninResponse\n"
+            "print(sorted(m for m in sys.modules if m.startswith('models.MLX.')))"
+        )
+        assert "models.MLX.create_profile" not in loaded
+        assert "models.MLX.user_creds" in loaded
+        assert "models.MLX.signin_response" in loaded
+
+    def test_preload_imports_every_model(self) -> None:
+        missing = run_fresh(
+            "import models.MLX as mlx_models\n"
+            "mlx_models.preload()\n"
+            "print([name for name in mlx_models.__all__ if name not in vars(mlx_models)])"
+        )
+        assert missing == "[]"
+
+    def test_unknown_model_raises_attribute_error(self) -> None:
+        from models import MLX as mlx_models
+
+        with pytest.raises(AttributeError):
+            mlx_models.NoSuchModel
+
+    def test_api_import_within_budget(self) -> None:
+        elapsed = float(run_fresh(
+            "import time\n"
+            "start = time.perf_counter()\n"
+            "import API\n"
+            "print(time.perf_counter() - start)"
+        ))
+        assert elapsed < IMPORT_BUDGET, f"import API took {elapsed:.2f}s, budget {IMPORT_BUDGET}s"
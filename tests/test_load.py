@@ -0,0 +1,63 @@
+import time
+import pytest
+from load.lifecycle import LifecycleLoad, LoadProfile
+from load.stats import LoadStats, percentile
+from stubs import Endpoint
+
+
+def lifecycle_load(sim, profile: LoadProfile) -> LifecycleLoad:
+    token = sim.sign_in()
+    folder_id = sim.mlx.get_folder_id(token)["data"]["folders"][0]["folder_id"]
+    return LifecycleLoad(sim.mlx, sim.launcher, token, folder_id, profile)
+
+
+class TestLoadStats:
+
+    @pytest.mark.parametrize(
+        "pct, expected", [(0, 1), (10, 1), (50, 5), (90, 9), (95, 10), (99, 10), (100, 10)]
+    )
+    def test_nearest_rank_percentile(self, pct, expected) -> None:
+        assert percentile(list(range(1, 11)), pct) == expected
+
+    def test_empty_percentile(self) -> None:
+        assert percentile([], 99) == 0.0
+
+    def test_report(self) -> None:
+        stats = LoadStats()
+        for latency in range(1, 101):
+            stats.record("create_profile", latency / 1000, ok=latency % 10 != 0)
+        stats.record("delete_profile", 0.005, ok=True)
+        stats.iteration_done()
+        stats.finish()
+        report = stats.report()
+        step = report["steps"]["create_profile"]
+        assert (step["count"], step["errors"], step["error_rate"]) == (100, 10, 0.1)
+        assert [step[f"p{pct}"] for pct in LoadStats.PERCENTILES] == pytest.approx(
+            [50, 90, 95, 99]
+        )
+        assert step["max"] == pytest.approx(100)
+        assert (report["requests"], report["iterations"]) == (101, 1)
+        assert report["failed_iterations"] == 0
+        assert report["error_rate"] == pytest.approx(10 / 101)
+
+
+class TestLifecycleLoad:
+
+    def test_latency_includes_the_wait_for_the_scheduled_arrival(self, sim_clients) -> None:
+        sim = sim_clients()
+        load = lifecycle_load(sim, LoadProfile())
+        load.run_lifecycle()
+        load.run_lifecycle(scheduled_at=time.perf_counter() - 0.5)
+        steps = load.stats.report()["steps"]
+        assert steps["create_profile"]["p50"] < 500 <= steps["create_profile"]["max"]
+        assert steps["delete_profile"]["max"] < 500
+        assert all(step["errors"] == 0 for step in steps.values())
+        assert not sim.simulator.profiles
+
+    def test_failed_create_counts_as_a_failed_iteration(self, sim_clients) -> None:
+        sim = sim_clients(seed=1, endpoints={"create_profile": Endpoint(error_rate=1.0)})
+        stats = lifecycle_load(sim, LoadProfile(iterations=3)).run()
+        report = stats.report()
+        assert (report["iterations"], report["failed_iterations"]) == (3, 3)
+        assert report["steps"]["create_profile"]["errors"] == 3
+        assert "3 iterations (3 failed)" in stats.format_report()
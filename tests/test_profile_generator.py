@@ -0,0 +1,44 @@
+import data
+from models import MLX as mlx_models
+
+
+class TestProfileGenerator:
+
+    def test_same_seed_same_payloads(self) -> None:
+        assert data.ProfileGenerator(seed=7).batch(50) == data.ProfileGenerator(seed=7).batch(50)
+        assert data.ProfileGenerator(seed=7).batch(50) != data.ProfileGenerator(seed=8).batch(50)
+
+    def test_payloads_are_valid_create_profile_bodies(self) -> None:
+        for payload in data.ProfileGenerator(seed=1, folder_id="folder").batch(500):
+            body = mlx_models.CreateProfile.from_dict(payload)
+            assert body.folder_id == "folder"
+            assert len(body.tags or []) == len(set(body.tags or []))
+
+    def test_names_are_unique_across_batches(self) -> None:
+        generator = data.ProfileGenerator(seed=1, prefix="0-", pool_size=5)
+        names = [payload["name"] for batch in generator.stream(2500, 1000) for payload in batch]
+        assert len(names) == len(set(names)) == 2500
+
+    def test_names_share_the_numbering_of_payloads(self) -> None:
+        generator = data.ProfileGenerator(seed=1, prefix="0-")
+        names = [generator.name(), generator.payload()["name"], generator.name()]
+        assert [name.rsplit("#", 1)[1] for name in names] == ["0-0", "0-1", "0-2"]
+
+    def test_core_versions_come_from_the_profile_data(self) -> None:
+        for payload in data.ProfileGenerator(seed=1).batch(20):
+            assert payload["core_version"] == data.CORE_VERSIONS[payload["browser_type"]]
+        assert data.PROFILE_GENERIC["core_version"] == data.CORE_VERSIONS["mimic"]
+
+    def test_stream_sizes(self) -> None:
+        sizes = [len(batch) for batch in data.ProfileGenerator(seed=1).stream(25, batch_size=10)]
+        assert sizes == [10, 10, 5]
+
+    def test_payloads_share_no_state(self) -> None:
+        generator = data.ProfileGenerator(seed=1)
+        first, second = generator.batch(2)
+        first["parameters"]["flags"]["audio_masking"] = "changed"
+        first["parameters"]["storage"]["is_local"] = None
+        assert second["parameters"]["flags"]["audio_masking"] != "changed"
+        assert second["parameters"]["storage"]["is_local"] is not None
+        payload = generator.payload(folder_id="f")
+        assert payload["folder_id"] == "f" and generator.folder_id == ""
@@ -0,0 +1,102 @@
+import pytest
+import utils
+from tests.fakes import FakeMLX, make_profile
+
+
+@pytest.fixture
+def workspace() -> FakeMLX:
+    profiles = []
+    for number in range(250):
+        profile = make_profile(number, number % 2, ("linux", "windows")[number % 2])
+        profile["tags"] = ["even"] if number % 2 == 0 else []
+        profiles.append(profile)
+    return FakeMLX(profiles)
+
+
+@pytest.fixture
+def mirror(tmp_path) -> utils.ProfileMirror:
+    mirror = utils.ProfileMirror(str(tmp_path / "profiles.db"))
+    yield mirror
+    mirror.close()
+
+
+class TestProfileMirror:
+
+    def test_first_sync_is_full(self, mirror: utils.ProfileMirror, workspace: FakeMLX) -> None:
+        result = mirror.sync(workspace, "token")
+        assert result == {"updated": 250, "removed": 0, "full": True}
+        assert len(mirror) == 250
+        assert len(mirror.find(folder_id="folder-0")) == 125
+        assert len(mirror.find(tag="even", os_type="linux")) == 125
+        assert mirror.find(search_text="profile-249")[0]["tags"] == []
+        assert mirror.get("id-0")["name"] == "profile-0"
+
+    def test_incremental_sync(self, mirror: utils.ProfileMirror, workspace: FakeMLX) -> None:
+        mirror.sync(workspace, "token")
+        workspace.profiles[1].update(
+            name="renamed", updated_at="2024-02-01T00:00:00Z", tags=["moved"]
+        )
+        workspace.profiles[2].update(removed_at="2024-02-01T00:00:00Z", removed_by="owner")
+        workspace.profiles.append(
+            {**make_profile(999, 0, "macos"), "updated_at": "2024-02-02T00:00:00Z"}
+        )
+        workspace.version += 1
+        workspace.requests = 0
+
+        result = mirror.sync(workspace, "token")
+
+        # the newest profile of the previous sync sits on the watermark and is read again
+        assert result == {"updated": 3, "removed": 1, "full": False}
+        # one page of updates, one of removals and the live count
+        assert workspace.requests == 3
+        assert mirror.get("id-1")["name"] == "renamed"
+        assert [row["id"] for row in mirror.find(tag="moved")] == ["id-1"]
+        assert "id-2" not in {row["id"] for row in mirror.find(folder_id="folder-0")}
+        assert mirror.get("id-2")["removed_by"] == "owner"
+        assert len(mirror) == 250
+        assert mirror.find(os_type="macos")[0]["id"] == "id-999"
+
+    def test_full_sync_drops_deleted_profiles(
+        self, mirror: utils.ProfileMirror, workspace: FakeMLX
+    ) -> None:
+        mirror.sync(workspace, "token")
+        del workspace.profiles[:10]
+        workspace.version += 1
+        assert mirror.full_sync(workspace, "token", with_tags=False)["removed"] == 10
+        assert mirror.get("id-0") is None
+
+    def test_permanently_deleted_profiles_are_dropped_without_a_full_sync(
+        self, mirror: utils.ProfileMirror, workspace: FakeMLX
+    ) -> None:
+        mirror.sync(workspace, "token")
+        del workspace.profiles[:3]
+        workspace.version += 1
+        workspace.requests = 0
+        workspace.calls.clear()
+        result = mirror.sync(workspace, "token", with_tags=False)
+        assert result == {"updated": 1, "removed": 3, "full": False}
+        assert len(mirror) == 247 and mirror.get("id-0") is None
+        # two change searches and the count, then the 250 mirrored ids in 3 batches
+        assert workspace.requests == 3
+        assert workspace.calls["get_profile_metas"] == 3
+
+    def test_removed_ids_skip_the_check(
+        self, mirror: utils.ProfileMirror, workspace: FakeMLX
+    ) -> None:
+        mirror.sync(workspace, "token")
+        del workspace.profiles[:3]
+        workspace.version += 1
+        workspace.calls.clear()
+        assert mirror.remove(["id-0", "id-1", "id-2"]) == 3
+        assert not mirror.sync(workspace, "token", with_tags=False)["full"]
+        assert workspace.calls["get_profile_metas"] == 0
+
+    def test_unexplained_drift_runs_a_full_sync(
+        self, mirror: utils.ProfileMirror, workspace: FakeMLX
+    ) -> None:
+        mirror.sync(workspace, "token")
+        # older than the watermark, so no incremental search returns it
+        workspace.profiles.append({**make_profile(0, 0, "linux"), "id": "id-old"})
+        workspace.version += 1
+        result = mirror.sync(workspace, "token", with_tags=False)
+        assert result["full"] and len(mirror) == 251
@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+import data
+from API import rate_limit
+from API.rate_limit import RateLimiter, parse_window
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def async_sleep(self, seconds: float) -> None:
+        self.sleep(seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limit.time, "sleep", clock.sleep)
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", clock.async_sleep)
+    return clock
+
+
+class TestParseWindow:
+
+    @pytest.mark.parametrize(
+        "window, seconds", [("30s", 30), ("1m", 60), ("1.5m", 90), ("2h", 7200)]
+    )
+    def test_units(self, window, seconds) -> None:
+        assert parse_window(window) == seconds
+
+    @pytest.mark.parametrize("window", ["", "m", "10", "1d"])
+    def test_rejects_unknown_windows(self, window) -> None:
+        with pytest.raises(ValueError):
+            parse_window(window)
+
+
+class TestRateLimiter:
+
+    def test_from_restrictions_accepts_every_shape(self) -> None:
+        payloads = [
+            data.RESTRICTIONS,
+            data.RESTRICTIONS["restrictions"],
+            data.RESTRICTIONS["restrictions"]["ratelimit"],
+        ]
+        for payload in payloads:
+            window = RateLimiter.from_restrictions(payload)._windows["all"]
+            assert (window.limit, window.window) == (50, 60)
+
+    def test_waits_until_the_oldest_call_leaves_the_window(self, clock) -> None:
+        limiter = RateLimiter({"all": (2, 10)})
+        assert limiter.acquire() == 0
+        clock.now = 4
+        assert limiter.acquire() == 0
+        clock.now = 5
+        assert limiter.acquire() == 5
+        # the call at 0 has left the window, the one at 4 leaves at 14
+        assert limiter.acquire() == 4
+        assert clock.sleeps == [5, 4]
+
+    def test_operation_and_all_windows_both_apply(self, clock) -> None:
+        limiter = RateLimiter({"all": (2, 10), "create_profile": (1, 10)})
+        assert limiter.acquire("create_profile") == 0
+        assert limiter.acquire("create_profile") == 10
+        # at 10 only the second create_profile is left in 'all'
+        assert limiter.acquire("sign_in") == 0
+        assert limiter.acquire("sign_in") == 10
+
+    def test_async_acquire_waits_the_same(self, clock) -> None:
+        limiter = RateLimiter({"all": (1, 3)})
+        assert asyncio.run(limiter.acquire_async()) == 0
+        assert asyncio.run(limiter.acquire_async()) == 3
@@ -0,0 +1,77 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+import API
+from API import recorder
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self) -> None:
+        self._reply(b"")
+
+    def do_POST(self) -> None:
+        self._reply(self.rfile.read(int(self.headers["Content-Length"])))
+
+    def _reply(self, body: bytes) -> None:
+        payload = json.dumps({"path": self.path, "body": body.decode()}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestTrafficRecorder:
+
+    def test_requests_are_captured(self, server, tmp_path) -> None:
+        traffic = API.TrafficRecorder(str(tmp_path))
+        transport = API.Transport(recorder=traffic, retry_policy=API.RetryPolicy.disabled())
+        folder = "0f5e1b9e-6a4c-4c4e-9d4e-2f6b3c1a7d8e"
+        transport.get(f"{server}/profile/f/{folder}/p/42/start", params={"a": "1"})
+        transport.post(
+            f"{server}/profile/create", operation="create_profile", data='{"n": "ü"}'.encode()
+        )
+        with pytest.raises(requests.RequestException):
+            transport.get("http://127.0.0.1:1/closed", timeout=1)
+        traffic.close()
+        records = list(API.iter_traffic(str(tmp_path)))
+        assert [record["method"] for record in records] == ["GET", "POST", "GET"]
+        assert records[0]["template"] == "/profile/f/{id}/p/{id}/start"
+        assert records[0]["url"].endswith("/start?a=1")
+        assert records[1]["operation"] == "create_profile"
+        assert records[1]["request_body"] == '{"n": "ü"}'
+        assert json.loads(records[1]["response_body"])["body"] == '{"n": "ü"}'
+        assert records[1]["timing"]["total"] >= records[1]["timing"]["response"] > 0
+        assert records[2]["status"] is None and records[2]["error"]
+        assert traffic.recorded == 3 and traffic.dropped == 0
+
+    def test_files_rotate(self, tmp_path) -> None:
+        traffic = API.TrafficRecorder(str(tmp_path), max_bytes=1000, batch_size=7)
+        for number in range(100):
+            traffic.record(
+                recorder.Exchange(
+                    0.0, "op", "POST", f"http://host/{number}", b"x" * 50, 200, b"\xff\xfe",
+                    1, 0.0, 0.01, 0.01,
+                )
+            )
+        traffic.close()
+        assert len(traffic.files) > 5
+        records = list(API.iter_traffic(*map(str, traffic.files)))
+        assert [record["url"] for record in records] == [f"http://host/{n}" for n in range(100)]
+        body = recorder.decode_body(records[0]["response_body"], records[0]["response_encoding"])
+        assert body == b"\xff\xfe"
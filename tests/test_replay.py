@@ -0,0 +1,72 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+import API
+import data
+from API.recorder import Exchange
+from models import MLX as mlx_models
+from models import dump_json
+from stubs import ReplayIndex, ReplayServer, request_key
+
+STATUS = {"error_code": "", "http_code": 200, "message": ""}
+FOLDER = "0f5e1b9e-6a4c-4c4e-9d4e-2f6b3c1a7d8e"
+PROFILE = "5c2d7a3e-1b4f-4e6a-8c9d-0e1f2a3b4c5d"
+
+
+def record_traffic(directory: str) -> None:
+    body = dump_json(mlx_models.CreateProfile.from_dict({**data.PROFILE_GENERIC, "name": "first"}))
+    with API.TrafficRecorder(directory) as recorder:
+        for number in (1, 2):
+            recorder.record(
+                Exchange(
+                    0.0, "create_profile", "POST", "https://api-dev.mlx.yt/profile/create", body,
+                    201, json.dumps({"status": STATUS, "data": {"ids": [f"id-{number}"]}}).encode(),
+                    1, 0.0, 0.01, 0.01,
+                )
+            )
+        recorder.record(
+            Exchange(
+                0.0, "start_profile", "GET",
+                f"https://launcher.mlx.yt:45001/api/v2/profile/f/{FOLDER}/p/{PROFILE}/start",
+                None, 200, json.dumps({"status": STATUS}).encode(), 1, 0.0, 0.01, 0.01,
+            )
+        )
+
+
+class TestReplay:
+
+    def test_keys_ignore_key_order_and_volatile_fields(self) -> None:
+        ignore = frozenset({"name"})
+        first = request_key("post", "http://h/a?b=2&a=1", b'{"x": 1, "name": "a"}', ignore)
+        second = request_key("POST", "http://o/a?a=1&b=2", b'{"name": "b","x":1}', ignore)
+        assert first == second
+
+    def test_clients_get_recorded_responses(self, tmp_path) -> None:
+        record_traffic(str(tmp_path))
+        index = ReplayIndex.load(str(tmp_path), ignore=("name",))
+        assert index.size == 3
+        with ReplayServer(index) as server:
+            transport = API.Transport(retry_policy=API.RetryPolicy.disabled())
+            mlx = API.MLX(url=server.url, transport=transport)
+            launcher = API.Launcher(url=server.url + "/api/v2", transport=transport)
+            body = {**data.PROFILE_GENERIC, "name": "another run"}
+            ids = [mlx.create_profile("t", body)["data"]["ids"][0] for _ in range(3)]
+            assert ids == ["id-1", "id-2", "id-1"]
+            other_profile = "1a5e1b9e-6a4c-4c4e-9d4e-2f6b3c1a7d8e"
+            assert launcher.start_profile("t", other_profile, FOLDER)["status"] == STATUS
+            # another body only matches the method and path template
+            linux = mlx.create_profile("t", {**data.PROFILE_GENERIC, "os_type": "linux"})
+            assert linux["data"]["ids"] == ["id-1"]
+            assert mlx.get_folder_id("t")["status"]["http_code"] == 404
+            assert server.counts == {"exact": 4, "route": 1, "missing": 1}
+
+    def test_concurrent_clients(self, tmp_path) -> None:
+        record_traffic(str(tmp_path))
+        with ReplayServer(ReplayIndex.load(str(tmp_path), ignore=("name",))) as server:
+            mlx = API.MLX(url=server.url, transport=API.Transport(pool_maxsize=16))
+            body = data.PROFILE_GENERIC
+            with ThreadPoolExecutor(16) as executor:
+                results = list(
+                    executor.map(lambda _: mlx.create_profile("t", body), range(400))
+                )
+        assert all(result["status"]["http_code"] == 200 for result in results)
+        assert server.counts["exact"] == 400
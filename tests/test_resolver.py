@@ -0,0 +1,75 @@
+import threading
+import time
+import pytest
+import utils
+from tests.fakes import FakeMLX, make_token
+
+TOKEN = make_token(workspace_id="w-2")
+
+
+@pytest.fixture
+def mlx() -> FakeMLX:
+    return FakeMLX(folders=[
+        {"name": "Default folder", "folder_id": "f-1", "profiles_count": 0,
+         "created_at": "2024-01-01T00:00:00Z"},
+        {"name": "Load", "folder_id": "f-2", "profiles_count": 3,
+         "created_at": "2024-01-02T00:00:00Z"},
+    ])
+
+
+class TestWorkspaceResolver:
+
+    def test_lookups_share_one_listing(self, mlx: FakeMLX) -> None:
+        resolver = utils.WorkspaceResolver(mlx)
+        assert resolver.folder_id(TOKEN) == "f-1"
+        assert resolver.folder(TOKEN, folder_id="f-2").name == "Load"
+        with pytest.raises(KeyError):
+            resolver.folder_id(TOKEN, name="Missing")
+        assert mlx.calls["get_folder_id"] == 1
+
+    def test_token_workspace_is_preferred(self, mlx: FakeMLX) -> None:
+        resolver = utils.WorkspaceResolver(mlx)
+        assert resolver.workspace_id(TOKEN) == "w-2"
+        assert resolver.workspace_id(TOKEN, name="First") == "w-1"
+        assert resolver.workspace_id("not-a-jwt") == "w-1"
+
+    def test_members_with_the_same_role_do_not_share_listings(self, mlx: FakeMLX) -> None:
+        resolver = utils.WorkspaceResolver(mlx)
+        first = make_token("user", "w-2", user_id="u-2")
+        refreshed = make_token("user", "w-2", ttl=60, user_id="u-2")
+        second = make_token("user", "w-2", user_id="u-3")
+        for token in (first, refreshed, second):
+            resolver.folder_id(token)
+        assert utils.resolver.cache_key(first) == utils.resolver.cache_key(refreshed)
+        assert utils.resolver.cache_key(first) != utils.resolver.cache_key(second)
+        assert mlx.calls["get_folder_id"] == 2
+
+    def test_ttl_and_invalidation(self, mlx: FakeMLX) -> None:
+        resolver = utils.WorkspaceResolver(mlx, ttl=0.05)
+        resolver.folder_id(TOKEN)
+        time.sleep(0.06)
+        resolver.folder_id(TOKEN)
+        assert mlx.calls["get_folder_id"] == 2
+        mlx.folders.append({**mlx.folders[1], "name": "New", "folder_id": "f-3"})
+        resolver.invalidate(TOKEN, kind="folders")
+        assert resolver.folder_id(TOKEN, name="New") == "f-3"
+        assert mlx.calls["get_folder_id"] == 3
+
+    def test_concurrent_lookups_fetch_once(self, mlx: FakeMLX) -> None:
+        resolver = utils.WorkspaceResolver(mlx)
+        threads = [threading.Thread(target=resolver.folder_id, args=(TOKEN,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert mlx.calls["get_folder_id"] == 1
+
+    def test_listings_are_shared_through_the_database(self, mlx: FakeMLX, tmp_path) -> None:
+        db_path = str(tmp_path / "resolver.db")
+        utils.WorkspaceResolver(mlx, db_path=db_path).folder_id(TOKEN)
+        other_worker = utils.WorkspaceResolver(mlx, db_path=db_path)
+        assert other_worker.folder_id(TOKEN, name="Load") == "f-2"
+        assert mlx.calls["get_folder_id"] == 1
+        other_worker.invalidate()
+        utils.WorkspaceResolver(mlx, db_path=db_path).folder_id(TOKEN)
+        assert mlx.calls["get_folder_id"] == 2
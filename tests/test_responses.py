@@ -0,0 +1,85 @@
+import json
+import pytest
+import requests
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError
+import API
+from models import MLX as mlx_models
+from models import launcher as launcher_models
+
+
+def make_response(status_code: int, body: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode()
+    return response
+
+
+SIGNIN = {
+    "status": {"error_code": "", "http_code": 200, "message": "Successful sign in"},
+    "data": {"token": "t", "refresh_token": "r"},
+}
+ERROR = {
+    "status": {"error_code": "UNAUTHORIZED_REQUEST", "http_code": 401, "message": "Unauthorized"},
+    "data": {},
+}
+
+
+class TestResponses:
+
+    def test_untyped_returns_dict(self) -> None:
+        assert API.decode_response(make_response(200, SIGNIN), "sign_in") == SIGNIN
+
+    def test_typed_returns_model(self) -> None:
+        decoded = API.decode_response(make_response(200, SIGNIN), "sign_in", typed=True)
+        assert isinstance(decoded, mlx_models.SigninResponse)
+        assert decoded == mlx_models.SigninResponse(**SIGNIN)
+
+    def test_as_model_accepts_both_modes(self) -> None:
+        model = mlx_models.SigninResponse(**SIGNIN)
+        assert API.as_model(mlx_models.SigninResponse, model) is model
+        assert API.as_model(mlx_models.SigninResponse, SIGNIN) == model
+        assert API.http_code(model) == API.http_code(SIGNIN) == 200
+        assert API.http_code({}) == 0
+
+    def test_typed_error_envelope_returns_dict(self) -> None:
+        assert API.decode_response(make_response(401, ERROR), "sign_in", typed=True) == ERROR
+
+    def test_typed_unregistered_operation_returns_dict(self) -> None:
+        body = {"status": {"http_code": 200}}
+        assert API.decode_response(make_response(200, body), "set_restrictions", True) == body
+
+    def test_every_registered_model_resolves(self) -> None:
+        for operation in API.RESPONSE_MODELS:
+            assert API.responses.response_model(operation) is not None
+        assert API.responses.response_model("start_profile") is launcher_models.Response
+
+    def test_construct_matches_validation(self) -> None:
+        constructed = API.construct(mlx_models.SigninResponse, SIGNIN)
+        assert isinstance(constructed.data, mlx_models.Signin)
+        assert constructed.model_dump() == mlx_models.SigninResponse(**SIGNIN).model_dump()
+        assert constructed.model_fields_set == {"status", "data"}
+
+    def test_construct_fills_defaults_aliases_and_private_state(self) -> None:
+        class Item(BaseModel):
+            item_id: str = Field(alias="itemID")
+            tags: list[str] = Field(default_factory=list)
+            _seen: int = PrivateAttr(default=0)
+
+        first, second = (API.construct(Item, {"itemID": "a"}) for _ in range(2))
+        assert first == Item(itemID="a") and first.model_fields_set == {"item_id"}
+        first.tags.append("x")
+        first._seen += 1
+        assert second.tags == [] and second._seen == 0
+        assert first.model_copy().model_dump(by_alias=True) == {"itemID": "a", "tags": ["x"]}
+
+    def test_trusted_mode_skips_validation(self, monkeypatch) -> None:
+        monkeypatch.delenv("VALIDATE_ALL_RESPONSES", raising=False)
+        invalid = {**SIGNIN, "data": {"token": 1, "refresh_token": "r"}}
+        decoded = API.decode_response(make_response(200, invalid), "sign_in", True, sample_rate=0)
+        assert decoded.data.token == 1
+
+    def test_debug_flag_validates_every_response(self, monkeypatch) -> None:
+        monkeypatch.setenv("VALIDATE_ALL_RESPONSES", "1")
+        invalid = {**SIGNIN, "data": {"token": 1, "refresh_token": "r"}}
+        with pytest.raises(ValidationError):
+            API.decode_response(make_response(200, invalid), "sign_in", True, sample_rate=0)
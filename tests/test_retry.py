@@ -0,0 +1,127 @@
+import random
+from email.utils import formatdate
+import pytest
+import requests
+from urllib3.exceptions import NewConnectionError
+import API
+from API.retry import parse_retry_after
+from stubs import Endpoint
+
+
+def response_with(retry_after: str | None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 429
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+
+def connect_error() -> requests.exceptions.ConnectionError:
+    refused = NewConnectionError(None, "Connection refused")
+    return requests.exceptions.ConnectionError(refused)
+
+
+class TestRetryAfter:
+
+    def test_seconds_and_dates(self) -> None:
+        assert parse_retry_after("2.5") == 2.5
+        assert parse_retry_after("-1") == 0
+        assert parse_retry_after(formatdate(0, usegmt=True)) == 0
+        assert 0 < parse_retry_after(formatdate(2e10, usegmt=True))
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_backoff_waits_at_least_retry_after(self) -> None:
+        policy = API.RetryPolicy(backoff_factor=0.1, max_backoff=5)
+        assert policy.backoff(1, response_with("3")) == 3
+        # capped by max_backoff, ignored when missing or disabled
+        assert policy.backoff(1, response_with("60")) == 5
+        assert policy.backoff(1, response_with(None)) <= 0.1
+        ignoring = API.RetryPolicy(backoff_factor=0.1, respect_retry_after=False)
+        assert ignoring.backoff(1, response_with("3")) <= 0.1
+
+
+class TestBackoff:
+
+    def test_exponential_without_jitter(self) -> None:
+        policy = API.RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+        assert [policy.backoff(attempt) for attempt in range(1, 6)] == [0.5, 1, 2, 3, 3]
+
+    def test_full_jitter_stays_within_bounds(self, monkeypatch) -> None:
+        monkeypatch.setattr("API.retry.random", random.Random(1))
+        policy = API.RetryPolicy(backoff_factor=0.5, max_backoff=3)
+        for attempt in range(1, 6):
+            delays = [policy.backoff(attempt) for _ in range(200)]
+            upper = min(3, 0.5 * 2 ** (attempt - 1))
+            assert all(0 <= delay <= upper for delay in delays)
+            assert max(delays) - min(delays) > upper / 2
+
+
+class TestRetryDecisions:
+
+    @pytest.mark.parametrize(
+        "operation, key, status, retried",
+        [
+            ("get_folder_id", None, 503, True),
+            ("search_profiles", None, 500, True),
+            ("get_folder_id", None, 404, False),
+            ("create_profile", None, 503, False),
+            ("start_profile", None, 503, False),
+            ("verify_email", None, 502, False),
+            (None, None, 503, False),
+            ("create_profile", "key", 503, True),
+            ("stop_profile", None, 429, True),
+            ("create_profile", "key", 400, False),
+        ],
+    )
+    def test_statuses(self, operation, key, status, retried) -> None:
+        policy = API.RetryPolicy()
+        assert policy.should_retry_status(operation, key, status, 1) is retried
+
+    @pytest.mark.parametrize(
+        "operation, key, error, retried",
+        [
+            ("get_workspace_id", None, requests.exceptions.ReadTimeout(), True),
+            ("start_profile", None, requests.exceptions.ReadTimeout(), False),
+            ("create_profile", None, requests.exceptions.ReadTimeout(), False),
+            ("create_profile", "key", requests.exceptions.ReadTimeout(), True),
+            ("create_profile", None, requests.exceptions.ConnectTimeout(), True),
+            ("stop_profile", None, connect_error(), True),
+            ("sign_up", None, requests.exceptions.ConnectionError("reset"), False),
+            ("get_folder_id", None, ValueError(), False),
+        ],
+    )
+    def test_errors(self, operation, key, error, retried) -> None:
+        assert API.RetryPolicy().should_retry_error(operation, key, error, 1) is retried
+
+    def test_attempts_are_capped(self) -> None:
+        policy = API.RetryPolicy(max_attempts=3)
+        timeout = requests.exceptions.ReadTimeout()
+        assert policy.should_retry_status("get_folder_id", None, 503, 2)
+        assert not policy.should_retry_status("get_folder_id", None, 503, 3)
+        assert not policy.should_retry_error("get_folder_id", None, timeout, 3)
+        assert not API.RetryPolicy.disabled().should_retry_status("get_folder_id", None, 503, 1)
+
+
+class TestBulkRetries:
+
+    @pytest.mark.parametrize("request_keys, attempts", [(False, 1), (True, 3)])
+    def test_create_profile_is_only_retried_with_request_keys(
+        self, sim_clients, request_keys, attempts
+    ) -> None:
+        policy = API.RetryPolicy(max_attempts=3, backoff_factor=0.01)
+        endpoints = {"create_profile": Endpoint(error_rate=1.0)}
+        sim = sim_clients(endpoints=endpoints, retry_policy=policy)
+        provisioner = API.BulkProvisioner(sim.mlx, sim.sign_in(), request_keys=request_keys)
+        results = list(provisioner.provision(1))
+        assert sim.simulator.counts["create_profile:500"] == attempts
+        assert not results[0].ids
+
+    def test_side_effect_gets_are_not_retried(self, sim_clients) -> None:
+        endpoints = {name: Endpoint(error_rate=1.0) for name in ("start_profile", "get_folder_id")}
+        policy = API.RetryPolicy(max_attempts=3, backoff_factor=0.01)
+        sim = sim_clients(endpoints=endpoints, retry_policy=policy)
+        assert sim.launcher.start_profile("token", "p-1", "f-1")["status"]["http_code"] == 500
+        assert sim.mlx.get_folder_id("token")["status"]["http_code"] == 500
+        assert sim.simulator.counts["start_profile:500"] == 1
+        assert sim.simulator.counts["get_folder_id:500"] == 3
@@ -0,0 +1,40 @@
+import pytest
+import API
+from tests.fakes import FakeMLX, make_profile
+
+
+class TestProfileSearch:
+
+    def test_walks_every_page_in_order(self) -> None:
+        profiles = [make_profile(number, 0, "windows") for number in range(250)]
+        mlx = FakeMLX(profiles)
+        ids = [item.id for item in API.ProfileSearch(mlx, "token", prefetch=2)]
+        assert ids == [profile["id"] for profile in profiles]
+        assert mlx.requests == 3
+
+    def test_splits_by_folder_past_the_offset_cap(self) -> None:
+        profiles = [make_profile(number, number % 3, "windows") for number in range(12000)]
+        ids = {item.id for item in API.ProfileSearch(FakeMLX(profiles), "token")}
+        assert ids == {profile["id"] for profile in profiles}
+
+    def test_walks_both_ends_when_no_split_is_left(self) -> None:
+        profiles = [make_profile(number, 0, "linux") for number in range(15000)]
+        items = list(API.ProfileSearch(FakeMLX(profiles), "token"))
+        assert len(items) == len(profiles)
+        assert {item.id for item in items} == {profile["id"] for profile in profiles}
+
+    @pytest.mark.parametrize("count, page_size", [(15050, 100), (10025, 30), (20003, 70)])
+    def test_pages_that_do_not_divide_the_cap(self, count, page_size) -> None:
+        profiles = [make_profile(number, 0, "linux") for number in range(count)]
+        search = API.ProfileSearch(FakeMLX(profiles), "token", page_size=page_size)
+        assert search.window <= API.search.MAX_OFFSET + page_size
+        ids = [item.id for item in search]
+        assert sorted(ids) == sorted(profile["id"] for profile in profiles)
+
+    def test_stops_early_without_fetching_everything(self) -> None:
+        mlx = FakeMLX([make_profile(number, 0, "macos") for number in range(5000)])
+        iterator = iter(API.ProfileSearch(mlx, "token", prefetch=3))
+        first = [next(iterator) for _ in range(150)]
+        iterator.close()
+        assert len(first) == 150
+        assert mlx.requests <= 1 + 3 + 1
@@ -0,0 +1,40 @@
+import json
+import pytest
+import data
+import models
+from models import MLX as mlx_models
+from models import launcher as launcher_models
+
+
+BODIES = [
+    mlx_models.CreateProfile.from_dict({**data.PROFILE_GENERIC, "folder_id": "f"}),
+    mlx_models.CreateProfile.from_dict(data.PROFILE_FULL),
+    mlx_models.RemoveProfiles(ids=["a", "b"], permanently=True),
+    mlx_models.RefreshToken(email="a@b.c", refresh_token="r", workspace_id="w"),
+    launcher_models.CookieImport(profile_id="p", folder_id="f", cookies="[]"),
+    launcher_models.CookieImport(
+        profile_id="p", folder_id="f", cookies="[]", import_advanced_cookies=True
+    ),
+]
+
+
+class TestSerialization:
+
+    @pytest.mark.parametrize("body", BODIES, ids=lambda body: type(body).__name__)
+    def test_fast_path_matches_to_dict(self, body) -> None:
+        # Compared as documents: Union[float, int] fields such as altitude are
+        # written as 10.0 by pydantic-core and as 10 by json.dumps
+        expected = body.to_dict()
+        assert json.loads(models.dump_json(body)) == expected
+        assert json.loads(body.to_json()) == expected
+        assert list(json.loads(models.dump_json(body))) == list(expected)
+
+    @pytest.mark.parametrize("body", BODIES, ids=lambda body: type(body).__name__)
+    def test_round_trip(self, body) -> None:
+        assert type(body).from_json(body.to_json()) == body
+
+    def test_search_criteria_keeps_explicit_null_sort(self) -> None:
+        criteria = mlx_models.ProfileSearchCriteria(
+            offset=0, limit=10, search_text="", storage_type="all", is_removed=False, sort=None
+        )
+        assert json.loads(criteria.to_json())["sort"] is None
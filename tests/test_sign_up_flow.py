@@ -1,4 +1,5 @@
 import API
+import utils
 import logging
 import pytest
 import data
@@ -155,11 +156,11 @@ def verify_email(
 
 
 @pytest.fixture(scope="session")
-def get_workspace_id(mlx_api: API.MLX, sign_in: tuple) -> str:
+def get_workspace_id(resolver: utils.WorkspaceResolver, sign_in: tuple) -> str:
     """Get workspace id
 
     Args:
-        mlx_api (API.MLX): MLX API instance.
+        resolver (utils.WorkspaceResolver): cached workspace and folder listings.
         sign_in (Fixture): Fixture to sign in to get token.
 
     Returns:
@@ -169,10 +170,9 @@ def get_workspace_id(mlx_api: API.MLX, sign_in: tuple) -> str:
     token, _ = sign_in
     try:
         logger.info("Requesting workspace_id")
-        wid_data = mlx_api.get_workspace_id(token=token)
-        workspace_id = mlx_models.UserWorkspaceArrayResponse(**wid_data)
-        logger.info("Workspace ID response: %s", workspace_id)
-        return workspace_id.data.workspaces[0].workspace_id
+        workspace = resolver.workspace(token=token)
+        logger.info("Workspace: %s", workspace)
+        return workspace.workspace_id
     except ValidationError as e:
         logger.error("Validation or Assertion error occurred: %s", e)
         raise
@@ -202,11 +202,11 @@ def enable_plan(emp_api: API.EMP, get_workspace_id: str) -> dict:
 
 
 @pytest.fixture(scope="session")
-def get_folder_id(mlx_api: API.MLX, sign_in: tuple) -> str:
+def get_folder_id(resolver: utils.WorkspaceResolver, sign_in: tuple) -> str:
     """Get folder id.
 
     Args:
-        mlx_api (API.MLX): MLX API instance.
+        resolver (utils.WorkspaceResolver): cached workspace and folder listings.
         sign_in (Fixture): Fixture to sign in to get token.
 
     Returns:
@@ -215,11 +215,7 @@ def get_folder_id(mlx_api: API.MLX, sign_in: tuple) -> str:
     # Step 4: Get folder_id
     token, _ = sign_in
     try:
-        fid_data = mlx_api.get_folder_id(token=token)
-        folders = mlx_models.UserFolderArrayResponse(**fid_data)
-        for folder in folders.data.folders:
-            if folder.name == "Default folder":
-                return folder.folder_id
+        return resolver.folder_id(token=token, name="Default folder")
     except ValidationError as e:
         logger.error("Validation or Assertion error occurred: %s", e)
         raise
@@ -230,7 +226,11 @@ def get_folder_id(mlx_api: API.MLX, sign_in: tuple) -> str:
 
 @pytest.fixture(scope="session")
 def create_profile(
-    mlx_api: API.MLX, request: FixtureRequest, sign_in: tuple, get_folder_id: str
+    mlx_api: API.MLX,
+    request: FixtureRequest,
+    sign_in: tuple,
+    get_folder_id: str,
+    profile_generator: data.ProfileGenerator,
 ) -> Generator[str, Any, None]:
     """Create profile.
 
@@ -239,6 +239,7 @@ def create_profile(
         request (FixtureRequest): Fixture request.
         sign_in (Fixture): Fixture to sign in to get token.
         get_folder_id (Fixture): Fixture to get folder id.
+        profile_generator (Fixture): Source of unique profile names.
 
     Yields:
         Generator[str, Any, None]: list of profiles.
@@ -247,8 +248,11 @@ def create_profile(
     # if remove is provided via pytest.mark.parametrize, it will be used via request.param.
     remove = request.param if hasattr(request, "param") else True
     try:
-        body = data.PROFILE_GENERIC
-        body.update({"folder_id": get_folder_id})
+        body = {
+            **data.PROFILE_GENERIC,
+            "name": profile_generator.name(),
+            "folder_id": get_folder_id,
+        }
         token, _ = sign_in
         res = mlx_api.create_profile(token=token, profile_params=body)
         response = mlx_models.ArrayOfIDsResponse(**res)
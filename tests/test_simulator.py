@@ -0,0 +1,99 @@
+import time
+import API
+import data
+from stubs import EMAIL, PASSWORD, Endpoint
+
+
+def signed_up(mlx: API.MLX, emp: API.EMP) -> str:
+    assert mlx.sign_up(EMAIL, PASSWORD)["status"]["message"] == "Successful signup"
+    token = mlx.sign_in(EMAIL, PASSWORD)["data"]["token"]
+    email_token = emp.get_email_token(EMAIL)["data"]["token"]
+    verified = mlx.verify_email(email=EMAIL, email_token=email_token, jwt=token)
+    assert verified["status"]["message"] == "Email successfully verified"
+    return token
+
+
+class TestSimulator:
+
+    def test_sign_up_to_profile_lifecycle(self, sim_clients) -> None:
+        sim = sim_clients(seed=1)
+        mlx, emp, launcher = sim.mlx, sim.emp, sim.launcher
+        token = signed_up(mlx, emp)
+        assert mlx.sign_up(EMAIL, PASSWORD)["status"]["http_code"] == 400
+        folders = mlx.get_folder_id(token)["data"]["folders"]
+        folder_id = folders[0]["folder_id"]
+        workspace = mlx.get_workspace_id(token)["data"]["workspaces"][0]
+        assert emp.set_restrictions(workspace["workspace_id"])["status"]["http_code"] == 200
+        body = data.ProfileGenerator(seed=1).payload(folder_id=folder_id, times=2)
+        ids = mlx.create_profile(token, body)["data"]["ids"]
+        assert len(ids) == 2
+        assert launcher.start_profile(token, ids[0], folder_id)["status"]["http_code"] == 200
+        assert launcher.start_profile(token, ids[0], folder_id)["status"]["http_code"] == 400
+        cookies = '[{"domain": ".example.com", "name": "a", "value": "1"}]'
+        imported = launcher.import_cookies(token, ids[0], folder_id, cookies)
+        assert imported["status"]["http_code"] == 200
+        assert sim.simulator.profiles[ids[0]].cookies == 1
+        assert launcher.stop_profile(token, ids[0])["status"]["http_code"] == 200
+        assert mlx.get_folder_id(token)["data"]["folders"][0]["profiles_count"] == 2
+        assert mlx.delete_profile(token, ids)["status"]["http_code"] == 200
+        assert not sim.simulator.profiles
+        refresh_token = mlx.sign_in(EMAIL, PASSWORD)["data"]["refresh_token"]
+        refreshed = mlx.refresh_token(EMAIL, workspace["workspace_id"], refresh_token)
+        assert refreshed["data"]["token"]
+        assert mlx.get_folder_id("not a token")["status"]["http_code"] == 401
+
+    def test_unverified_users_cannot_create_profiles(self, sim_clients) -> None:
+        sim = sim_clients()
+        token = sim.sign_in(verified=False)
+        folder_id = sim.mlx.get_folder_id(token)["data"]["folders"][0]["folder_id"]
+        res = sim.mlx.create_profile(token, {**data.PROFILE_GENERIC, "folder_id": folder_id})
+        assert res["status"]["error_code"] == "EMAIL_NOT_VERIFIED"
+
+    def test_same_seed_same_ids(self, sim_clients) -> None:
+        created = []
+        for _ in range(2):
+            sim = sim_clients(seed=7)
+            token = signed_up(sim.mlx, sim.emp)
+            folder_id = sim.mlx.get_folder_id(token)["data"]["folders"][0]["folder_id"]
+            body = {**data.PROFILE_GENERIC, "folder_id": folder_id, "times": 3}
+            created.append(sim.mlx.create_profile(token, body)["data"]["ids"])
+        assert created[0] == created[1]
+
+    def test_pooled_fingerprints_are_kept_by_created_profiles(self, sim_clients) -> None:
+        sim = sim_clients(seed=1)
+        mlx = sim.mlx
+        token = signed_up(mlx, sim.emp)
+        folder_id = mlx.get_folder_id(token)["data"]["folders"][0]["folder_id"]
+        with API.FingerprintPool(mlx, token, batch=5) as pool:
+            provisioner = API.BulkProvisioner(mlx, token, folder_id, fingerprints=pool)
+            results = list(provisioner.provision(3))
+        assert sum(len(result.ids) for result in results) == 3
+        assert sim.simulator.counts["get_fingerprints:200"] >= 1
+        for profile in sim.simulator.profiles.values():
+            parameters = profile.body.parameters
+            assert parameters.fingerprint.navigator.platform == "Win32"
+            assert parameters.flags.navigator_masking.value == "custom"
+            assert parameters.flags.screen_masking.value == "custom"
+            assert parameters.flags.audio_masking.value == "mask"
+        res = mlx.get_fingerprints(token, "beos", "mimic", 131, count=1)
+        assert res["status"]["http_code"] == 400
+
+    def test_faults_are_injected(self, sim_clients) -> None:
+        endpoints = {
+            "get_folder_id": Endpoint(error_rate=1.0),
+            "get_workspace_id": Endpoint(rate=5, burst=1),
+            "sign_in": Endpoint(latency=(0.05, 0.06)),
+        }
+        sim = sim_clients(seed=1, endpoints=endpoints)
+        mlx = sim.mlx
+        start = time.perf_counter()
+        token = signed_up(mlx, sim.emp)
+        assert time.perf_counter() - start >= 0.05
+        assert mlx.get_folder_id(token)["status"]["http_code"] == 500
+        assert mlx.get_workspace_id(token)["status"]["http_code"] == 200
+        assert mlx.get_workspace_id(token)["status"]["http_code"] == 429
+        # the transport's retry policy waits for Retry-After and gets through
+        with API.Transport(retry_policy=API.RetryPolicy(max_attempts=5)) as transport:
+            retrying = API.MLX(url=sim.simulator.url, transport=transport)
+            assert retrying.get_workspace_id(token)["status"]["http_code"] == 200
+        assert sim.simulator.counts["get_workspace_id:429"] >= 2
@@ -0,0 +1,54 @@
+import json
+import pytest
+import data
+from pydantic import ValidationError
+from models import PayloadTemplate, dump_json
+from models import MLX as mlx_models
+from models import launcher
+
+
+class TestPayloadTemplate:
+
+    def test_spliced_bytes_match_the_model(self) -> None:
+        template = PayloadTemplate(
+            mlx_models.CreateProfile, data.PROFILE_FULL, ("name", "folder_id", "tags")
+        )
+        cases = [
+            {},
+            {"name": "Zoë \"quoted\" \n name", "folder_id": "f-1", "tags": ["a", "ünï"]},
+            {"name": "no tags", "tags": None},
+            {"folder_id": "only folder"},
+        ]
+        for fields in cases:
+            expected = dump_json(mlx_models.CreateProfile.from_dict({**data.PROFILE_FULL, **fields}))
+            assert template.render(**fields) == expected
+
+    def test_generated_payloads_match_the_model(self) -> None:
+        payloads = data.ProfileGenerator(seed=3).batch(200)
+        template = PayloadTemplate(mlx_models.CreateProfile, payloads[0], ("name", "tags"))
+        for payload in payloads[1:]:
+            fields = {"name": payload["name"], "tags": payload.get("tags")}
+            expected = dump_json(mlx_models.CreateProfile.from_dict({**payloads[0], **fields}))
+            assert template.render(**fields) == expected
+
+    def test_cookie_import(self) -> None:
+        cookies = json.dumps([{"domain": ".example.com", "name": "id", "value": "1"}])
+        base = {"profile_id": "", "folder_id": "", "cookies": cookies}
+        template = PayloadTemplate(launcher.CookieImport, base, ("profile_id", "folder_id"))
+        expected = dump_json(launcher.CookieImport(profile_id="p", folder_id="f", cookies=cookies))
+        assert template.render(profile_id="p", folder_id="f") == expected
+
+    def test_render_checks_field_types(self) -> None:
+        template = PayloadTemplate(mlx_models.CreateProfile, data.PROFILE_FULL, ("name", "tags"))
+        with pytest.raises(ValidationError):
+            template.render(name=1)
+        with pytest.raises(ValidationError):
+            template.render(tags=[str(tag) for tag in range(11)])
+        with pytest.raises(ValueError):
+            template.render(notes="not a template field")
+
+    def test_rejects_unknown_and_validated_fields(self) -> None:
+        with pytest.raises(ValueError):
+            PayloadTemplate(mlx_models.CreateProfile, data.PROFILE_FULL, ("nickname",))
+        with pytest.raises(ValueError):
+            PayloadTemplate(mlx_models.CreateProfile, data.PROFILE_FULL, ("os_type",))
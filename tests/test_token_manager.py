@@ -0,0 +1,86 @@
+import threading
+import time
+import pytest
+import utils
+from tests.fakes import FakeMLX, make_token
+
+KEY = ("owner", "w-1")
+
+
+class TestTokenManager:
+
+    def test_timer_refreshes_before_expiry(self) -> None:
+        mlx = FakeMLX()
+        manager = utils.TokenManager(mlx, refresh_margin=10)
+        try:
+            token = make_token(ttl=10.1)
+            manager.put(token, "r-0", email="owner@example.com", persist=False)
+            deadline = time.monotonic() + 2
+            while mlx.refreshes == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.1)
+            assert mlx.refreshes == 1
+            assert manager.get("owner") != token
+        finally:
+            manager.close()
+
+    def test_concurrent_callers_share_one_refresh(self) -> None:
+        mlx = FakeMLX()
+        manager = utils.TokenManager(mlx, background=False)
+        expired = make_token(ttl=-1)
+        manager.put(expired, "r-0", email="owner@example.com", persist=False)
+        tokens = []
+        threads = [
+            threading.Thread(target=lambda: tokens.append(manager.verify(expired)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert mlx.refreshes == 1
+        assert len(set(tokens)) == 1 and expired not in tokens
+
+    def test_stale_caller_does_not_refresh_again(self) -> None:
+        mlx = FakeMLX()
+        manager = utils.TokenManager(mlx, background=False)
+        stale = manager.put(make_token(ttl=-1), "r-0", email="owner@example.com", persist=False)
+        refreshed = manager.refresh(KEY)
+        # a caller that saw the expired entry before the refresh finished
+        assert manager._valid(stale) is refreshed
+        assert manager.refresh(KEY) is refreshed
+        assert mlx.refreshes == 1
+        assert refreshed.refresh_token == "r-1"
+
+    def test_write_behind_persists_latest_tokens(self) -> None:
+        persisted = []
+        manager = utils.TokenManager(FakeMLX(), persist=persisted.append, background=False)
+        manager.put(make_token(), "r-0", email="owner@example.com", persist=False)
+        first = manager.put(make_token(role="user"), "r-1")
+        latest = manager.put(make_token(ttl=7200), "r-2")
+        manager.flush()
+        manager.close()
+        assert {entry.key for entry in persisted} == {first.key, latest.key}
+        assert [entry for entry in persisted if entry.key == KEY][-1] == latest
+
+    def test_unseen_expired_token_uses_the_stored_refresh_token(self) -> None:
+        mlx = FakeMLX()
+        stored = {"owner": {"email": "owner@example.com", "password": "p", "refresh_token": "r-0"}}
+        manager = utils.TokenManager(mlx, background=False, credentials=stored.__getitem__)
+        expired = make_token(ttl=-1)
+        token = manager.verify(expired)
+        assert token != expired and mlx.refreshes == 1
+        assert mlx.calls["sign_in"] == 0
+
+    def test_unseen_expired_token_without_refresh_token_signs_in(self) -> None:
+        mlx = FakeMLX()
+        stored = {"owner": {"email": "owner@example.com", "password": "p", "refresh_token": None}}
+        manager = utils.TokenManager(mlx, background=False, credentials=stored.__getitem__)
+        token = manager.verify(make_token(ttl=-1))
+        assert mlx.calls["sign_in"] == 1 and mlx.refreshes == 0
+        assert manager.get("owner") == token
+
+    def test_unseen_expired_token_without_credentials_fails_clearly(self) -> None:
+        manager = utils.TokenManager(FakeMLX(), background=False, credentials={}.__getitem__)
+        with pytest.raises(RuntimeError, match="credentials"):
+            manager.verify(make_token(ttl=-1))
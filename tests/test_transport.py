@@ -0,0 +1,34 @@
+import API
+from stubs import Simulator
+
+
+class TestPoolStats:
+
+    def test_counts_hits_and_misses_per_host(self) -> None:
+        stats = API.PoolStats()
+        stats.record("a", reused=False)
+        stats.record("a", reused=True)
+        stats.record("a", reused=True)
+        stats.record("b", reused=False)
+        assert (stats.hits, stats.misses) == (2, 2)
+        assert stats.snapshot() == {
+            "hits": 2,
+            "misses": 2,
+            "hosts": {"a": {"hits": 2, "misses": 1}, "b": {"hits": 0, "misses": 1}},
+        }
+        stats.reset()
+        assert stats.snapshot() == {"hits": 0, "misses": 0, "hosts": {}}
+
+    def test_keep_alive_reuses_connections(self) -> None:
+        with Simulator() as simulator:
+            with API.Transport() as transport:
+                for _ in range(3):
+                    transport.get(simulator.url + "/user/workspaces")
+                assert (transport.stats.hits, transport.stats.misses) == (2, 1)
+
+    def test_without_keep_alive_every_request_connects(self) -> None:
+        with Simulator() as simulator:
+            with API.Transport(keep_alive=False) as transport:
+                for _ in range(3):
+                    transport.get(simulator.url + "/user/workspaces")
+                assert (transport.stats.hits, transport.stats.misses) == (0, 3)
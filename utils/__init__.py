@@ -3,4 +3,10 @@
 
 from utils.config_provider import ConfigProvider
 from utils.data_provider import DataProvider
-from utils.helper import Helper
\ No newline at end of file
+from utils.helper import Helper
+from utils.credential_store import CredentialStore, get_credential_store
+from utils.token_manager import CachedToken, TokenManager, get_token_manager
+from utils.account_pool import Account, AccountPool, make_email, worker_index_range, worker_number
+from utils.account_factory import AccountFactory
+from utils.profile_mirror import ProfileMirror, get_profile_mirror
+from utils.resolver import WorkspaceResolver, get_resolver
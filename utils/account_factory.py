@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable
+import API
+from utils.account_pool import STAGES, Account, Draft, make_email, worker_index_range
+
+
+logger = logging.getLogger("my_logger")
+
+_STOP = object()
+
+
+class AccountFactory:
+    """Background pipeline keeping a buffer of verified, plan-enabled accounts ready.
+
+    Sign-up, verification and plan assignment run as separate stages with their
+    own workers, connected by queues, so different accounts are at different
+    stages at the same time. At most `buffer` accounts are ready or in progress;
+    taking one lets the factory start the next. take() fails as soon as the
+    email indexes have run out and no account is left in progress.
+
+    Args:
+        mlx (API.MLX): MLX API client
+        emp (API.EMP): EMP API client
+        password (str): password of the created accounts
+        buffer (int): accounts kept ready or in progress. Defaults to 5.
+        indexes (range | None): email indexes to use. Defaults to worker_index_range().
+        workers_per_stage (int): workers of every stage. Defaults to 2.
+    """
+
+    def __init__(
+        self,
+        mlx: API.MLX,
+        emp: API.EMP,
+        password: str,
+        buffer: int = 5,
+        indexes: range | None = None,
+        workers_per_stage: int = 2,
+    ) -> None:
+        if buffer < 1:
+            raise ValueError(f"buffer must be positive, got {buffer}")
+        self.mlx = mlx
+        self.emp = emp
+        self.password = password
+        self.buffer = buffer
+        self.workers_per_stage = workers_per_stage
+        self.produced = 0
+        self.failed = 0
+        self._indexes = iter(indexes if indexes is not None else worker_index_range())
+        self._slots = threading.Semaphore(buffer)
+        self._queues: list[queue.Queue] = [queue.Queue() for _ in STAGES]
+        self._ready: queue.Queue[Account] = queue.Queue()
+        self._lock = threading.Lock()
+        # notified whenever an account becomes ready, a draft fails or intake ends
+        self._changed = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._stopped = threading.Event()
+        self._exhausted = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> "AccountFactory":
+        if self._threads:
+            return self
+        self._spawn(self._intake, "account-intake")
+        for number, stage in enumerate(STAGES):
+            next_queue = self._queues[number + 1] if number + 1 < len(STAGES) else None
+            for worker in range(self.workers_per_stage):
+                self._spawn(
+                    self._run_stage,
+                    f"account-{stage.__name__}-{worker}",
+                    stage,
+                    self._queues[number],
+                    next_queue,
+                )
+        return self
+
+    def _spawn(self, target: Callable, name: str, *args) -> None:
+        thread = threading.Thread(target=target, name=name, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _intake(self) -> None:
+        while not self._stopped.is_set():
+            if not self._slots.acquire(timeout=0.1):
+                continue
+            try:
+                index = next(self._indexes)
+            except StopIteration:
+                logger.warning("Account factory ran out of email indexes")
+                with self._changed:
+                    self._exhausted.set()
+                    self._changed.notify_all()
+                return
+            with self._lock:
+                self._in_flight += 1
+            self._queues[0].put(Draft(index=index, email=make_email(index), password=self.password))
+
+    def _run_stage(
+        self,
+        stage: Callable[[API.MLX, API.EMP, Draft], None],
+        source: queue.Queue,
+        target: queue.Queue | None,
+    ) -> None:
+        while True:
+            draft = source.get()
+            if draft is _STOP:
+                return
+            try:
+                stage(self.mlx, self.emp, draft)
+            except Exception as e:
+                logger.error("%s failed for %s: %s", stage.__name__, draft.email, e)
+                with self._changed:
+                    self.failed += 1
+                    self._in_flight -= 1
+                    self._changed.notify_all()
+                self._slots.release()
+                continue
+            if target is not None:
+                target.put(draft)
+            else:
+                with self._changed:
+                    self.produced += 1
+                    self._in_flight -= 1
+                    self._ready.put(draft.to_account())
+                    self._changed.notify()
+
+    def take(self, timeout: float | None = None) -> Account:
+        """Taking a ready account, waiting for the pipeline when the buffer is empty
+
+        Args:
+            timeout (float | None): maximum seconds to wait. Waits as long as accounts
+                are in progress when None.
+
+        Returns:
+            Account: verified account with a plan
+
+        Raises:
+            RuntimeError: the email indexes have run out and nothing is in progress,
+                or the factory was stopped
+            TimeoutError: no account became ready within the timeout
+        """
+        if not self._threads:
+            self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while self._ready.empty():
+                if self._stopped.is_set():
+                    raise RuntimeError("The account factory has been stopped")
+                if self._exhausted.is_set() and self._in_flight == 0:
+                    raise RuntimeError(
+                        f"The account factory has run out of email indexes "
+                        f"({self.failed} accounts failed)"
+                    )
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No account became ready within {timeout}s")
+                self._changed.wait(remaining)
+            account = self._ready.get_nowait()
+        self._slots.release()
+        return account
+
+    @property
+    def ready(self) -> int:
+        return self._ready.qsize()
+
+    def stop(self) -> None:
+        with self._changed:
+            self._stopped.set()
+            self._changed.notify_all()
+        for source in self._queues:
+            for _ in range(self.workers_per_stage):
+                source.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout=5.0)
+        self._threads = []
+
+    def __enter__(self) -> "AccountFactory":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator
+import API
+from models import EMP as emp_models
+from models import MLX as mlx_models
+
+if TYPE_CHECKING:
+    from utils.account_factory import AccountFactory
+
+
+logger = logging.getLogger("my_logger")
+
+EMAIL_DOMAIN = "multilogin.com"
+# Number of email indexes reserved for every xdist worker
+DEFAULT_SPAN = 100
+
+
+def worker_number(worker_id: str | None = None) -> int:
+    """Getting the number of the current pytest-xdist worker
+
+    Args:
+        worker_id (str | None): 'gw0', 'gw1', ... Read from PYTEST_XDIST_WORKER when omitted.
+
+    Returns:
+        int: worker number, 0 when not running under xdist
+    """
+    worker_id = worker_id or os.getenv("PYTEST_XDIST_WORKER", "master")
+    return int(worker_id[2:]) if worker_id.startswith("gw") else 0
+
+
+def worker_index_range(
+    base: int | None = None, span: int | None = None, worker_id: str | None = None
+) -> range:
+    """Getting the email indexes owned by the current worker
+
+    Worker N owns [base + N * span, base + (N + 1) * span), so ranges of
+    different workers never overlap and worker 0 starts at EMAIL_INDEX.
+
+    Args:
+        base (int | None): first index of the run. Defaults to EMAIL_INDEX.
+        span (int | None): indexes per worker. Defaults to EMAIL_INDEX_SPAN or 100.
+        worker_id (str | None): xdist worker id. Defaults to PYTEST_XDIST_WORKER.
+
+    Returns:
+        range: email indexes of the worker
+    """
+    base = int(os.getenv("EMAIL_INDEX", 0)) if base is None else base
+    span = int(os.getenv("EMAIL_INDEX_SPAN", DEFAULT_SPAN)) if span is None else span
+    start = base + worker_number(worker_id) * span
+    return range(start, start + span)
+
+
+def make_email(index: int, prefix: str | None = None) -> str:
+    prefix = prefix or os.getenv("EMAIL", "launcher_regression")
+    return f"{prefix}+{index}@{EMAIL_DOMAIN}"
+
+
+@dataclass
+class Account:
+    """Verified account with an assigned plan"""
+    index: int
+    email: str
+    password: str
+    token: str
+    refresh_token: str
+    workspace_id: str
+
+
+@dataclass
+class Draft:
+    """Account that is still going through the provisioning stages"""
+    index: int
+    email: str
+    password: str
+    token: str | None = None
+    refresh_token: str | None = None
+    workspace_id: str | None = None
+
+    def to_account(self) -> Account:
+        return Account(
+            index=self.index,
+            email=self.email,
+            password=self.password,
+            token=self.token,
+            refresh_token=self.refresh_token,
+            workspace_id=self.workspace_id,
+        )
+
+
+def sign_up_stage(mlx: API.MLX, emp: API.EMP, draft: Draft) -> None:
+    logger.info("Provisioning account %s", draft.email)
+    sign_up = API.as_model(
+        mlx_models.MLXResponse, mlx.sign_up(login=draft.email, user_pass=draft.password)
+    )
+    if sign_up.status.http_code != 201:
+        raise RuntimeError(f"Sign-up of {draft.email} failed: {sign_up.status}")
+
+
+def verify_stage(mlx: API.MLX, emp: API.EMP, draft: Draft) -> None:
+    signin = API.as_model(
+        mlx_models.SigninResponse, mlx.sign_in(login=draft.email, password=draft.password)
+    )
+    email_token = API.as_model(emp_models.TokenResponse, emp.get_email_token(email=draft.email))
+    verified = API.as_model(
+        mlx_models.MLXResponse,
+        mlx.verify_email(
+            email=draft.email, email_token=email_token.data.token, jwt=signin.data.token
+        ),
+    )
+    if verified.status.http_code != 200:
+        raise RuntimeError(f"Email verification of {draft.email} failed: {verified.status}")
+    draft.token = signin.data.token
+
+
+def plan_stage(mlx: API.MLX, emp: API.EMP, draft: Draft) -> None:
+    workspaces = API.as_model(
+        mlx_models.UserWorkspaceArrayResponse, mlx.get_workspace_id(token=draft.token)
+    )
+    draft.workspace_id = workspaces.data.workspaces[0].workspace_id
+    restricted = emp.set_restrictions(workspace_id=draft.workspace_id)
+    if API.http_code(restricted) != 200:
+        raise RuntimeError(f"Assigning the plan of {draft.email} failed: {restricted}")
+    # Sign in again so the token carries the verified status and the plan
+    signin = API.as_model(
+        mlx_models.SigninResponse, mlx.sign_in(login=draft.email, password=draft.password)
+    )
+    draft.token = signin.data.token
+    draft.refresh_token = signin.data.refresh_token
+
+
+# sign-up -> verify -> plan assignment, in order
+STAGES = (sign_up_stage, verify_stage, plan_stage)
+
+
+class AccountPool:
+    """Pre-provisioned accounts leased to tests, drawn from the worker's index range.
+
+    Args:
+        mlx (API.MLX): MLX API client
+        emp (API.EMP): EMP API client
+        password (str): password of the created accounts
+        indexes (range | None): email indexes to use. Defaults to worker_index_range().
+        workers (int): accounts provisioned in parallel. Defaults to 4.
+        factory (AccountFactory | None): pre-warmed source of new accounts;
+            when given, new accounts are taken from it instead of created inline.
+        take_timeout (float): seconds to wait for an account of the factory.
+            Defaults to 300.
+    """
+
+    def __init__(
+        self,
+        mlx: API.MLX,
+        emp: API.EMP,
+        password: str,
+        indexes: range | None = None,
+        workers: int = 4,
+        factory: AccountFactory | None = None,
+        take_timeout: float = 300.0,
+    ) -> None:
+        self.mlx = mlx
+        self.emp = emp
+        self.password = password
+        self.workers = workers
+        self.factory = factory
+        self.take_timeout = take_timeout
+        self._indexes = iter(indexes if indexes is not None else worker_index_range())
+        self._index_lock = threading.Lock()
+        self._available: queue.Queue[Account] = queue.Queue()
+
+    def next_index(self) -> int:
+        """Taking the next unused email index of the range
+
+        Returns:
+            int: email index
+        """
+        with self._index_lock:
+            try:
+                return next(self._indexes)
+            except StopIteration:
+                raise RuntimeError("The email index range of this worker is exhausted") from None
+
+    def create_account(self, index: int | None = None) -> Account:
+        """Signing up, verifying and enabling the plan of one account
+
+        Args:
+            index (int | None): email index. The next unused one when omitted.
+
+        Returns:
+            Account: ready-to-use account
+        """
+        index = self.next_index() if index is None else index
+        draft = Draft(index=index, email=make_email(index), password=self.password)
+        for stage in STAGES:
+            stage(self.mlx, self.emp, draft)
+        return draft.to_account()
+
+    def provision(self, count: int) -> list[Account]:
+        """Creating accounts in parallel and adding them to the pool
+
+        Args:
+            count (int): number of accounts
+
+        Returns:
+            list[Account]: accounts that were provisioned successfully
+        """
+        if self.factory is not None:
+            accounts = [self.factory.take(timeout=self.take_timeout) for _ in range(count)]
+            for account in accounts:
+                self._available.put(account)
+            return accounts
+        indexes = [self.next_index() for _ in range(count)]
+        accounts = []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.create_account, index) for index in indexes]
+            for future in futures:
+                try:
+                    account = future.result()
+                except Exception as e:
+                    logger.error("Provisioning an account failed: %s", e)
+                    continue
+                accounts.append(account)
+                self._available.put(account)
+        return accounts
+
+    def acquire(self, timeout: float | None = None) -> Account:
+        """Taking an account out of the pool, creating one when the pool is empty
+
+        Args:
+            timeout (float | None): seconds to wait for a released account; 0 creates one at once
+
+        Returns:
+            Account
+        """
+        try:
+            return self._available.get(timeout=timeout) if timeout else self._available.get_nowait()
+        except queue.Empty:
+            if self.factory is not None:
+                return self.factory.take(timeout=self.take_timeout)
+            return self.create_account()
+
+    def release(self, account: Account) -> None:
+        self._available.put(account)
+
+    @contextmanager
+    def lease(self, timeout: float | None = None) -> Iterator[Account]:
+        account = self.acquire(timeout=timeout)
+        try:
+            yield account
+        finally:
+            self.release(account)
+
+    def __len__(self) -> int:
+        return self._available.qsize()
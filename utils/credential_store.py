@@ -0,0 +1,167 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import utils
+
+
+config = utils.ConfigProvider("config.ini")
+
+FIELDS = ("email", "password", "workspace_id", "folder_id", "token", "refresh_token")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS credentials (
+    role TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    password TEXT NOT NULL,
+    workspace_id TEXT,
+    folder_id TEXT,
+    token TEXT,
+    refresh_token TEXT,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class CredentialStore:
+    """Per-role credential records in SQLite (WAL mode).
+
+    Every role is its own row, so an update touches only that role and never
+    rewrites the others. WAL lets any number of processes read while one writes,
+    and writers wait on the database lock instead of overwriting each other.
+
+    The store is seeded from user_data.json: a role is (re)loaded from the file
+    when it is missing or when the file was modified after the role was last
+    updated, so editing user_data.json takes effect on the next run. The store
+    does not write back to the file; export_json() snapshots it.
+
+    Args:
+        db_path (str): SQLite database file
+        seed_path (str | None): user_data.json the roles are seeded from
+        timeout (float): seconds to wait for the write lock. Defaults to 30.
+    """
+
+    def __init__(self, db_path: str, seed_path: str | None = None, timeout: float = 30.0) -> None:
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+        if seed_path and os.path.exists(seed_path):
+            self._seed(seed_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _seed(self, seed_path: str) -> None:
+        with open(seed_path, "r") as file:
+            data: dict = json.load(file)
+        modified_at = os.path.getmtime(seed_path)
+        conn = self._connect()
+        # Rows updated after the file was edited, e.g. refreshed tokens written
+        # by other workers, are newer than the file and are kept
+        conn.executemany(
+            f"INSERT INTO credentials (role, {', '.join(FIELDS)}, updated_at) "
+            f"VALUES (?, {', '.join('?' for _ in FIELDS)}, ?) "
+            f"ON CONFLICT (role) DO UPDATE SET "
+            f"{', '.join(f'{field} = excluded.{field}' for field in FIELDS)}, "
+            f"updated_at = excluded.updated_at "
+            f"WHERE credentials.updated_at < excluded.updated_at",
+            [
+                (role, *(record.get(field) for field in FIELDS), modified_at)
+                for role, record in data.items()
+            ],
+        )
+
+    def get(self, role: str) -> dict:
+        """Reading one role
+
+        Args:
+            role (str): owner, manager, user or launcher
+
+        Returns:
+            dict: credential fields of the role
+        """
+        row = self._connect().execute(
+            f"SELECT {', '.join(FIELDS)} FROM credentials WHERE role = ?", (role,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No credentials stored for {role}")
+        return dict(row)
+
+    def load(self) -> dict[str, dict]:
+        """Reading every role, in the shape of user_data.json
+
+        Returns:
+            dict[str, dict]: role -> credential fields
+        """
+        rows = self._connect().execute(
+            f"SELECT role, {', '.join(FIELDS)} FROM credentials"
+        ).fetchall()
+        return {row["role"]: {field: row[field] for field in FIELDS} for row in rows}
+
+    def update(self, role: str, **fields: str | None) -> None:
+        """Updating the given fields of one role atomically; None values are left untouched
+
+        Args:
+            role (str): owner, manager, user or launcher
+            **fields: any of workspace_id, folder_id, token, refresh_token, email, password
+        """
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown credential fields: {sorted(unknown)}")
+        values = {field: value for field, value in fields.items() if value is not None}
+        if not values:
+            return
+        assignments = ", ".join(f"{field} = ?" for field in values)
+        cursor = self._connect().execute(
+            f"UPDATE credentials SET {assignments}, updated_at = ? WHERE role = ?",
+            (*values.values(), time.time(), role),
+        )
+        if cursor.rowcount == 0:
+            raise KeyError(f"No credentials stored for {role}")
+
+    def export_json(self, path: str) -> None:
+        """Writing a user_data.json snapshot of the store
+
+        Args:
+            path (str): target file, replaced atomically
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.load(), file, indent=4)
+        os.replace(tmp_path, path)
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_default_store: CredentialStore | None = None
+_default_lock = threading.Lock()
+
+
+def get_credential_store() -> CredentialStore:
+    """Returning the process-wide store configured in config.ini
+
+    Returns:
+        CredentialStore: shared credential store
+    """
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = CredentialStore(
+                db_path=config.get_file_path("CREDENTIALS_DB"),
+                seed_path=config.get_file_path("USER_DATA"),
+            )
+        return _default_store
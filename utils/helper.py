@@ -1,19 +1,12 @@
-import json
 import jwt
 import utils
 import logging
-import API
 import models
-from models.MLX import SigninResponse
-from datetime import datetime
 from pydantic import ValidationError
 
 
-config = utils.ConfigProvider("config.ini")
 logger = logging.getLogger("my_logger")
 
-FILE_PATH = config.get_file_path("USER_DATA")
-
 
 class Helper:
 
@@ -36,8 +29,7 @@ class Helper:
         Returns:
             models.UserData: easy-to-access user data
         """
-        path = config.get_file_path(file="USER_DATA")
-        data = utils.DataProvider(file_path=path).data
+        data = utils.get_credential_store().load()
         return models.UserData(**data)
 
     def decode_token(self, token: str) -> tuple[str, str, str]:
@@ -58,7 +50,10 @@ class Helper:
     def update_user_data_file(
        self, token: str, refresh_token: str, default_folder_id: str | None = None
     ) -> None:
-        """Reading and updating the user data file to have the latest data.
+        """Updating the stored credentials of the token's role to have the latest data.
+
+        Only the record of that role is touched, atomically, so parallel
+        workers do not lose each other's updates.
 
         Args:
             token (str): token
@@ -66,116 +61,35 @@ class Helper:
             default_folder_id (str | None, optional): profile id. Defaults to None.
         """
         role, default_workspace_id, _ = self.decode_token(token)
-
-        if default_folder_id is None:
-            with open(FILE_PATH, "r") as file:
-                data: dict = json.load(file)
-            data[role]["workspace_id"] = default_workspace_id
-            data[role]["token"] = token
-            data[role]["refresh_token"] = refresh_token
-        else:
-            with open(FILE_PATH, "r") as file:
-                data: dict = json.load(file)
-            data[role]["workspace_id"] = default_workspace_id
-            data[role]["token"] = token
-            data[role]["refresh_token"] = refresh_token
-            data[role]["folder_id"] = default_folder_id
-
-        with open(FILE_PATH, "w") as file:
-            json.dump(data, file, indent=4)
+        utils.get_credential_store().update(
+            role,
+            workspace_id=default_workspace_id,
+            token=token,
+            refresh_token=refresh_token,
+            folder_id=default_folder_id,
+        )
 
     def verify_token(self, token: str) -> str | None:
         """Verify the token to either refresh it or simply return it
 
+        Tokens are decoded once and kept in memory by the shared TokenManager,
+        which also refreshes them ahead of expiry and writes them back to the
+        user data file in the background.
+
         Args:
             token (str): token to be validated
 
         Returns:
             str: updated token
         """
-        provide: models.UserData = self.get_user_data()
-        logger.info("Decoding the token to verify exp_time")
-        role, _, exp_time = self.decode_token(token=token)
-        self.mlx_api = API.MLX(url=config.get_url(section="MLX_API"))
-        if datetime.fromtimestamp(exp_time) > datetime.now():
-            logger.info("Returning the token, because it is still valid.")
-            return token
-        else:
-            try:
-                # Verifying the owner's token and updating it if necessary
-                if role == "owner":
-                    logger.info(f"Token is expired. Fetching a new {role} token.")
-                    response = self.mlx_api.refresh_token(
-                        email=provide.owner.email,
-                        wid=provide.owner.workspace_id,
-                        refresh_token=provide.owner.refresh_token,
-                    )
-                    logger.info('Receiving a new token %s', response)
-                    parsed = SigninResponse(**response)
-                    logger.info("Updating the owner token in the user data file.")
-                    self.update_user_data_file(
-                        token=parsed.data.token, refresh_token=parsed.data.refresh_token
-                    )
-                    logger.info("Returning the updated token.")
-                    return parsed.data.token
-
-                # Verifying the manager's token and updating it if necessary
-                if role == "manager":
-                    logger.info(f"Token is expired. Fetching a new {role} token.")
-                    response = self.mlx_api.refresh_token(
-                        email=provide.manager.email,
-                        wid=provide.manager.workspace_id,
-                        refresh_token=provide.manager.refresh_token,
-                    )
-                    logger.info('Receiving a new token %s', response)
-                    parsed = SigninResponse(**response)
-                    logger.info("Updating the manager token in the user data file.")
-                    self.update_user_data_file(
-                        token=parsed.data.token, refresh_token=parsed.data.refresh_token
-                    )
-                    logger.info("Returning the updated token.")
-                    return parsed.data.token
-
-                # Verifying the user's token and updating it if necessary
-                if role == "user":
-                    logger.info(f"Token is expired. Fetching a new {role} token.")
-                    response = self.mlx_api.refresh_token(
-                        email=provide.user.email,
-                        wid=provide.user.workspace_id,
-                        refresh_token=provide.user.refresh_token,
-                    )
-                    logger.info('Receiving a new token %s', response)
-                    parsed = SigninResponse(**response)
-                    logger.info("Updating the user token in the user data file.")
-                    self.update_user_data_file(
-                        token=parsed.data.token, refresh_token=parsed.data.refresh_token
-                    )
-                    logger.info("Returning the updated token.")
-                    return parsed.data.token
-
-                # Verifying the launcher's token and updating it if necessary
-                if role == "launcher":
-                    logger.info(f"Token is expired. Fetching a new {role} token.")
-                    response = self.mlx_api.refresh_token(
-                        email=provide.launcher.email,
-                        wid=provide.launcher.workspace_id,
-                        refresh_token=provide.launcher.refresh_token,
-                    )
-                    logger.info('Receiving a new token %s', response)
-                    parsed = SigninResponse(**response)
-                    logger.info("Updating the launcher token in the user data file.")
-                    self.update_user_data_file(
-                        token=parsed.data.token, refresh_token=parsed.data.refresh_token
-                    )
-                    logger.info("Returning the updated token.")
-                    return parsed.data.token
-
-            except ValidationError as e:
-                logger.error("Validation error occurred: %s", e)
-                raise
-            except Exception as e:
-                logger.error("An unexpected error occurred: %s", e)
-                raise
+        try:
+            return utils.get_token_manager().verify(token)
+        except ValidationError as e:
+            logger.error("Validation error occurred: %s", e)
+            raise
+        except Exception as e:
+            logger.error("An unexpected error occurred: %s", e)
+            raise
 
 
 # def create_profile(token: str, body: dict) -> List[str]:
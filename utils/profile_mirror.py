@@ -0,0 +1,430 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Iterable, Iterator
+from pydantic import BaseModel
+import API
+import utils
+from models import MLX as mlx_models
+
+
+logger = logging.getLogger("my_logger")
+
+config = utils.ConfigProvider("config.ini")
+
+COLUMNS = (
+    "id", "name", "folder_id", "os_type", "browser_type", "core_version", "is_local",
+    "notes", "created_at", "updated_at", "removed_at", "removed_by",
+)
+# get_profile_metas takes at most 100 ids
+METAS_BATCH = 100
+UPSERT_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    folder_id TEXT NOT NULL,
+    os_type TEXT,
+    browser_type TEXT,
+    core_version INTEGER,
+    is_local INTEGER,
+    notes TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    removed_at TEXT,
+    removed_by TEXT,
+    generation INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS profiles_folder_id ON profiles (folder_id);
+CREATE INDEX IF NOT EXISTS profiles_os_type ON profiles (os_type);
+CREATE INDEX IF NOT EXISTS profiles_core_version ON profiles (core_version);
+CREATE INDEX IF NOT EXISTS profiles_browser_type ON profiles (browser_type);
+CREATE INDEX IF NOT EXISTS profiles_updated_at ON profiles (updated_at);
+CREATE TABLE IF NOT EXISTS profile_tags (
+    profile_id TEXT NOT NULL REFERENCES profiles (id) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (profile_id, tag)
+);
+CREATE INDEX IF NOT EXISTS profile_tags_tag ON profile_tags (tag);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class _TooManyChanges(Exception):
+    """More changes than one ordered search can page through"""
+
+
+def _timestamp(value: datetime | str | None) -> str | None:
+    """UTC ISO timestamp with fixed precision, so stored values compare as text"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _as_dict(response: dict | BaseModel) -> dict:
+    return response.model_dump(by_alias=True) if isinstance(response, BaseModel) else response
+
+
+class ProfileMirror:
+    """Local SQLite (WAL) mirror of the workspace's profile metadata.
+
+    Filled from profile search results and kept current by incremental syncs:
+    only profiles updated or removed since the last sync are requested, newest
+    first. Lookups by folder, tag, OS type, browser type or core version are
+    answered from indexed tables instead of paginated searches.
+
+    Args:
+        db_path (str): SQLite database file
+        timeout (float): seconds to wait for the write lock. Defaults to 30.
+    """
+
+    def __init__(self, db_path: str, timeout: float = 30.0) -> None:
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _state(self, key: str) -> str | None:
+        row = self._connect().execute(
+            "SELECT value FROM sync_state WHERE key = ?", (key,)
+        ).fetchone()
+        return row["value"] if row else None
+
+    def _set_state(self, key: str, value: str | None) -> None:
+        self._connect().execute(
+            "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def upsert(
+        self, items: Iterable[mlx_models.ProfileSearchQueryItem], generation: int = 0
+    ) -> list[str]:
+        """Inserting or updating profiles from search results
+
+        Args:
+            items (Iterable[ProfileSearchQueryItem]): profiles, consumed in batches
+            generation (int): sync generation stamped on the rows
+
+        Returns:
+            list[str]: ids of the written profiles
+        """
+        conn = self._connect()
+        statement = (
+            f"INSERT INTO profiles ({', '.join(COLUMNS)}, generation) "
+            f"VALUES ({', '.join('?' for _ in COLUMNS)}, ?) "
+            f"ON CONFLICT (id) DO UPDATE SET "
+            + ", ".join(f"{column} = excluded.{column}" for column in (*COLUMNS[1:], "generation"))
+        )
+        ids = []
+        items = iter(items)
+        while batch := list(islice(items, UPSERT_BATCH)):
+            rows = [
+                (
+                    item.id, item.name, item.folder_id, item.os_type, item.browser_type.value,
+                    item.core_version, int(item.is_local), item.notes,
+                    _timestamp(item.created_at), _timestamp(item.updated_at),
+                    _timestamp(item.removed_at), item.removed_by, generation,
+                )
+                for item in batch
+            ]
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(statement, rows)
+            conn.execute("COMMIT")
+            ids.extend(row[0] for row in rows)
+        return ids
+
+    def set_tags(self, tags: dict[str, list[str]]) -> None:
+        """Replacing the tags of the given profiles
+
+        Args:
+            tags (dict[str, list[str]]): profile id -> tags
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany("DELETE FROM profile_tags WHERE profile_id = ?", [(pid,) for pid in tags])
+        conn.executemany(
+            "INSERT OR IGNORE INTO profile_tags (profile_id, tag) "
+            "SELECT ?, ? WHERE EXISTS (SELECT 1 FROM profiles WHERE id = ?)",
+            [(pid, tag, pid) for pid, values in tags.items() for tag in values or ()],
+        )
+        conn.execute("COMMIT")
+
+    def mark_removed(self, items: Iterable[mlx_models.ProfileSearchQueryItem]) -> int:
+        """Flagging profiles that were moved to the trash
+
+        Args:
+            items (Iterable[ProfileSearchQueryItem]): removed profiles
+
+        Returns:
+            int: number of mirrored profiles that were flagged
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.executemany(
+            "UPDATE profiles SET removed_at = ?, removed_by = ? WHERE id = ?",
+            [(_timestamp(item.removed_at), item.removed_by, item.id) for item in items],
+        )
+        conn.execute("COMMIT")
+        return cursor.rowcount
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """Dropping profiles that were deleted permanently, e.g. right after
+        MLX.delete_profile, so that the next sync does not have to find them
+
+        Args:
+            ids (Iterable[str]): ids of the deleted profiles
+
+        Returns:
+            int: number of mirrored profiles that were dropped
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.executemany("DELETE FROM profiles WHERE id = ?", [(pid,) for pid in ids])
+        conn.execute("COMMIT")
+        return cursor.rowcount
+
+    def _drop_missing(self, mlx: API.MLX, token: str) -> int:
+        """Dropping live profiles that the server no longer knows, checked
+        through the profile metas, which only come back for existing profiles"""
+        ids = [row[0] for row in self._connect().execute(
+            "SELECT id FROM profiles WHERE removed_at IS NULL"
+        )]
+        found: set[str] = set()
+        for start in range(0, len(ids), METAS_BATCH):
+            batch = ids[start:start + METAS_BATCH]
+            res = _as_dict(mlx.get_profile_metas(token=token, profile_ids=batch))
+            if res["status"]["http_code"] != 200:
+                logger.warning("Checking profile metas failed: %s", res["status"])
+                return 0
+            metas = res["data"]["profiles"]
+            found.update(meta["id"] for meta in metas)
+            self.set_tags({meta["id"]: meta.get("tags") or [] for meta in metas})
+        return self.remove(pid for pid in ids if pid not in found)
+
+    def _fetch_tags(self, mlx: API.MLX, token: str, ids: list[str]) -> None:
+        for start in range(0, len(ids), METAS_BATCH):
+            batch = ids[start:start + METAS_BATCH]
+            res = _as_dict(mlx.get_profile_metas(token=token, profile_ids=batch))
+            if res["status"]["http_code"] != 200:
+                logger.warning("Fetching profile metas failed: %s", res["status"])
+                continue
+            self.set_tags({meta["id"]: meta.get("tags") or [] for meta in res["data"]["profiles"]})
+
+    def _changed(
+        self, mlx: API.MLX, token: str, field: str, since: str, removed: bool
+    ) -> Iterator[mlx_models.ProfileSearchQueryItem]:
+        criteria = {
+            **API.search.DEFAULT_CRITERIA,
+            "is_removed": removed,
+            "order_by": field,
+            "sort": "desc",
+        }
+        for offset in range(0, API.search.MAX_OFFSET + 1, API.search.MAX_LIMIT):
+            page = {**criteria, "offset": offset}
+            res = _as_dict(mlx.search_profiles(token=token, criteria=page))
+            if res["status"]["http_code"] != 200:
+                raise RuntimeError(f"Profile search failed: {res['status']}")
+            profiles = (res.get("data") or {}).get("profiles") or []
+            for profile in profiles:
+                item = mlx_models.ProfileSearchQueryItem.from_dict(profile)
+                # Profiles stamped exactly at the watermark are read again on purpose
+                if _timestamp(getattr(item, field)) < since:
+                    return
+                yield item
+            if len(profiles) < API.search.MAX_LIMIT:
+                return
+        raise _TooManyChanges(field)
+
+    def _count(self, mlx: API.MLX, token: str) -> int:
+        criteria = {**API.search.DEFAULT_CRITERIA, "limit": 1}
+        res = _as_dict(mlx.search_profiles(token=token, criteria=criteria))
+        if res["status"]["http_code"] != 200:
+            raise RuntimeError(f"Profile search failed: {res['status']}")
+        return (res.get("data") or {}).get("total_count", 0)
+
+    def _newest(self, mlx: API.MLX, token: str, field: str, removed: bool) -> str | None:
+        items = self._changed(mlx, token, field, "", removed)
+        item = next(items, None)
+        items.close()
+        return _timestamp(getattr(item, field)) if item else None
+
+    def full_sync(self, mlx: API.MLX, token: str, with_tags: bool = True) -> dict:
+        """Rebuilding the mirror from a complete walk of the workspace
+
+        Args:
+            mlx (API.MLX): MLX API client
+            token (str): Bearer token of the workspace
+            with_tags (bool): fetch profile metas for the tags. Defaults to True.
+
+        Returns:
+            dict: number of profiles written and dropped
+        """
+        generation = int(self._state("generation") or 0) + 1
+        removed_since = self._newest(mlx, token, "removed_at", removed=True)
+        newest = ""
+
+        def walk() -> Iterator[mlx_models.ProfileSearchQueryItem]:
+            nonlocal newest
+            for item in mlx.iter_profiles(token=token):
+                newest = max(newest, _timestamp(item.updated_at))
+                yield item
+
+        ids = self.upsert(walk(), generation=generation)
+        conn = self._connect()
+        dropped = conn.execute("DELETE FROM profiles WHERE generation < ?", (generation,)).rowcount
+        if with_tags:
+            self._fetch_tags(mlx, token, ids)
+        self._set_state("generation", str(generation))
+        self._set_state("updated_at", newest or None)
+        self._set_state("removed_at", removed_since)
+        return {"updated": len(ids), "removed": dropped, "full": True}
+
+    def sync(self, mlx: API.MLX, token: str, with_tags: bool = True) -> dict:
+        """Bringing the mirror up to date with the profiles changed since the last sync
+
+        Falls back to full_sync() on the first run and when more profiles
+        changed than one ordered search can reach. Permanently deleted
+        profiles are not returned by any search, so afterwards the live
+        profiles are counted on the server. When the mirror has more, the
+        mirrored ids are checked through the profile metas and the missing
+        ones are dropped; call remove() after deleting through this client to
+        skip that check. Only a drift that is still unexplained triggers a
+        full sync. Profiles purged from the trash stay in the mirror, flagged
+        as removed, until the next full sync.
+
+        Args:
+            mlx (API.MLX): MLX API client
+            token (str): Bearer token of the workspace
+            with_tags (bool): fetch profile metas for the tags. Defaults to True.
+
+        Returns:
+            dict: number of profiles updated and removed, and whether the sync was full
+        """
+        updated_since = self._state("updated_at")
+        if updated_since is None:
+            return self.full_sync(mlx, token, with_tags=with_tags)
+        removed_since = self._state("removed_at") or ""
+        try:
+            updated = list(self._changed(mlx, token, "updated_at", updated_since, removed=False))
+            removed = list(self._changed(mlx, token, "removed_at", removed_since, removed=True))
+        except _TooManyChanges as e:
+            logger.info("Too many profiles changed by %s, running a full sync", e)
+            return self.full_sync(mlx, token, with_tags=with_tags)
+        generation = int(self._state("generation") or 0)
+        ids = self.upsert(updated, generation=generation)
+        flagged = self.mark_removed(removed)
+        if with_tags:
+            self._fetch_tags(mlx, token, ids)
+        if updated:
+            self._set_state("updated_at", max(_timestamp(item.updated_at) for item in updated))
+        if removed:
+            self._set_state("removed_at", max(_timestamp(item.removed_at) for item in removed))
+        count = self._count(mlx, token)
+        if count < len(self):
+            flagged += self._drop_missing(mlx, token)
+        if count != len(self):
+            logger.info("%s live profiles, %s mirrored, running a full sync", count, len(self))
+            return self.full_sync(mlx, token, with_tags=with_tags)
+        return {"updated": len(ids), "removed": flagged, "full": False}
+
+    def find(
+        self,
+        folder_id: str | None = None,
+        tag: str | None = None,
+        os_type: str | None = None,
+        browser_type: str | None = None,
+        core_version: int | None = None,
+        search_text: str | None = None,
+        include_removed: bool = False,
+    ) -> list[dict]:
+        """Looking profiles up in the mirror
+
+        Args:
+            folder_id (str | None): folder of the profiles
+            tag (str | None): tag the profiles carry
+            os_type (str | None): linux, macos, windows or android
+            browser_type (str | None): mimic or stealthfox
+            core_version (int | None): browser core version
+            search_text (str | None): part of the profile name
+            include_removed (bool): include profiles in the trash. Defaults to False.
+
+        Returns:
+            list[dict]: matching profiles with their tags
+        """
+        clauses, params = [], []
+        for column, value in (
+            ("folder_id", folder_id),
+            ("os_type", os_type),
+            ("browser_type", browser_type),
+            ("core_version", core_version),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if tag is not None:
+            clauses.append("id IN (SELECT profile_id FROM profile_tags WHERE tag = ?)")
+            params.append(tag)
+        if search_text:
+            clauses.append("name LIKE ?")
+            params.append(f"%{search_text}%")
+        if not include_removed:
+            clauses.append("removed_at IS NULL")
+        rows = self._connect().execute(
+            f"SELECT {', '.join(COLUMNS)}, "
+            "(SELECT json_group_array(tag) FROM profile_tags "
+            "WHERE profile_id = profiles.id) AS tags "
+            f"FROM profiles {'WHERE ' + ' AND '.join(clauses) if clauses else ''}",
+            params,
+        ).fetchall()
+        return [{**dict(row), "tags": json.loads(row["tags"])} for row in rows]
+
+    def get(self, profile_id: str) -> dict | None:
+        row = self._connect().execute(
+            f"SELECT {', '.join(COLUMNS)} FROM profiles WHERE id = ?", (profile_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def __len__(self) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM profiles WHERE removed_at IS NULL"
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def get_profile_mirror() -> ProfileMirror:
+    """Opening the mirror configured in config.ini
+
+    Returns:
+        ProfileMirror: profile mirror
+    """
+    return ProfileMirror(db_path=config.get_file_path("PROFILE_MIRROR_DB"))
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+import jwt
+from pydantic import BaseModel
+import API
+import utils
+from models import MLX as mlx_models
+
+
+config = utils.ConfigProvider("config.ini")
+
+DEFAULT_FOLDER = "Default folder"
+FOLDERS = "folders"
+WORKSPACES = "workspaces"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (key, kind)
+)
+"""
+
+
+@dataclass
+class Listing:
+    """Folders or workspaces of one workspace member, indexed by name and id"""
+    items: list
+    fetched_at: float
+    by_name: dict[str, Any] = field(default_factory=dict)
+    by_id: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, items: list, id_field: str, fetched_at: float) -> "Listing":
+        listing = cls(items=items, fetched_at=fetched_at)
+        for item in items:
+            # the first of equally named items wins, as in the API's own order
+            listing.by_name.setdefault(item.name, item)
+            listing.by_id[getattr(item, id_field)] = item
+        return listing
+
+
+def _claims(token: str) -> dict:
+    try:
+        return jwt.decode(jwt=token, options={"verify_signature": False})
+    except jwt.PyJWTError:
+        return {}
+
+
+def cache_key(token: str) -> str:
+    """Key of the listings a token can see: its workspace, role and user, so
+    refreshed tokens share the cache and no token is ever stored. Members with
+    the same role may still see different folders, so they never share one.
+
+    Args:
+        token (str): Bearer token
+
+    Returns:
+        str: cache key
+    """
+    claims = _claims(token)
+    if all(claim in claims for claim in ("workspaceID", "workspaceRole", "userID")):
+        return f"{claims['workspaceID']}:{claims['workspaceRole']}:{claims['userID']}"
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class WorkspaceResolver:
+    """Cached folder and workspace listings with name -> id and id -> object lookups.
+
+    Listings are kept per workspace member for `ttl` seconds. Concurrent
+    lookups of the same listing wait for one request. With a db_path the
+    listings are also shared through SQLite, so parallel workers reuse each
+    other's fetches. Call invalidate() after creating, renaming or removing folders.
+
+    Args:
+        mlx (API.MLX): MLX API client
+        ttl (float): seconds a listing stays fresh. Defaults to 300.
+        db_path (str | None): SQLite file shared between processes
+    """
+
+    def __init__(self, mlx: API.MLX, ttl: float = 300.0, db_path: str | None = None) -> None:
+        self.mlx = mlx
+        self.ttl = ttl
+        self.db_path = db_path
+        self._listings: dict[tuple[str, str], Listing] = {}
+        self._locks: dict[tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if db_path:
+            self._connect().execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _fetch(self, token: str, kind: str) -> dict:
+        if kind == FOLDERS:
+            res = self.mlx.get_folder_id(token=token)
+        else:
+            res = self.mlx.get_workspace_id(token=token)
+        if isinstance(res, BaseModel):
+            res = res.model_dump(by_alias=True, mode="json")
+        if res["status"]["http_code"] != 200:
+            raise RuntimeError(f"Listing {kind} failed: {res['status']}")
+        return res
+
+    def _build(self, kind: str, payload: dict, fetched_at: float) -> Listing:
+        if kind == FOLDERS:
+            items = mlx_models.UserFolderArrayResponse(**payload).data.folders
+            return Listing.build(items, "folder_id", fetched_at)
+        items = mlx_models.UserWorkspaceArrayResponse(**payload).data.workspaces
+        return Listing.build(items, "workspace_id", fetched_at)
+
+    def _shared(self, key: str, kind: str) -> Listing | None:
+        row = self._connect().execute(
+            "SELECT payload, fetched_at FROM listings WHERE key = ? AND kind = ?", (key, kind)
+        ).fetchone()
+        if row is None or time.time() - row[1] >= self.ttl:
+            return None
+        return self._build(kind, json.loads(row[0]), row[1])
+
+    def listing(self, token: str, kind: str) -> Listing:
+        """Getting a fresh listing, fetching it only when the cached one expired
+
+        Args:
+            token (str): Bearer token
+            kind (str): "folders" or "workspaces"
+
+        Returns:
+            Listing: items with their name and id indexes
+        """
+        slot = (cache_key(token), kind)
+        with self._lock:
+            listing = self._listings.get(slot)
+            if listing is not None and time.time() - listing.fetched_at < self.ttl:
+                return listing
+            lock = self._locks.setdefault(slot, threading.Lock())
+        with lock:
+            listing = self._listings.get(slot)
+            if listing is not None and time.time() - listing.fetched_at < self.ttl:
+                return listing
+            listing = self._shared(*slot) if self.db_path else None
+            if listing is None:
+                payload = self._fetch(token, kind)
+                listing = self._build(kind, payload, time.time())
+                if self.db_path:
+                    self._connect().execute(
+                        "INSERT OR REPLACE INTO listings (key, kind, payload, fetched_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (*slot, json.dumps(payload), listing.fetched_at),
+                    )
+            with self._lock:
+                self._listings[slot] = listing
+            return listing
+
+    def folder(
+        self, token: str, name: str | None = None, folder_id: str | None = None
+    ) -> mlx_models.UserFolder:
+        """Looking a folder up by name or id
+
+        Args:
+            token (str): Bearer token
+            name (str | None): folder name
+            folder_id (str | None): folder id
+
+        Returns:
+            UserFolder: the folder
+        """
+        listing = self.listing(token, FOLDERS)
+        found = listing.by_id.get(folder_id) if folder_id else listing.by_name.get(name)
+        if found is None:
+            raise KeyError(f"No folder {folder_id or name!r}")
+        return found
+
+    def folder_id(self, token: str, name: str = DEFAULT_FOLDER) -> str:
+        return self.folder(token, name=name).folder_id
+
+    def workspace(
+        self, token: str, name: str | None = None, workspace_id: str | None = None
+    ) -> mlx_models.UserWorkspace:
+        """Looking a workspace up by name or id; the token's own workspace when neither is given
+
+        Args:
+            token (str): Bearer token
+            name (str | None): workspace name
+            workspace_id (str | None): workspace id
+
+        Returns:
+            UserWorkspace: the workspace
+        """
+        listing = self.listing(token, WORKSPACES)
+        if name:
+            found = listing.by_name.get(name)
+        elif workspace_id:
+            found = listing.by_id.get(workspace_id)
+        else:
+            found = listing.by_id.get(_claims(token).get("workspaceID"))
+            if found is None and listing.items:
+                found = listing.items[0]
+        if found is None:
+            raise KeyError(f"No workspace {workspace_id or name!r}")
+        return found
+
+    def workspace_id(self, token: str, name: str | None = None) -> str:
+        return self.workspace(token, name=name).workspace_id
+
+    def invalidate(self, token: str | None = None, kind: str | None = None) -> None:
+        """Dropping cached listings, e.g. after folders were created or renamed
+
+        Args:
+            token (str | None): only the listings this token sees. All when None.
+            kind (str | None): "folders" or "workspaces". Both when None.
+        """
+        key = cache_key(token) if token else None
+        with self._lock:
+            for slot in list(self._listings):
+                if (key is None or slot[0] == key) and (kind is None or slot[1] == kind):
+                    del self._listings[slot]
+        if self.db_path:
+            self._connect().execute(
+                "DELETE FROM listings WHERE (? IS NULL OR key = ?) AND (? IS NULL OR kind = ?)",
+                (key, key, kind, kind),
+            )
+
+
+_default_resolver: WorkspaceResolver | None = None
+_default_lock = threading.Lock()
+
+
+def get_resolver(mlx: API.MLX) -> WorkspaceResolver:
+    """Returning the process-wide resolver, sharing listings through the
+    RESOLVER_DB configured in config.ini
+
+    Args:
+        mlx (API.MLX): MLX API client used on the first call
+
+    Returns:
+        WorkspaceResolver: shared resolver
+    """
+    global _default_resolver
+    with _default_lock:
+        if _default_resolver is None:
+            _default_resolver = WorkspaceResolver(mlx, db_path=config.get_file_path("RESOLVER_DB"))
+        return _default_resolver
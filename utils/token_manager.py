@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable
+import jwt
+import API
+import models
+import utils
+from models.MLX import SigninResponse
+
+
+config = utils.ConfigProvider("config.ini")
+logger = logging.getLogger("my_logger")
+
+ROLES = ("owner", "manager", "user", "launcher")
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    """Decoded token kept in memory"""
+    role: str
+    workspace_id: str
+    token: str
+    refresh_token: str | None
+    expires_at: float
+    email: str | None = None
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.role, self.workspace_id
+
+
+class TokenManager:
+    """In-memory token cache with proactive refresh and write-behind persistence.
+
+    Tokens are decoded once and kept per (role, workspace_id). A timer refreshes
+    each token `refresh_margin` seconds before it expires, concurrent refreshes
+    of the same token are collapsed into one request, and refreshed tokens are
+    handed to `persist` from a background thread. Tokens the manager has not
+    seen before are refreshed with the role's stored credentials, signing in
+    again when there is no usable refresh token.
+
+    Args:
+        mlx (API.MLX): client used to refresh tokens
+        persist (Callable[[CachedToken], None] | None): write-behind callback.
+            Nothing is persisted when omitted.
+        refresh_margin (float): seconds before `exp` to refresh. Defaults to 60.
+        background (bool): refresh proactively with timers. Defaults to True.
+        credentials (Callable[[str], dict] | None): stored email, password and
+            refresh token of a role, e.g. CredentialStore.get.
+    """
+
+    def __init__(
+        self,
+        mlx: API.MLX,
+        persist: Callable[[CachedToken], None] | None = None,
+        refresh_margin: float = 60.0,
+        background: bool = True,
+        credentials: Callable[[str], dict] | None = None,
+    ) -> None:
+        self.mlx = mlx
+        self.credentials = credentials
+        self.persist = persist
+        self.refresh_margin = refresh_margin
+        self.background = background
+        self._lock = threading.Lock()
+        self._tokens: dict[tuple[str, str], CachedToken] = {}
+        self._by_token: dict[str, tuple[str, str]] = {}
+        self._inflight: dict[tuple[str, str], Future] = {}
+        self._timers: dict[tuple[str, str], threading.Timer] = {}
+        self._dirty: dict[tuple[str, str], CachedToken] = {}
+        self._writing = False
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+        self._writer: threading.Thread | None = None
+        self._helper = utils.Helper()
+
+    def load(self, user_data: models.UserData) -> None:
+        """Seeding the cache from the user data of every role
+
+        Args:
+            user_data (models.UserData): user data with tokens and refresh tokens
+        """
+        for role in ROLES:
+            creds = getattr(user_data, role)
+            if not creds.token:
+                continue
+            try:
+                self.put(creds.token, creds.refresh_token, email=creds.email, persist=False)
+            except jwt.DecodeError as e:
+                logger.warning("Skipping the %s token, it cannot be decoded: %s", role, e)
+
+    def put(
+        self,
+        token: str,
+        refresh_token: str | None,
+        email: str | None = None,
+        persist: bool = True,
+    ) -> CachedToken:
+        """Caching a token, e.g. right after sign-in
+
+        Args:
+            token (str): token
+            refresh_token (str | None): refresh token
+            email (str | None): account email, needed for refreshing
+            persist (bool): schedule a write-behind of the token. Defaults to True.
+
+        Returns:
+            CachedToken: cached entry
+        """
+        role, workspace_id, exp_time = self._helper.decode_token(token)
+        with self._lock:
+            previous = self._tokens.get((role, workspace_id))
+            entry = CachedToken(
+                role=role,
+                workspace_id=workspace_id,
+                token=token,
+                refresh_token=refresh_token or (previous.refresh_token if previous else None),
+                expires_at=float(exp_time),
+                email=email or (previous.email if previous else None),
+            )
+            self._tokens[entry.key] = entry
+            self._by_token[token] = entry.key
+            if persist and self.persist is not None:
+                self._dirty[entry.key] = entry
+                self._start_writer()
+                self._wakeup.notify()
+        self._schedule(entry)
+        return entry
+
+    def get(self, role: str, workspace_id: str | None = None) -> str:
+        """Returning a valid token for the role, refreshing it when expired
+
+        Args:
+            role (str): owner, manager, user or launcher
+            workspace_id (str | None): workspace; any cached workspace of the role when omitted
+
+        Returns:
+            str: token
+        """
+        with self._lock:
+            if workspace_id is None:
+                key = next((key for key in self._tokens if key[0] == role), None)
+            else:
+                key = (role, workspace_id)
+            entry = self._tokens.get(key) if key else None
+        if entry is None:
+            raise KeyError(f"No token cached for {role} in {workspace_id}")
+        return self._valid(entry).token
+
+    def verify(self, token: str) -> str:
+        """Returning the latest valid token of the same role and workspace
+
+        Args:
+            token (str): token to be validated
+
+        Returns:
+            str: token, refreshed if it has expired
+        """
+        with self._lock:
+            key = self._by_token.get(token)
+        if key is None:
+            role, workspace_id, _ = self._helper.decode_token(token)
+            key = (role, workspace_id)
+        with self._lock:
+            entry = self._tokens.get(key)
+        if entry is None:
+            stored = self._stored(key[0])
+            entry = self.put(
+                token, stored.get("refresh_token"), email=stored.get("email"), persist=False
+            )
+        return self._valid(entry).token
+
+    def _stored(self, role: str) -> dict:
+        if self.credentials is None:
+            return {}
+        try:
+            return self.credentials(role)
+        except KeyError:
+            return {}
+
+    def _renew(self, entry: CachedToken) -> SigninResponse:
+        if entry.refresh_token is not None and entry.email is not None:
+            response = self.mlx.refresh_token(
+                email=entry.email, wid=entry.workspace_id, refresh_token=entry.refresh_token
+            )
+            if API.http_code(response) == 200:
+                return API.as_model(SigninResponse, response)
+            logger.warning("Refreshing the %s token failed: %s", entry.role, response)
+        stored = self._stored(entry.role)
+        if not stored.get("email") or not stored.get("password"):
+            raise RuntimeError(f"No refresh token or credentials to renew the {entry.role} token")
+        logger.info("Signing in again to renew the %s token", entry.role)
+        response = self.mlx.sign_in(login=stored["email"], password=stored["password"])
+        return API.as_model(SigninResponse, response)
+
+    def _valid(self, entry: CachedToken) -> CachedToken:
+        if entry.expires_at > time.time():
+            return entry
+        logger.info("Token is expired. Fetching a new %s token.", entry.role)
+        return self.refresh(entry.key)
+
+    def refresh(self, key: tuple[str, str]) -> CachedToken:
+        """Refreshing a token, sharing one request between concurrent callers.
+        Nothing is sent when the cached token is no longer due, e.g. because a
+        concurrent caller has just refreshed it.
+
+        Args:
+            key (tuple[str, str]): role and workspace id
+
+        Returns:
+            CachedToken: refreshed entry
+        """
+        with self._lock:
+            entry = self._tokens[key]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                if entry.expires_at - self.refresh_margin > time.time():
+                    return entry
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            parsed = self._renew(entry)
+            refreshed = self.put(
+                parsed.data.token,
+                parsed.data.refresh_token,
+                email=entry.email or self._stored(entry.role).get("email"),
+            )
+            future.set_result(refreshed)
+            return refreshed
+        except Exception as e:
+            logger.error("Refreshing the %s token failed: %s", entry.role, e)
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _schedule(self, entry: CachedToken) -> None:
+        if not self.background or entry.refresh_token is None or entry.email is None:
+            return
+        delay = max(0.0, entry.expires_at - self.refresh_margin - time.time())
+        timer = threading.Timer(delay, self._refresh_in_background, args=(entry,))
+        timer.daemon = True
+        with self._lock:
+            if self._closed:
+                return
+            previous = self._timers.get(entry.key)
+            self._timers[entry.key] = timer
+        if previous is not None:
+            previous.cancel()
+        timer.start()
+
+    def _refresh_in_background(self, entry: CachedToken) -> None:
+        with self._lock:
+            if self._tokens.get(entry.key) is not entry:
+                return
+        try:
+            if self.refresh(entry.key) is entry:
+                # the timer fired a moment early; the token is not due yet
+                self._schedule(entry)
+        except Exception:
+            # The token is refreshed again on demand when it is next requested
+            pass
+
+    def _start_writer(self) -> None:
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._write_behind, name="token-writer", daemon=True
+            )
+            self._writer.start()
+            atexit.register(self.close)
+
+    def _write_behind(self) -> None:
+        while True:
+            with self._lock:
+                while not self._dirty and not self._closed:
+                    self._wakeup.wait()
+                if not self._dirty and self._closed:
+                    return
+                batch, self._dirty = list(self._dirty.values()), {}
+                self._writing = True
+            for entry in batch:
+                try:
+                    self.persist(entry)
+                except Exception as e:
+                    logger.error("Persisting the %s token failed: %s", entry.role, e)
+            with self._lock:
+                self._writing = False
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Waiting until pending tokens have been persisted
+
+        Args:
+            timeout (float): maximum seconds to wait. Defaults to 5.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if not self._dirty and not self._writing:
+                    return
+            time.sleep(0.01)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            timers, self._timers = list(self._timers.values()), {}
+            self._wakeup.notify_all()
+        for timer in timers:
+            timer.cancel()
+        if self._writer is not None:
+            self._writer.join(timeout=5.0)
+
+
+_default_manager: TokenManager | None = None
+_default_lock = threading.Lock()
+
+
+def get_token_manager() -> TokenManager:
+    """Returning the process-wide token manager seeded from the user data file
+
+    Returns:
+        TokenManager: shared token manager
+    """
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            helper = utils.Helper()
+            manager = TokenManager(
+                mlx=API.MLX(url=config.get_url(section="MLX_API")),
+                persist=lambda entry: helper.update_user_data_file(
+                    token=entry.token, refresh_token=entry.refresh_token
+                ),
+                credentials=utils.get_credential_store().get,
+            )
+            manager.load(helper.get_user_data())
+            _default_manager = manager
+        return _default_manager